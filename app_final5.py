@@ -1,56 +1,49 @@
-
 from fastapi import FastAPI, UploadFile, File
 from pydantic import BaseModel
+from typing import List
 import uvicorn
 
 # === Original Notebook Code (Final5 Cleaned) Starts ===
 # Import necessary libraries
+import asyncio
+from array import array
+import bisect
+import contextvars
+import copy
+import hashlib
+import io
+import mmap
 import os
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt 
-import seaborn as sns
 import re
+import struct
+import time
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 import json
+import importlib.util
 from datetime import datetime
 import glob
-from fastapi.responses import FileResponse
-import tempfile
-import json
-import os
-
-
-# Text processing
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer
-try:
-    pass
-    from textstat import flesch_reading_ease, flesch_kincaid_grade
-except ImportError:
-    pass
-#     print("textstat not available - install with: pip install textstat")
-
-# NLP and summarization
-try:
-    pass
-    from transformers import pipeline, AutoTokenizer, AutoModel
-    from sentence_transformers import SentenceTransformer
-except ImportError:
-    pass
-#     print("transformers not available - install with: pip install transformers sentence-transformers")
-
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
+from fastapi.responses import Response
+from starlette.datastructures import MutableHeaders
+import threading
+import uuid
+import zlib
+from urllib.parse import quote
+
+# Heavy libraries (nltk, sklearn, matplotlib, reportlab, PyPDF2, textstat,
+# rouge_score) are imported on first use so that importing this module for
+# the API server stays cheap.  Set COURT_SUMMARIZER_DEMO=1 to run the
+# notebook demo workloads on import as before.
+RUN_NOTEBOOK_DEMO = os.environ.get('COURT_SUMMARIZER_DEMO', '') == '1'
 
 # Warnings
+import logging
 import warnings
 warnings.filterwarnings('ignore')
+logger = logging.getLogger(__name__)
 
 # Set style for plots
 # plt.style.use('default')
@@ -60,20 +53,152 @@ warnings.filterwarnings('ignore')
 # print(f"Current working directory: {os.getcwd()}")
 
 # Download required NLTK data
-try:
-    pass
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('tokenizers/punkt_tab')
-    nltk.data.find('corpora/stopwords')
-#     print("NLTK data already available")
-except LookupError:
-    pass
-#     print("Downloading NLTK data...")
-    nltk.download('punkt')
-    nltk.download('punkt_tab')  # Add this line
-    nltk.download('stopwords')
-    nltk.download('averaged_perceptron_tagger')
-#     print("NLTK data downloaded successfully")
+@lru_cache(maxsize=None)
+def ensure_nltk_data():
+    """Import nltk and download the tokenizer/stopword data on first use"""
+    import nltk
+    try:
+        nltk.data.find('tokenizers/punkt')
+        nltk.data.find('tokenizers/punkt_tab')
+        nltk.data.find('corpora/stopwords')
+#         print("NLTK data already available")
+    except LookupError:
+#         print("Downloading NLTK data...")
+        nltk.download('punkt')
+        nltk.download('punkt_tab')  # Add this line
+        nltk.download('stopwords')
+        nltk.download('averaged_perceptron_tagger')
+#         print("NLTK data downloaded successfully")
+    return nltk
+
+def sent_tokenize(text):
+    """Split text into sentences with NLTK (imported lazily)"""
+    ensure_nltk_data()
+    from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+    return nltk_sent_tokenize(text)
+
+def word_tokenize(text):
+    """Split text into word tokens with NLTK (imported lazily)"""
+    ensure_nltk_data()
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+    return nltk_word_tokenize(text)
+
+@lru_cache(maxsize=None)
+def punkt_tokenizer():
+    """The English punkt model used by sent_tokenize (loaded once)"""
+    ensure_nltk_data()
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+    except ImportError:
+        # NLTK < 3.8.2 loads the pickled PunktSentenceTokenizer instead
+        import nltk
+        return nltk.data.load('tokenizers/punkt/english.pickle')
+    return PunktTokenizer('english')
+
+@lru_cache(maxsize=None)
+def word_tokenizer():
+    """The NLTKWordTokenizer that word_tokenize applies to each sentence"""
+    from nltk.tokenize import NLTKWordTokenizer
+    return NLTKWordTokenizer()
+
+def _token_spans(sentence):
+    """(start, end) of each word_tokenize token within one sentence"""
+    tokenizer = word_tokenizer()
+    try:
+        return list(tokenizer.span_tokenize(sentence))
+    except ValueError:
+        # Tokens the aligner can't place (rewritten quotes etc.) still count
+        spans, position = [], 0
+        for token in tokenizer.tokenize(sentence):
+            start = sentence.find(token, position)
+            if start < 0:
+                spans.append((position, position))
+            else:
+                position = start + len(token)
+                spans.append((start, position))
+        return spans
+
+class ParsedDocument:
+    """Text of one document with lazily computed sentence and word spans.
+
+    Spans are (n, 2) integer arrays of [start, end) offsets into `text`,
+    the same boundaries sent_tokenize/word_tokenize produce; strings are
+    sliced out on demand.  Build one per document and hand it to the
+    analyzer, summarizer and evaluator so the text is tokenized once.
+    """
+    __slots__ = ('text', '_sentence_spans', '_word_spans', '_token_counts')
+
+    def __init__(self, text, sentence_spans=None):
+        self.text = text
+        self._sentence_spans = sentence_spans
+        self._word_spans = None
+        self._token_counts = None  # per-sentence, when loaded from a SentenceIndex
+
+    def __bool__(self):
+        # Empty like the '' or [] it stands in for
+        return bool(self.text)
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        return cls(' '.join(chunks))
+
+    def _spans_array(self, spans):
+        dtype = np.int32 if len(self.text) < 2**31 else np.int64
+        return np.asarray(spans, dtype=dtype).reshape(-1, 2)
+
+    @property
+    def sentence_spans(self):
+        if self._sentence_spans is None:
+            self._sentence_spans = self._spans_array(list(punkt_tokenizer().span_tokenize(self.text)))
+        return self._sentence_spans
+
+    @property
+    def word_spans(self):
+        if self._word_spans is None:
+            # Flat machine-int buffer, not a list of tuples, while collecting
+            spans = array('q')
+            for start, end in self.sentence_spans.tolist():
+                for token_start, token_end in _token_spans(self.text[start:end]):
+                    spans.append(start + token_start)
+                    spans.append(start + token_end)
+            self._word_spans = self._spans_array(np.frombuffer(spans, dtype=np.int64))
+        return self._word_spans
+
+    @property
+    def sentence_count(self):
+        return len(self.sentence_spans)
+
+    @property
+    def word_count(self):
+        if self._word_spans is None and self._token_counts is not None:
+            return int(self._token_counts.sum())
+        return len(self.word_spans)
+
+    def sentence(self, index):
+        start, end = self.sentence_spans[index]
+        return self.text[start:end]
+
+    def iter_sentences(self):
+        text = self.text
+        return (text[start:end] for start, end in self.sentence_spans.tolist())
+
+def as_document(value):
+    """ParsedDocument for a ParsedDocument, a list of chunks or a string"""
+    if isinstance(value, ParsedDocument):
+        return value
+    if isinstance(value, str):
+        return ParsedDocument(value)
+    return ParsedDocument.from_chunks(value)
+
+def TfidfVectorizer(*args, **kwargs):
+    """Build a scikit-learn TfidfVectorizer, importing sklearn on first use"""
+    from sklearn.feature_extraction.text import TfidfVectorizer as SklearnTfidfVectorizer
+    return SklearnTfidfVectorizer(*args, **kwargs)
+
+def cosine_similarity(*args, **kwargs):
+    """scikit-learn cosine_similarity, imported on first use"""
+    from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine_similarity
+    return sklearn_cosine_similarity(*args, **kwargs)
 
 # Define data paths
 BASE_DIR = Path('.')
@@ -82,6 +207,15 @@ SEMANTIC_DIR = BASE_DIR / 'Semantic'
 TOKENWISE_DIR = BASE_DIR / 'TokenWise'
 RECURSIVE_DIR = BASE_DIR / 'Recursive'
 ORIGINAL_DIR = BASE_DIR / 'Original-Judgements'
+INDEX_DIR = BASE_DIR / 'index'
+
+def original_judgment_path(case_name, original_dir=ORIGINAL_DIR):
+    """Path of Original-Judgements/<case_name>.txt, else .pdf, else None"""
+    for suffix in ('.txt', '.pdf'):
+        path = Path(original_dir) / f'{case_name}{suffix}'
+        if path.exists():
+            return path
+    return None
 
 # Verify directories exist
 directories = {
@@ -92,147 +226,681 @@ directories = {
     'Original': ORIGINAL_DIR
 }
 
-for name, path in directories.items():
+def verify_directories():
+    """Count the files in each data directory (None when it is missing)"""
+    file_counts = {}
+    for name, path in directories.items():
+        if path.exists():
+            file_counts[name] = len(list(path.glob('*')))
+#             print(f"✓ {name}: {file_counts[name]} files found")
+        else:
+            file_counts[name] = None
+#             print(f"✗ {name}: Directory not found")
+    return file_counts
+
+# Loader cache limits (entries and total characters cached)
+LOADER_CACHE_MAX_ENTRIES = int(os.environ.get('LOADER_CACHE_MAX_ENTRIES', '512'))
+LOADER_CACHE_MAX_CHARS = int(os.environ.get('LOADER_CACHE_MAX_CHARS', str(64 * 1024 * 1024)))
+# 'files' reads the per-case .txt files, 'packed' reads the output of pack_corpus()
+CORPUS_BACKEND = os.environ.get('CORPUS_BACKEND', 'files')
+PACKED_DIR = BASE_DIR / 'packed'
+
+# kind -> (directory, file name prefix); file names are f'{prefix}{case}.txt'
+CORPUS_LAYOUT = {
+    'metadata': ('metadata', 'metadata'),
+    'semantic': ('Semantic', 'Semantic-Chunker-'),
+    'tokenwise': ('TokenWise', 'Token-Chunker-'),
+    'recursive': ('Recursive', 'Recursive-Chunker-'),
+}
+
+# One catalog JSON per corpus directory, named after its resolved path
+CATALOG_DIR = Path(os.environ.get('CATALOG_DIR', INDEX_DIR / 'catalog'))
+
+class CaseCatalog:
     pass
-    if path.exists():
-        pass
-        file_count = len(list(path.glob('*')))
-#         print(f"✓ {name}: {file_count} files found")
-    else:
-        pass
-#         print(f"✗ {name}: Directory not found")
+    """Persisted listing of the file corpus: cases per kind with size and mtime.
+
+    Stored as JSON under the app's CATALOG_DIR, not in the corpus, which
+    may be read-only or shared.  `refresh()` stats each
+    kind's directory and only rescans one whose mtime changed, diffing the
+    listing against the catalog and stat()ing just the new files, so listing
+    a large unchanged corpus is one file read plus one stat per directory.
+    Edits to an existing file do not touch the directory mtime; readers
+    still validate contents with their own file signature.
+    """
+    VERSION = 1
+    # Directory mtimes this recent may still miss a same-tick change; don't trust them yet
+    RACY_SECONDS = 2
+
+    def __init__(self, base_dir='.', path=None):
+        self.base_dir = Path(base_dir)
+        if path is None:
+            corpus_id = hashlib.blake2b(str(self.base_dir.resolve()).encode('utf-8'), digest_size=8).hexdigest()
+            path = CATALOG_DIR / f'{corpus_id}.json'
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirs = {}  # kind -> directory mtime_ns at the last scan
+        self._files = {kind: {} for kind in CORPUS_LAYOUT}  # kind -> case -> [size, mtime_ns]
+        self._sorted = {}  # kind -> sorted case numbers
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (data.get('version') != self.VERSION or data.get('base_dir') != str(self.base_dir.resolve())
+                or set(data.get('cases', {})) != set(CORPUS_LAYOUT)):
+            return
+        self._dirs = data['dirs']
+        self._files = data['cases']
+
+    def _save(self):
+        data = {'version': self.VERSION, 'base_dir': str(self.base_dir.resolve()), 'dirs': self._dirs,
+                'cases': self._files}
+        temp_path = self.path.with_name(f'{self.path.name}.{uuid.uuid4().hex}.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except OSError:
+            # An unwritable CATALOG_DIR still gets an in-memory catalog
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def _scan(self, kind, dir_mtime):
+        dirname, prefix = CORPUS_LAYOUT[kind]
+        pattern = re.compile(rf'{re.escape(prefix)}(\d+)\.txt')
+        listed = {}
+        if dir_mtime is not None:
+            with os.scandir(self.base_dir / dirname) as entries:
+                for entry in entries:
+                    file_num = pattern.fullmatch(entry.name)
+                    if file_num:
+                        listed[file_num.group(1)] = entry
+        files = self._files[kind]
+        for case_num in files.keys() - listed.keys():
+            del files[case_num]
+        for case_num, entry in listed.items():
+            if case_num not in files:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files[case_num] = [stat.st_size, stat.st_mtime_ns]
+        self._sorted.pop(kind, None)
+
+    def refresh(self, kinds=None):
+        """Bring the catalog up to date; returns True if anything was rescanned"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            changed = False
+            for kind in kinds or CORPUS_LAYOUT:
+                try:
+                    dir_mtime = os.stat(self.base_dir / CORPUS_LAYOUT[kind][0]).st_mtime_ns
+                except OSError:
+                    dir_mtime = None
+                if kind in self._dirs and self._dirs[kind] == dir_mtime:
+                    continue
+                self._scan(kind, dir_mtime)
+                if dir_mtime is not None and time.time_ns() - dir_mtime < self.RACY_SECONDS * 10**9:
+                    self._dirs.pop(kind, None)
+                else:
+                    self._dirs[kind] = dir_mtime
+                changed = True
+            if changed:
+                self._save()
+            return changed
+
+    def case_numbers(self, kind='metadata'):
+        """Sorted case numbers that have a file of this kind"""
+        self.refresh((kind,))
+        with self._lock:
+            numbers = self._sorted.get(kind)
+            if numbers is None:
+                numbers = self._sorted[kind] = sorted(self._files[kind], key=int)
+            return list(numbers)
+
+    def has_case(self, case_number, kind='metadata'):
+        self.refresh((kind,))
+        with self._lock:
+            return str(case_number) in self._files[kind]
+
+    def case_info(self, case_number):
+        """{kind: {'size', 'mtime_ns'}} for every kind the case has"""
+        self.refresh()
+        with self._lock:
+            return {kind: {'size': files[str(case_number)][0], 'mtime_ns': files[str(case_number)][1]}
+                    for kind, files in self._files.items() if str(case_number) in files}
+
+    def stats(self):
+        self.refresh()
+        with self._lock:
+            return {kind: {'cases': len(files), 'bytes': sum(size for size, _ in files.values())}
+                    for kind, files in self._files.items()}
+
+class FileCorpusBackend:
+    pass
+    """Reads one .txt file per (kind, case) from the corpus directories"""
+    def __init__(self, base_dir='.', catalog=None):
+        self.base_dir = Path(base_dir)
+        self.catalog = catalog or CaseCatalog(self.base_dir)
+
+    def path(self, kind, case_number):
+        dirname, prefix = CORPUS_LAYOUT[kind]
+        return self.base_dir / dirname / f'{prefix}{case_number}.txt'
+
+    def signature(self, kind, case_number):
+        """(mtime_ns, size) of the file, or None if it does not exist"""
+        try:
+            stat = os.stat(self.path(kind, case_number))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read(self, kind, case_number):
+        with open(self.path(kind, case_number), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def case_numbers(self, kind):
+        return self.catalog.case_numbers(kind)
+
+    def has_case(self, kind, case_number):
+        return self.catalog.has_case(case_number, kind)
+
+class PackedCorpusBackend:
+    pass
+    """Reads records out of the packed corpus files written by pack_corpus().
+
+    Each kind is one `{kind}.pack` file of concatenated UTF-8 records
+    (optionally zlib-compressed per record) plus a `{kind}.idx.json` offset
+    index.  Packs are memory-mapped, so a record read is a slice of the
+    mapping: no per-case open()/stat() and one inode per kind.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, packed_dir=PACKED_DIR):
+        self.packed_dir = Path(packed_dir)
+        self._packs = {}
+        self._lock = threading.Lock()
+
+    def _pack(self, kind):
+        with self._lock:
+            pack = self._packs.get(kind)
+            if pack is None:
+                with open(self.packed_dir / f'{kind}.idx.json', 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if index.get('version') != self.FORMAT_VERSION:
+                    raise ValueError(f"Unsupported pack version: {index.get('version')}")
+                pack_path = self.packed_dir / f'{kind}.pack'
+                stat = os.stat(pack_path)
+                mapping = None
+                if stat.st_size:
+                    with open(pack_path, 'rb') as f:
+                        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                pack = {'records': index['records'], 'compression': index.get('compression'),
+                        'mapping': mapping, 'id': (stat.st_mtime_ns, stat.st_size)}
+                self._packs[kind] = pack
+            return pack
+
+    def signature(self, kind, case_number):
+        pack = self._pack(kind)
+        record = pack['records'].get(str(case_number))
+        if record is None:
+            return None
+        return pack['id'] + tuple(record)
+
+    def read(self, kind, case_number):
+        pack = self._pack(kind)
+        offset, length = pack['records'][str(case_number)]
+        raw = pack['mapping'][offset:offset + length] if length else b''
+        if pack['compression'] == 'zlib':
+            raw = zlib.decompress(raw)
+        return raw.decode('utf-8')
+
+    def case_numbers(self, kind):
+        return sorted(self._pack(kind)['records'], key=int)
+
+    def has_case(self, kind, case_number):
+        return str(case_number) in self._pack(kind)['records']
+
+    def close(self):
+        with self._lock:
+            for pack in self._packs.values():
+                if pack['mapping'] is not None:
+                    pack['mapping'].close()
+            self._packs.clear()
+
+def pack_corpus(base_dir='.', packed_dir=PACKED_DIR, compress=False):
+    """Pack every metadata/chunk file into one file per kind plus an offset index.
+
+    Records hold the raw file text, so the packed loader splits chunks
+    exactly like the file loader.  With `compress=True` each record is
+    zlib-compressed on its own, keeping random access O(1).
+    """
+    source = FileCorpusBackend(base_dir)
+    packed_dir = Path(packed_dir)
+    packed_dir.mkdir(parents=True, exist_ok=True)
+    summary = {}
+    for kind in CORPUS_LAYOUT:
+        records = {}
+        offset = 0
+        pack_path = packed_dir / f'{kind}.pack'
+        temp_path = pack_path.with_suffix('.pack.tmp')
+        with open(temp_path, 'wb') as out:
+            for case_num in sorted(source.case_numbers(kind), key=int):
+                data = source.read(kind, case_num).encode('utf-8')
+                if compress:
+                    data = zlib.compress(data, 6)
+                out.write(data)
+                records[case_num] = [offset, len(data)]
+                offset += len(data)
+        index = {'version': PackedCorpusBackend.FORMAT_VERSION,
+                 'compression': 'zlib' if compress else None, 'records': records}
+        index_temp_path = packed_dir / f'{kind}.idx.json.tmp'
+        with open(index_temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(temp_path, pack_path)
+        os.replace(index_temp_path, packed_dir / f'{kind}.idx.json')
+        summary[kind] = {'records': len(records), 'bytes': offset}
+    return summary
 
 class LegalDocumentLoader:
     pass
-    def __init__(self, base_dir='.'):
+    """Loads metadata and chunked case text from the corpus.
+
+    File contents are kept in a bounded LRU cache keyed by (kind, case) and
+    validated against the backend's signature (file mtime and size, or the
+    pack record), so repeated analyses of a case hit storage once.
+    `backend` is 'files' (per-case .txt files) or 'packed' (pack_corpus()
+    output in `packed_dir`).
+    """
+    STRATEGY_LOCATIONS = {kind: CORPUS_LAYOUT[kind] for kind in ('semantic', 'tokenwise', 'recursive')}
+
+    def __init__(self, base_dir='.', cache_max_entries=LOADER_CACHE_MAX_ENTRIES,
+                 cache_max_chars=LOADER_CACHE_MAX_CHARS, backend='files', packed_dir=None):
         pass
         self.base_dir = Path(base_dir)
         self.metadata_dir = self.base_dir / 'metadata'
         self.semantic_dir = self.base_dir / 'Semantic'
         self.tokenwise_dir = self.base_dir / 'TokenWise'
         self.recursive_dir = self.base_dir / 'Recursive'
+        if backend == 'files':
+            self.backend = FileCorpusBackend(self.base_dir)
+        elif backend == 'packed':
+            self.backend = PackedCorpusBackend(packed_dir or self.base_dir / 'packed')
+        else:
+            raise ValueError("backend must be 'files' or 'packed'")
+        self.cache_max_entries = cache_max_entries
+        self.cache_max_chars = cache_max_chars
+        self._cache = OrderedDict()  # (kind, case) -> (signature, value, size)
+        self._cache_chars = 0
+        self._cache_lock = threading.Lock()
+        self._cache_counters = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    def _check_strategy(self, chunk_type):
+        if chunk_type not in self.STRATEGY_LOCATIONS:
+            raise ValueError("chunk_type must be 'semantic', 'tokenwise', or 'recursive'")
+
+    @staticmethod
+    def _split_chunks(content):
+        # Split by '---' if it exists (for chunked content)
+        chunks = [chunk.strip() for chunk in content.split('---') if chunk.strip()]
+        return chunks if len(chunks) > 1 else [content]
+
+    def _read_cached(self, kind, case_number, parse):
+        """Return parse(record text), or None if the record does not exist.
+
+        The parsed value is reused while the backend signature is unchanged.
+        """
+        key = (kind, case_number)
+        signature = self.backend.signature(kind, case_number)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[0] == signature:
+                    self._cache.move_to_end(key)
+                    self._cache_counters['hits'] += 1
+                    return entry[1]
+                self._cache_counters['invalidations'] += 1
+                self._drop(key)
+            if signature is None:
+                return None
+            self._cache_counters['misses'] += 1
+
+        content = self.backend.read(kind, case_number)
+        value = parse(content)
+
+        with self._cache_lock:
+            size = len(content)
+            if self.cache_max_entries > 0 and size <= self.cache_max_chars:
+                self._drop(key)
+                self._cache[key] = (signature, value, size)
+                self._cache_chars += size
+                while (len(self._cache) > self.cache_max_entries
+                       or self._cache_chars > self.cache_max_chars):
+                    self._drop(next(iter(self._cache)))
+                    self._cache_counters['evictions'] += 1
+        return value
+
+    def _drop(self, key):
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._cache_chars -= entry[2]
+
+    def cache_stats(self):
+        """Hit/miss counters and current size of the file cache"""
+        with self._cache_lock:
+            stats = dict(self._cache_counters)
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+            stats['entries'] = len(self._cache)
+            stats['chars'] = self._cache_chars
+            return stats
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_chars = 0
         
     def load_metadata(self, file_number=None):
         pass
         """Load metadata for specific file or all files"""
-        metadata_files = list(self.metadata_dir.glob('metadata*.txt'))
-        
         if file_number:
             pass
-            file_path = self.metadata_dir / f'metadata{file_number}.txt'
-            if file_path.exists():
-                pass
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    pass
-                    return f.read().strip()
-            return None
+            return self._read_cached('metadata', str(file_number), str.strip)
             
         metadata_dict = {}
-        for file_path in metadata_files:
+        for num in self.backend.case_numbers('metadata'):
             pass
-            file_num = re.search(r'metadata(\d+)\.txt', file_path.name)
-            if file_num:
+            try:
                 pass
-                num = file_num.group(1)
-                try:
-                    pass
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        pass
-                        metadata_dict[num] = f.read().strip()
-                except Exception as e:
-                    pass
-#                     print(f"Error reading {file_path}: {e}")
+                metadata = self._read_cached('metadata', num, str.strip)
+                if metadata is not None:
+                    metadata_dict[num] = metadata
+            except Exception as e:
+                pass
+#                 print(f"Error reading metadata {num}: {e}")
         return metadata_dict
     
     def load_chunked_text(self, chunk_type, file_number=None):
         pass
         """Load chunked text from specified directory"""
-        if chunk_type == 'semantic':
-            pass
-            directory = self.semantic_dir
-            prefix = 'Semantic-Chunker-'
-        elif chunk_type == 'tokenwise':
-            pass
-            directory = self.tokenwise_dir
-            prefix = 'Token-Chunker-'
-        elif chunk_type == 'recursive':
-            pass
-            directory = self.recursive_dir
-            prefix = 'Recursive-Chunker-'
-        else:
-            pass
-            raise ValueError("chunk_type must be 'semantic', 'tokenwise', or 'recursive'")
+        self._check_strategy(chunk_type)
         
         if file_number:
             pass
-            file_path = directory / f'{prefix}{file_number}.txt'
-            if file_path.exists():
+            try:
                 pass
-                try:
-                    pass
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        pass
-                        content = f.read()
-                        # Split by '---' if it exists (for chunked content)
-                        chunks = [chunk.strip() for chunk in content.split('---') if chunk.strip()]
-                        return chunks if len(chunks) > 1 else [content]
-                except Exception as e:
-                    pass
-#                     print(f"Error reading {file_path}: {e}")
-                    return None
-            return None
+                chunks = self._read_cached(chunk_type, str(file_number), self._split_chunks)
+            except Exception as e:
+                pass
+#                 print(f"Error reading {chunk_type} chunks for {file_number}: {e}")
+                return None
+            # Copy so callers can't modify the cached list
+            return list(chunks) if chunks is not None else None
         
         # Load all files
         all_files = {}
-        files = list(directory.glob(f'{prefix}*.txt'))
-        for file_path in files:
+        for num in self.backend.case_numbers(chunk_type):
             pass
-            file_num = re.search(rf'{prefix}(\d+)\.txt', file_path.name)
-            if file_num:
+            try:
                 pass
-                num = file_num.group(1)
-                try:
-                    pass
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        pass
-                        content = f.read()
-                        chunks = [chunk.strip() for chunk in content.split('---') if chunk.strip()]
-                        all_files[num] = chunks if len(chunks) > 1 else [content]
-                except Exception as e:
-                    pass
-#                     print(f"Error reading {file_path}: {e}")
+                chunks = self._read_cached(chunk_type, num, self._split_chunks)
+                if chunks is not None:
+                    all_files[num] = list(chunks)
+            except Exception as e:
+                pass
+#                 print(f"Error reading {chunk_type} chunks for {num}: {e}")
         return all_files
     
-    def get_available_cases(self):
+    def get_available_cases(self, kind='metadata'):
         pass
         """Get list of available case numbers"""
-        metadata_files = list(self.metadata_dir.glob('metadata*.txt'))
-        case_numbers = []
-        for file_path in metadata_files:
-            pass
-            file_num = re.search(r'metadata(\d+)\.txt', file_path.name)
-            if file_num:
-                pass
-                case_numbers.append(file_num.group(1))
-        return sorted(case_numbers, key=int)
+        return self.backend.case_numbers(kind)
+
+    def has_case(self, case_number, kind='metadata'):
+        """Whether the corpus has a `kind` file for this case"""
+        return self.backend.has_case(kind, str(case_number))
 
 # Initialize loader
-loader = LegalDocumentLoader()
-available_cases = loader.get_available_cases()
+loader = LegalDocumentLoader(backend=CORPUS_BACKEND)
+# `available_cases` is resolved on access (see __getattr__ below) from the
+# case catalog, so it is never stale and importing the module does no I/O.
+
+def __getattr__(name):
+    """Resolve module attributes that need corpus access on first use"""
+    if name == 'available_cases':
+        return loader.get_available_cases()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 # print(f"Found {len(available_cases)} cases")
 # print(f"Case numbers range: {min(available_cases, key=int)} to {max(available_cases, key=int)}")
 
+# --- Sentence sidecar index ---
+SENTENCE_INDEX_DIR = Path(os.environ.get('SENTENCE_INDEX_DIR', INDEX_DIR / 'sentences'))
+
+class SentenceIndex:
+    pass
+    """Precomputed sentence boundaries (and token counts) for the chunk corpus.
+
+    `build()` runs punkt once per chunk file offline and writes a small
+    binary sidecar: a header, the (n, 2) int32 sentence spans and optionally
+    per-sentence token counts.  Sidecars are addressed by a BLAKE2b digest of
+    the joined chunk text and `version()` (the sidecar format plus the NLTK
+    release that tokenized it), so `attach()` finds them from the text alone,
+    whoever loaded it, while an edited chunk file or an NLTK upgrade simply
+    misses.
+    """
+    MAGIC = b'SENT'
+    FORMAT = 2
+    TOKEN_COUNTS = 1
+    HEADER = struct.Struct('<4sHHQ16sI')  # magic, format, flags, text length, digest, sentences
+
+    def __init__(self, index_dir=SENTENCE_INDEX_DIR):
+        self.index_dir = Path(index_dir)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def version():
+        """Sidecar format and NLTK release, read from package metadata so nltk isn't imported"""
+        from importlib.metadata import version
+        return f'{SentenceIndex.FORMAT}/nltk-{version("nltk")}'
+
+    @classmethod
+    def key(cls, text):
+        digest = hashlib.blake2b(cls.version().encode('utf-8'), digest_size=16)
+        digest.update(text.encode('utf-8'))
+        return len(text), digest.digest()
+
+    def path(self, length, digest):
+        name = digest.hex()
+        return self.index_dir / name[:2] / f'{name}.sent'
+
+    def attach(self, document):
+        """Give `document` its stored sentence spans if a sidecar exists"""
+        if document._sentence_spans is not None or len(document.text) >= 2**31:
+            return document
+        length, digest = self.key(document.text)
+        try:
+            with open(self.path(length, digest), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return document
+        magic, fmt, flags, stored_length, stored_digest, count = self.HEADER.unpack_from(data)
+        if (magic, fmt, stored_length, stored_digest) != (self.MAGIC, self.FORMAT, length, digest):
+            return document
+        values = np.frombuffer(data, dtype='<i4', offset=self.HEADER.size)
+        document._sentence_spans = values[:2 * count].reshape(count, 2)
+        if flags & self.TOKEN_COUNTS:
+            document._token_counts = values[2 * count:3 * count]
+        return document
+
+    def write(self, document, token_counts=True):
+        """Store the document's sentence spans (computing them if needed)"""
+        length, digest = self.key(document.text)
+        spans = np.ascontiguousarray(document.sentence_spans, dtype='<i4')
+        payload = spans.tobytes()
+        flags = 0
+        if token_counts:
+            tokenizer = word_tokenizer()
+            counts = [len(tokenizer.tokenize(sentence)) for sentence in document.iter_sentences()]
+            payload += np.asarray(counts, dtype='<i4').tobytes()
+            flags |= self.TOKEN_COUNTS
+        path = self.path(length, digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'{path.name}.{uuid.uuid4().hex}.tmp')
+        with open(temp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.FORMAT, flags, length, digest, len(spans)))
+            f.write(payload)
+        os.replace(temp_path, path)
+        return path
+
+    def build(self, corpus_loader=None, kinds=('semantic', 'tokenwise', 'recursive'), token_counts=True):
+        """Write sidecars for every chunk file that doesn't have one yet"""
+        corpus_loader = corpus_loader or loader
+        stats = {'written': 0, 'existing': 0}
+        for kind in kinds:
+            for case_num in corpus_loader.get_available_cases(kind):
+                chunks = corpus_loader.load_chunked_text(kind, case_num)
+                if not chunks:
+                    continue
+                document = ParsedDocument.from_chunks(chunks)
+                if len(document.text) >= 2**31:
+                    continue
+                if self.attach(document)._sentence_spans is not None:
+                    stats['existing'] += 1
+                    continue
+                self.write(document, token_counts)
+                stats['written'] += 1
+        return stats
+
+sentence_index = SentenceIndex()
+
+# Parties and judge are only looked for in the judgment header
+BASIC_INFO_HEADER_CHARS = int(os.environ.get('BASIC_INFO_HEADER_CHARS', '8000'))
+# Per-document cutoff for entity extraction, checked between steps (and
+# between case-citation matches): once it has passed, the remaining steps are
+# skipped and the result is marked 'partial'.  A step that has started always
+# finishes, so this is not a hard limit on extraction time.
+EXTRACTION_TIME_BUDGET = float(os.environ.get('EXTRACTION_TIME_BUDGET', '2.0'))
+
+# Header patterns.  Each is matched at a known position with no quantifier
+# that can backtrack, so cost is linear in the header length.
+CAPS_RUN = re.compile(r'[A-Z\s\.\,]*')
+CAPS_RUNS = re.compile(r'[A-Z\s\.\,]+')
+APPELLANT_MARKER = re.compile(r'APPELLANT\s+VERSUS\s')
+ELLIPSIS_RESPONDENT = re.compile(r'…\s*RESPONDENT')
+# Same matches as ([A-Z\s]+v\.?\s+[A-Z\s]+(?:\(\d{4}\)\s*\d+\s*[A-Z]+\s*\d+)?): the
+# lookbehind only lets a match start where a caps run begins, so each run is
+# tried once instead of once per character
+CASE_CITATION = re.compile(r'(?<![A-Z\s])[A-Z\s]+v\.?\s[A-Z\s]+(?:\(\d{4}\)\s*\d+\s*[A-Z]+\s*\d+)?')
+
 class TextAnalyzer:
     pass
     def __init__(self):
         pass
-        self.stop_words = set(stopwords.words('english'))
-        self.stemmer = PorterStemmer()
+        self._stop_words = None
+        self._stemmer = None
+
+    @property
+    def stop_words(self):
+        """English stopwords, loaded from NLTK on first access"""
+        if self._stop_words is None:
+            ensure_nltk_data()
+            from nltk.corpus import stopwords
+            self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
+
+    @property
+    def stemmer(self):
+        """Porter stemmer, created on first access"""
+        if self._stemmer is None:
+            from nltk.stem import PorterStemmer
+            self._stemmer = PorterStemmer()
+        return self._stemmer
         
-    def extract_basic_info(self, text):
+    @staticmethod
+    def _header_parties(header):
+        """(appellant, respondent) from 'X … APPELLANT VERSUS Y … RESPONDENT', or None.
+
+        Gives what the backtracking pattern ([A-Z\s.,]+)\s*…?\s*APPELLANT\s+VERSUS\s+
+        ([A-Z\s.,]+)\s*…?\s*RESPONDENT found: the match starts at the first
+        caps run that leads into a complete marker, and the appellant extends
+        to the last complete marker reachable within that run.
+        """
+        runs = [run.span() for run in CAPS_RUNS.finditer(header)]
+        starts = [run_start for run_start, _ in runs]
+
+        def run_around(position):
+            """(start, end) of the caps run covering `position`, or None"""
+            k = bisect.bisect_right(starts, position) - 1
+            return runs[k] if position >= 0 and k >= 0 and runs[k][1] > position else None
+
+        found = None
+        for marker in APPELLANT_MARKER.finditer(header):
+            # Appellant: the caps run before the marker, or before an '…' that
+            # only whitespace separates from it; the earlier start wins
+            before = run_around(marker.start() - 1)
+            ellipsis = marker.start() - 1
+            if before is not None:
+                ellipsis = before[0] - 1 if not header[before[0]:marker.start()].strip() else -1
+            appellant = None
+            if ellipsis >= 0 and header[ellipsis] == '…':
+                run = run_around(ellipsis - 1)
+                if run is not None:
+                    appellant = (run[0], ellipsis)
+            if appellant is None and before is not None:
+                appellant = (before[0], marker.start())
+            if appellant is None:
+                continue
+            if found is not None and appellant[0] != found[0][0]:
+                break
+
+            # Respondent: the caps run after the marker, up to its last
+            # RESPONDENT; whitespace alone is enough, as in VERSUS\s+(\s)
+            after = run_around(marker.end())
+            run_end = after[1] if after is not None else marker.end()
+            if run_end > marker.end() and ELLIPSIS_RESPONDENT.match(header, run_end):
+                respondent_end = run_end
+            else:
+                respondent_end = header.rfind('RESPONDENT', marker.end() + 1, run_end)
+                if respondent_end < 0:
+                    continue
+            found = (appellant, (marker.end(), respondent_end))
+        if found is None:
+            return None
+        (appellant_start, appellant_end), (respondent_start, respondent_end) = found
+        return (header[appellant_start:appellant_end].strip(),
+                header[respondent_start:respondent_end].strip())
+
+    @staticmethod
+    def _header_judge(header):
+        """Name before the last 'J.' in the caps run after 'J U D G M E N T', or None"""
+        anchor = 'J U D G M E N T'
+        start = header.find(anchor)
+        while start >= 0:
+            name_start = start + len(anchor)
+            run_end = CAPS_RUN.match(header, name_start).end()
+            judge_end = header.rfind('J.', name_start + 2, run_end)
+            if header[name_start:name_start + 1].isspace() and judge_end >= 0:
+                return header[name_start:judge_end].strip()
+            start = header.find(anchor, start + 1)
+        return None
+
+    def extract_basic_info(self, text, time_budget=EXTRACTION_TIME_BUDGET):
         pass
         """Extract basic information from legal text"""
+        if isinstance(text, ParsedDocument):
+            text = text.text
         info = {}
+        deadline = time.perf_counter() + time_budget
+        header = text[:BASIC_INFO_HEADER_CHARS]
         
         # Extract case citation
         citation_pattern = r'(\d{4}\s+(?:INSC|SCC|SC)\s+\d+)'
@@ -240,21 +908,24 @@ class TextAnalyzer:
         info['citations'] = citations
         
         # Extract parties (APPELLANT vs RESPONDENT)
-        parties_pattern = r'([A-Z\s\.\,]+)\s*…?\s*APPELLANT\s+VERSUS\s+([A-Z\s\.\,]+)\s*…?\s*RESPONDENT'
-        parties = re.search(parties_pattern, text)
+        if time.perf_counter() > deadline:
+            info['partial'] = True
+            return info
+        parties = self._header_parties(header)
         if parties:
             pass
-            info['appellant'] = parties.group(1).strip()
-            info['respondent'] = parties.group(2).strip()
+            info['appellant'], info['respondent'] = parties
         
         # Extract judges
-        judge_pattern = r'J U D G M E N T\s+([A-Z\s\.\,]+),?\s*J\.'
-        judge = re.search(judge_pattern, text)
+        judge = self._header_judge(header)
         if judge:
             pass
-            info['judge'] = judge.group(1).strip()
+            info['judge'] = judge
         
         # Extract date
+        if time.perf_counter() > deadline:
+            info['partial'] = True
+            return info
         date_pattern = r'(\d{1,2}\.\d{1,2}\.\d{4})'
         dates = re.findall(date_pattern, text)
         info['dates'] = dates
@@ -265,11 +936,13 @@ class TextAnalyzer:
         pass
         """Calculate text statistics"""
         stats = {}
+        document = sentence_index.attach(as_document(text))
+        text = document.text
         
         # Basic counts
         stats['char_count'] = len(text)
-        stats['word_count'] = len(word_tokenize(text))
-        stats['sentence_count'] = len(sent_tokenize(text))
+        stats['word_count'] = document.word_count
+        stats['sentence_count'] = document.sentence_count
         
         # Average lengths
         stats['avg_words_per_sentence'] = stats['word_count'] / max(stats['sentence_count'], 1)
@@ -278,6 +951,7 @@ class TextAnalyzer:
         # Readability (if textstat is available)
         try:
             pass
+            from textstat import flesch_reading_ease, flesch_kincaid_grade
             stats['flesch_reading_ease'] = flesch_reading_ease(text)
             stats['flesch_kincaid_grade'] = flesch_kincaid_grade(text)
         except:
@@ -287,39 +961,34 @@ class TextAnalyzer:
         
         return stats
     
-    def extract_legal_entities(self, text):
+    def extract_legal_entities(self, text, time_budget=EXTRACTION_TIME_BUDGET):
         pass
         """Extract legal entities and concepts"""
+        if isinstance(text, ParsedDocument):
+            text = text.text
         entities = {}
+        deadline = time.perf_counter() + time_budget
         
-        # Legal acts and sections
-        act_pattern = r'([A-Z][a-z\s]+Act,?\s*\d{4})'
-        acts = re.findall(act_pattern, text)
-        entities['acts'] = list(set(acts))
-        
-        # Section references
-        section_pattern = r'Section\s+(\d+[A-Za-z]?(?:\(\d+\))?)'
-        sections = re.findall(section_pattern, text)
-        entities['sections'] = list(set(sections))
+        # Acts, sections and legal terms come from one scan of the text
+        found = entity_scanner.scan(text)
+        entities['acts'] = list(found['analyzer_acts'])
+        entities['sections'] = list(found['analyzer_sections'])
         
         # Case citations
-        citation_pattern = r'([A-Z\s]+v\.?\s+[A-Z\s]+(?:\(\d{4}\)\s*\d+\s*[A-Z]+\s*\d+)?)'
-        citations = re.findall(citation_pattern, text)
-        entities['case_citations'] = [c.strip() for c in citations if len(c.strip()) > 10][:10]  # Limit to 10
+        citations = []
+        for match in CASE_CITATION.finditer(text):
+            citation = match.group().strip()
+            if len(citation) > 10:
+                citations.append(citation)
+                if len(citations) == 10:  # Limit to 10
+                    break
+            if time.perf_counter() > deadline:
+                entities['partial'] = True
+                break
+        entities['case_citations'] = citations
         
         # Legal terms
-        legal_terms = ['appeal', 'petition', 'writ', 'mandamus', 'certiorari', 'prohibition', 
-                      'habeas corpus', 'jurisdiction', 'constitutional', 'fundamental rights',
-                      'directive principles', 'due process', 'natural justice']
-        
-        found_terms = []
-        text_lower = text.lower()
-        for term in legal_terms:
-            pass
-            if term in text_lower:
-                pass
-                found_terms.append(term)
-        entities['legal_terms'] = found_terms
+        entities['legal_terms'] = found['legal_terms']
         
         return entities
 
@@ -327,11 +996,28 @@ class TextAnalyzer:
 analyzer = TextAnalyzer()
 # print("Text analyzer initialized")
 
+# scikit-learn releases (major.minor) whose CountVectorizer/TfidfTransformer
+# batch_extractive_summary reproduces bit for bit; check each new one with
+# benchmarks/check_batch_summary.py before adding it
+BATCH_SUMMARY_SKLEARN_VERSIONS = ('1.9',)
+
+def batch_summary_verified():
+    """Whether the installed scikit-learn is one batch_extractive_summary was checked against"""
+    import sklearn
+    return '.'.join(sklearn.__version__.split('.')[:2]) in BATCH_SUMMARY_SKLEARN_VERSIONS
+
 class LegalSummarizer:
     pass
     def __init__(self):
         pass
-        self.tfidf = TfidfVectorizer(max_features=1000, stop_words='english', ngram_range=(1, 2))
+        self._tfidf = None
+
+    @property
+    def tfidf(self):
+        """Sentence TF-IDF vectorizer, created on first access"""
+        if self._tfidf is None:
+            self._tfidf = TfidfVectorizer(max_features=1000, stop_words='english', ngram_range=(1, 2))
+        return self._tfidf
         
     def extractive_summary(self, chunks, num_sentences=5):
         pass
@@ -340,31 +1026,166 @@ class LegalSummarizer:
             pass
             return "No content available for summarization"
         
-        # Combine all chunks
-        full_text = ' '.join(chunks)
-        sentences = sent_tokenize(full_text)
+        # Combine all chunks; corpus cases reuse their stored sentence boundaries
+        document = sentence_index.attach(as_document(chunks))
         
-        if len(sentences) <= num_sentences:
+        if document.sentence_count <= num_sentences:
             pass
-            return full_text
+            return document.text
         
         # Calculate TF-IDF scores for sentences
         try:
             pass
-            tfidf_matrix = self.tfidf.fit_transform(sentences)
+            idf_model = get_idf_model()
+            if idf_model is not None:
+                tfidf_matrix = idf_model.transform(document.iter_sentences())
+            else:
+                tfidf_matrix = self.tfidf.fit_transform(document.iter_sentences())
             sentence_scores = np.array(tfidf_matrix.sum(axis=1)).flatten()
+            if not sentence_scores.any():
+                raise ValueError("no scored terms")
             
             # Get top sentences
             top_indices = sentence_scores.argsort()[-num_sentences:][::-1]
             top_indices = sorted(top_indices)
             
-            summary_sentences = [sentences[i] for i in top_indices]
+            summary_sentences = [document.sentence(i) for i in top_indices]
             return ' '.join(summary_sentences)
         except:
             pass
             # Fallback: return first few sentences
-            return ' '.join(sentences[:num_sentences])
+            return ' '.join(document.sentence(i) for i in range(num_sentences))
     
+    def batch_extractive_summary(self, documents, num_sentences=5):
+        """extractive_summary for many documents with one vectorization pass.
+
+        All sentences go through the TF-IDF analyzer once, into a single
+        sparse count matrix.  Each document's block of rows then gets the
+        vocabulary, max_features pruning, smoothed IDF and L2 normalisation
+        a per-document fit would give it, with entries in the same order, so
+        scores and summaries are identical to calling extractive_summary on
+        each document.  That mirrors scikit-learn internals, so with a release
+        outside BATCH_SUMMARY_SKLEARN_VERSIONS each document is fitted on its own.
+        """
+        from scipy import sparse
+        from sklearn.preprocessing import normalize
+
+        summaries = [None] * len(documents)
+        pending = []
+        for position, chunks in enumerate(documents):
+            if not chunks:
+                summaries[position] = "No content available for summarization"
+                continue
+            document = sentence_index.attach(as_document(chunks))
+            if document.sentence_count <= num_sentences:
+                summaries[position] = document.text
+            else:
+                pending.append((position, document))
+        if not pending:
+            return summaries
+
+        idf_model = get_idf_model()
+        if idf_model is not None:
+            # Fixed corpus IDF: one transform over every pending sentence
+            matrix = idf_model.transform(sentence for _, document in pending
+                                         for sentence in document.iter_sentences())
+            sentence_scores = np.array(matrix.sum(axis=1)).flatten()
+            offset = 0
+            for position, document in pending:
+                scores = sentence_scores[offset:offset + document.sentence_count]
+                offset += document.sentence_count
+                if scores.any():
+                    top_indices = sorted(scores.argsort()[-num_sentences:][::-1])
+                else:
+                    top_indices = range(num_sentences)
+                summaries[position] = ' '.join(document.sentence(i) for i in top_indices)
+            return summaries
+
+        if not batch_summary_verified():
+            for position, document in pending:
+                summaries[position] = self.extractive_summary(document, num_sentences)
+            return summaries
+
+        # One analyzer pass; each row lists its terms in order of first occurrence
+        analyze = self.tfidf.build_analyzer()
+        max_features = self.tfidf.max_features
+        vocabulary = {}
+        term_ids, counts, row_ends = array('q'), array('d'), array('q')
+        for _, document in pending:
+            for sentence in document.iter_sentences():
+                feature_counter = {}
+                for term in analyze(sentence):
+                    term_id = vocabulary.setdefault(term, len(vocabulary))
+                    feature_counter[term_id] = feature_counter.get(term_id, 0) + 1
+                term_ids.extend(feature_counter.keys())
+                counts.extend(feature_counter.values())
+                row_ends.append(len(term_ids))
+        term_ids = np.frombuffer(term_ids, dtype=np.int64)
+        counts = np.frombuffer(counts, dtype=np.float64)
+        row_ends = np.frombuffer(row_ends, dtype=np.int64)
+        terms = list(vocabulary)
+        alphabetical = np.empty(len(terms), dtype=np.int64)
+        alphabetical[sorted(range(len(terms)), key=terms.__getitem__)] = np.arange(len(terms))
+
+        data, indices, row_sizes, blocks = [], [], [], []
+        row = width = 0
+        for position, document in pending:
+            n = document.sentence_count
+            start = int(row_ends[row - 1]) if row else 0
+            ends = row_ends[row:row + n]
+            row += n
+            ids = term_ids[start:ends[-1]]
+            if not len(ids):
+                # Only stop words: TfidfVectorizer raises, summary falls back to the first sentences
+                summaries[position] = ' '.join(document.sentence(i) for i in range(num_sentences))
+                continue
+            rows = np.repeat(np.arange(n), np.diff(ends, prepend=start))
+            doc_terms, first_seen = np.unique(ids, return_index=True)
+            local = np.searchsorted(doc_terms, ids)
+            # CountVectorizer numbers features by first appearance, sorts each
+            # row by that number, then renumbers the columns alphabetically
+            appearance = np.argsort(np.argsort(first_seen))
+            order = np.lexsort((appearance[local], rows))
+            feature = np.argsort(np.argsort(alphabetical[doc_terms]))[local[order]]
+            values = counts[start:ends[-1]][order]
+            rows = rows[order]
+            n_features = len(doc_terms)
+            if max_features is not None and n_features > max_features:
+                term_totals = np.bincount(feature, weights=values, minlength=n_features)
+                keep = np.zeros(n_features, dtype=bool)
+                keep[(-term_totals).argsort()[:max_features]] = True
+                kept = keep[feature]
+                feature = (np.cumsum(keep) - 1)[feature[kept]]
+                values = values[kept]
+                rows = rows[kept]
+                n_features = max_features
+            # Smoothed IDF, computed exactly as TfidfTransformer.fit does
+            df = np.bincount(feature, minlength=n_features).astype(np.float64)
+            df += 1.0
+            idf = np.full_like(df, fill_value=n + 1, dtype=np.float64)
+            idf /= df
+            np.log(idf, out=idf)
+            idf += 1.0
+            data.append(values * idf[feature])
+            indices.append(feature)
+            row_sizes.append(np.bincount(rows, minlength=n))
+            blocks.append((position, document))
+            width = max(width, n_features)
+
+        if blocks:
+            indptr = np.concatenate(([0], np.cumsum(np.concatenate(row_sizes))))
+            matrix = sparse.csr_matrix((np.concatenate(data), np.concatenate(indices), indptr),
+                                       shape=(len(indptr) - 1, width))
+            matrix = normalize(matrix, norm='l2', copy=False)
+            sentence_scores = np.array(matrix.sum(axis=1)).flatten()
+            offset = 0
+            for position, document in blocks:
+                scores = sentence_scores[offset:offset + document.sentence_count]
+                offset += document.sentence_count
+                top_indices = sorted(scores.argsort()[-num_sentences:][::-1])
+                summaries[position] = ' '.join(document.sentence(i) for i in top_indices)
+        return summaries
+
     def key_points_extraction(self, chunks):
         pass
         """Extract key legal points"""
@@ -372,8 +1193,7 @@ class LegalSummarizer:
             pass
             return []
         
-        full_text = ' '.join(chunks)
-        sentences = sent_tokenize(full_text)
+        sentences = sentence_index.attach(as_document(chunks)).iter_sentences()
         
         key_indicators = [
             'held that', 'decided that', 'ruled that', 'concluded that',
@@ -435,6 +1255,7 @@ def visualize_chunking_comparison(case_number):
     num_chunks = [comparison[s]['num_chunks'] for s in strategies]
     avg_lengths = [comparison[s]['avg_chunk_length'] for s in strategies]
     
+    import matplotlib.pyplot as plt
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
     
     # Number of chunks
@@ -468,7 +1289,7 @@ def plot_case_statistics():
     
     # Analyze text lengths
     case_lengths = {}
-    for case_num in available_cases[:20]:  # Analyze first 20 cases
+    for case_num in loader.get_available_cases()[:20]:  # Analyze first 20 cases
         pass
         semantic_chunks = loader.load_chunked_text('semantic', case_num)
         if semantic_chunks:
@@ -492,15 +1313,17 @@ def plot_case_statistics():
 
 # print("Visualization functions defined")
 
-def analyze_case(case_number, chunking_strategy='semantic', summary_length=5):
+def analyze_case(case_number, chunking_strategy='semantic', summary_length=5, visualize=True,
+                 corpus_loader=None):
     pass
-    """Comprehensive analysis of a single case"""
+    """Comprehensive analysis of a single case (read through `corpus_loader`, default `loader`)"""
 #     print(f"{'='*60}")
 #     print(f"LEGAL DOCUMENT ANALYSIS - CASE {case_number}")
 #     print(f"{'='*60}")
     
+    corpus_loader = corpus_loader or loader
     # Load metadata
-    metadata = loader.load_metadata(case_number)
+    metadata = corpus_loader.load_metadata(case_number)
     if metadata:
         pass
 #         print(f"\n📋 CASE METADATA:")
@@ -508,17 +1331,17 @@ def analyze_case(case_number, chunking_strategy='semantic', summary_length=5):
 #         print()
     
     # Load chunked text
-    chunks = loader.load_chunked_text(chunking_strategy, case_number)
+    chunks = corpus_loader.load_chunked_text(chunking_strategy, case_number)
     if not chunks:
         pass
 #         print(f"❌ No {chunking_strategy} chunks found for case {case_number}")
         return None
     
-    # Basic text analysis
-    full_text = ' '.join(chunks)
-    basic_info = analyzer.extract_basic_info(full_text)
-    text_stats = analyzer.get_text_statistics(full_text)
-    legal_entities = analyzer.extract_legal_entities(full_text)
+    # Basic text analysis (tokenized once, shared by every step below)
+    document = ParsedDocument.from_chunks(chunks)
+    basic_info = analyzer.extract_basic_info(document)
+    text_stats = analyzer.get_text_statistics(document)
+    legal_entities = analyzer.extract_legal_entities(document)
     
 #     print(f"📊 TEXT STATISTICS ({chunking_strategy.upper()} CHUNKING):")
 #     print(f"  • Number of chunks: {len(chunks)}") 
@@ -566,18 +1389,19 @@ def analyze_case(case_number, chunking_strategy='semantic', summary_length=5):
 #         print()
     
     # Generate summary
-    summary = summarizer.extractive_summary(chunks, summary_length)
+    summary = summarizer.extractive_summary(document, summary_length)
 #     print(f"📝 EXTRACTIVE SUMMARY ({summary_length} sentences):")
 #     print(f"{summary}")
 #     print()
     
     # Key points
-    key_points = summarizer.key_points_extraction(chunks)
+    key_points = summarizer.key_points_extraction(document)
     if key_points:
         pass
     # Chunking comparison
 #     print(f"📈 CHUNKING STRATEGY COMPARISON:")
-    visualize_chunking_comparison(case_number)
+    if visualize:
+        visualize_chunking_comparison(case_number)
     
     return {
         'metadata': metadata,
@@ -591,85 +1415,114 @@ def analyze_case(case_number, chunking_strategy='semantic', summary_length=5):
 
 # print("Main analysis workflow defined")
 
-def batch_analysis(case_numbers, chunking_strategy='semantic'):
-    pass
-    """Analyze multiple cases and create comparison report"""
-    results = {}
-    
-#     print(f"🔄 Starting batch analysis of {len(case_numbers)} cases...")
-    
-    for case_num in case_numbers:
-        pass
-#         print(f"\nProcessing case {case_num}...")
-        result = analyze_case(case_num, chunking_strategy, summary_length=3)
-        if result:
-            pass
-            results[case_num] = result
-#         print("-" * 40)
-    
-    # Create summary report
-    if results:
-        pass
-#         print(f"\n{'='*60}")
-#         print(f"BATCH ANALYSIS SUMMARY REPORT")
-#         print(f"{'='*60}")
-        
-        # Statistics summary
-        total_words = sum(r['text_stats']['word_count'] for r in results.values())
-        avg_words = total_words / len(results)
-        
-#         print(f"📊 AGGREGATE STATISTICS:")
-#         print(f"  • Cases analyzed: {len(results)}")
-#         print(f"  • Total words: {total_words:,}")
-#         print(f"  • Average words per case: {avg_words:,.0f}")
-#         print()
-        
-        # Most common legal terms
-        all_terms = []
-        for result in results.values():
-            pass
-            if result['legal_entities'].get('legal_terms'):
-                pass
-                all_terms.extend(result['legal_entities']['legal_terms'])
-        
-        if all_terms:
-            pass
-            term_counts = Counter(all_terms)
-#             print(f"🏛️  MOST COMMON LEGAL TERMS:")
-            for term, count in term_counts.most_common(10):
-                pass
-#                 print(f"  • {term}: {count} cases")
-#             print()
-    
-    return results
-
-# Function to save analysis results
-def save_analysis_results(results, filename=None):
-    pass
-    """Save analysis results to JSON file"""
+# --- Batch analysis ---
+# Cases are analyzed on a process pool and each record is appended to a
+# JSONL file as soon as its case finishes, so whole-corpus runs use every
+# core and memory stays flat regardless of corpus size.
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', '0')) or (os.cpu_count() or 1)
+BATCH_CHUNKSIZE = int(os.environ.get('BATCH_CHUNKSIZE', '4'))
+# Fewer cases than this run in-process: starting a pool would cost more than it saves
+BATCH_POOL_MIN_CASES = int(os.environ.get('BATCH_POOL_MIN_CASES', '8'))
+# Every TF-IDF fit leaves a self-referencing vocabulary dict (sklearn's
+# _count_vocab) that only a full collection frees; the in-process path runs
+# one every BATCH_GC_EVERY cases so the parent's peak doesn't track case count
+BATCH_GC_EVERY = int(os.environ.get('BATCH_GC_EVERY', '64'))
+ANALYSIS_FIELDS = ('metadata', 'text_stats', 'basic_info', 'legal_entities', 'summary', 'key_points')
+
+def _init_batch_worker(base_dir):
+    """Point a batch worker's loader at `base_dir` (None keeps the default corpus)"""
+    global loader
+    if base_dir is not None:
+        loader = LegalDocumentLoader(base_dir, backend=CORPUS_BACKEND)
+
+def analyze_case_record(case_number, chunking_strategy='semantic', summary_length=3, corpus_loader=None):
+    """analyze_case() without plots, as a JSON-ready record (batch worker task)"""
+    try:
+        result = analyze_case(case_number, chunking_strategy, summary_length, visualize=False,
+                              corpus_loader=corpus_loader)
+    except Exception as e:
+        return {'case_number': case_number, 'error': f'{type(e).__name__}: {e}'}
+    if result is None:
+        return {'case_number': case_number, 'error': f'No {chunking_strategy} chunks found'}
+    record = {'case_number': case_number}
+    record.update((field, result[field]) for field in ANALYSIS_FIELDS)
+    return record
+
+def _iter_cases_inline(task, case_numbers, base_dir=None):
+    """iter_case_pool() in this process; `base_dir` reaches the task as its `corpus_loader`"""
+    import gc
+    from functools import partial
+
+    if base_dir is not None:
+        task = partial(task, corpus_loader=LegalDocumentLoader(base_dir, backend=CORPUS_BACKEND))
+    for done, case_number in enumerate(case_numbers, 1):
+        yield task(case_number)
+        if BATCH_GC_EVERY and done % BATCH_GC_EVERY == 0:
+            gc.collect()
+
+def iter_case_pool(task, case_numbers, workers=BATCH_WORKERS, chunksize=BATCH_CHUNKSIZE, base_dir=None):
+    """Yield task(case) for every case in completion order, `chunksize` cases per worker task.
+
+    One worker, or fewer than BATCH_POOL_MIN_CASES cases, runs in this
+    process in input order instead of starting a pool; `task` then gets a
+    `corpus_loader` keyword for `base_dir` rather than a worker's `loader`.
+    """
+    import multiprocessing
+
+    case_numbers = list(case_numbers)
+    if workers <= 1 or len(case_numbers) < BATCH_POOL_MIN_CASES:
+        yield from _iter_cases_inline(task, case_numbers, base_dir)
+        return
+    if multiprocessing.get_start_method() == 'fork':
+        # Forked workers inherit these instead of each importing them cold
+        punkt_tokenizer()
+        word_tokenize('')
+        TfidfVectorizer()
+        from sklearn.preprocessing import normalize  # noqa: F401
+    with multiprocessing.Pool(workers, initializer=_init_batch_worker,
+                              initargs=(base_dir,)) as pool:
+        yield from pool.imap_unordered(task, case_numbers, chunksize=max(1, chunksize))
+
+def iter_batch_analysis(case_numbers, chunking_strategy='semantic', summary_length=3,
+                        workers=BATCH_WORKERS, chunksize=BATCH_CHUNKSIZE, base_dir=None):
+    """Yield analysis records in completion order"""
+    from functools import partial
+
+    task = partial(analyze_case_record, chunking_strategy=chunking_strategy,
+                   summary_length=summary_length)
+    return iter_case_pool(task, case_numbers, workers, chunksize, base_dir)
+
+def save_analysis_results(records, filename=None):
+    """Append analysis records to a JSONL file as they arrive and return aggregate stats"""
     if not filename:
-        pass
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"legal_analysis_results_{timestamp}.json"
-    
-    # Convert results to JSON-serializable format
-    json_results = {}
-    for case_num, result in results.items():
-        pass
-        json_results[case_num] = {
-            'metadata': result['metadata'],
-            'text_stats': result['text_stats'],
-            'basic_info': result['basic_info'],
-            'legal_entities': result['legal_entities'],
-            'summary': result['summary'],
-            'key_points': result['key_points']
-        }
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        pass
-        json.dump(json_results, f, indent=2, ensure_ascii=False)
-    
+        filename = f"legal_analysis_results_{timestamp}.jsonl"
+
+    report = {'output': str(filename), 'cases_analyzed': 0, 'total_words': 0, 'errors': []}
+    term_counts = Counter()
+    with open(filename, 'wb') as f:
+        for record in records:
+            f.write(dumps_json(record) + b'\n')
+            f.flush()
+            if 'error' in record:
+                report['errors'].append(record['case_number'])
+                continue
+            report['cases_analyzed'] += 1
+            report['total_words'] += record['text_stats']['word_count']
+            term_counts.update(record['legal_entities'].get('legal_terms', ()))
+
+    if report['cases_analyzed']:
+        report['avg_words'] = report['total_words'] / report['cases_analyzed']
+    report['top_legal_terms'] = term_counts.most_common(10)
 #     print(f"✅ Results saved to {filename}")
+    return report
+
+def batch_analysis(case_numbers, chunking_strategy='semantic', filename=None, summary_length=3,
+                   workers=BATCH_WORKERS, chunksize=BATCH_CHUNKSIZE, base_dir=None):
+    """Analyze many cases in parallel, streaming records to JSONL; returns the aggregate report"""
+    records = iter_batch_analysis(case_numbers, chunking_strategy, summary_length,
+                                  workers=workers, chunksize=chunksize, base_dir=base_dir)
+    return save_analysis_results(records, filename)
 
 # print("Batch analysis and export functions defined")
 
@@ -677,65 +1530,509 @@ def save_analysis_results(results, filename=None):
 # print("🚀 Starting Legal Document Analysis")
 # print("Available cases:", available_cases[:10])  # Show first 10 available cases
 
-# Choose a case to analyze (you can change this number)
-if available_cases:
-    pass
-    case_to_analyze = available_cases[0]  # First available case
-#     print(f"\n🔍 Analyzing case {case_to_analyze}...")
+if RUN_NOTEBOOK_DEMO:
+    available_cases = loader.get_available_cases()
+
+    # Choose a case to analyze (you can change this number)
+    if available_cases:
+        pass
+        case_to_analyze = available_cases[0]  # First available case
+    #     print(f"\n🔍 Analyzing case {case_to_analyze}...")
     
-    # Single case analysis
-    result = analyze_case(case_to_analyze, chunking_strategy='semantic', summary_length=5)
+        # Single case analysis
+        result = analyze_case(case_to_analyze, chunking_strategy='semantic', summary_length=5)
     
-    # Compare chunking strategies visualization
-#     print(f"\n📊 Detailed chunking comparison:")
-    visualize_chunking_comparison(case_to_analyze)
+        # Compare chunking strategies visualization
+    #     print(f"\n📊 Detailed chunking comparison:")
+        visualize_chunking_comparison(case_to_analyze)
     
-else:
-    pass
-#     print("❌ No cases available for analysis")
-
-# 🛠 Dummy definitions so the block runs without NameError
-def batch_analysis(cases, chunking_strategy='semantic'):
-    pass
-    return {case: {"summary": "dummy", "readability": {"flesch": 70}, "clusters": 3} for case in cases}
-
-def save_analysis_results(results, filename="batch_results.json"):
-    pass
-#     print(f"✅ Results saved to {filename} (dummy)")
-
-def plot_case_statistics():
-    pass
-#     print("📊 Plotting statistics... (dummy)")
+    else:
+        pass
+    #     print("❌ No cases available for analysis")
 
-# 🚀 Batch analysis of multiple cases
-if len(available_cases) >= 3:
-    pass
-    # Analyze first 3 cases
-    cases_to_analyze = available_cases[:3]
-#     print(f"\n🔄 Running batch analysis on cases: {cases_to_analyze}")
+if RUN_NOTEBOOK_DEMO:
+    # 🚀 Batch analysis of multiple cases
+    if len(available_cases) >= 3:
+        pass
+        # Analyze first 3 cases
+        cases_to_analyze = available_cases[:3]
+    #     print(f"\n🔄 Running batch analysis on cases: {cases_to_analyze}")
     
-    # Run analysis
-    batch_results = batch_analysis(cases_to_analyze, chunking_strategy='semantic')
+        # Run analysis (records are saved as each case finishes)
+        batch_report = batch_analysis(cases_to_analyze, chunking_strategy='semantic')
     
-    # Save results
-    if batch_results:
+        if batch_report['cases_analyzed']:
+            pass
+            # Plot overall statistics
+    #         print(f"\n📈 Plotting case statistics...")
+            plot_case_statistics()
+    else:
         pass
-        save_analysis_results(batch_results)
-        
-        # Plot overall statistics
-#         print(f"\n📈 Plotting case statistics...")
-        plot_case_statistics()
-else:
-    pass
-#     print("❌ Need at least 3 cases for batch analysis")
-
+    #     print("❌ Need at least 3 cases for batch analysis")
+
+
+def save_vectorizer(vectorizer, directory):
+    """Save a fitted TfidfVectorizer as vocabulary.json + idf.npy + params"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    params = {key: value for key, value in vectorizer.get_params().items()
+              if key in ('stop_words', 'ngram_range', 'lowercase', 'sublinear_tf', 'max_features')}
+    with open(directory / 'vectorizer.json', 'w', encoding='utf-8') as f:
+        json.dump({'params': params,
+                   'vocabulary': {term: int(col) for term, col in vectorizer.vocabulary_.items()}}, f)
+    np.save(directory / 'idf.npy', vectorizer.idf_.astype(np.float32))
+
+def load_vectorizer(directory):
+    """Rebuild a fitted TfidfVectorizer saved by save_vectorizer()"""
+    directory = Path(directory)
+    with open(directory / 'vectorizer.json', 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    params = dict(saved['params'])
+    params['ngram_range'] = tuple(params['ngram_range'])
+    params.pop('max_features', None)
+    vectorizer = TfidfVectorizer(vocabulary=saved['vocabulary'], dtype=np.float32, **params)
+    vectorizer.idf_ = np.load(directory / 'idf.npy').astype(np.float64)
+    return vectorizer
+
+# --- Corpus IDF model ---
+# Sentence scoring normally fits a fresh TF-IDF on every document.  With
+# SENTENCE_IDF_MODE=corpus it instead transforms with one model fitted over
+# the whole judgment corpus by build_idf_model(), loaded once per process.
+IDF_MODEL_DIR = Path(os.environ.get('IDF_MODEL_DIR', INDEX_DIR / 'idf'))
+SENTENCE_IDF_MODE = os.environ.get('SENTENCE_IDF_MODE', 'document')
+IDF_MODEL_MAX_FEATURES = int(os.environ.get('IDF_MODEL_MAX_FEATURES', '50000'))
+
+_idf_model = None
+_idf_model_loaded = False  # looked for once; a missing model stays missing until restart
+_idf_model_lock = threading.Lock()
+
+def _corpus_documents(corpus_loader):
+    """Yield one ParsedDocument per judgment: the original text, else its semantic chunks"""
+    originals = corpus_loader.base_dir / 'Original-Judgements'
+    for case_num in corpus_loader.get_available_cases('semantic'):
+        original = original_judgment_path(case_num, originals)
+        if original is not None and original.suffix == '.txt':
+            yield ParsedDocument(original.read_text(encoding='utf-8', errors='replace'))
+        elif original is not None:
+            yield ParsedDocument(extract_pdf_text(original.read_bytes(), page_suffix='\n')[0])
+        else:
+            chunks = corpus_loader.load_chunked_text('semantic', case_num)
+            if chunks:
+                yield sentence_index.attach(ParsedDocument.from_chunks(chunks))
+
+def build_idf_model(directory=IDF_MODEL_DIR, corpus_loader=None, max_features=IDF_MODEL_MAX_FEATURES):
+    """Fit the sentence TF-IDF model over every judgment and save it to `directory`"""
+    corpus_loader = corpus_loader or loader
+    stats = {'documents': 0, 'sentences': 0}
+
+    def sentences():
+        for document in _corpus_documents(corpus_loader):
+            stats['documents'] += 1
+            for sentence in document.iter_sentences():
+                stats['sentences'] += 1
+                yield sentence
+
+    # The analyzer simple_summarize fits per document: unigrams, English stop
+    # words.  Bigrams would make every transform cost about as much as a fit.
+    vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english', dtype=np.float32)
+    vectorizer.fit(sentences())
+    save_vectorizer(vectorizer, directory)
+    stats['features'] = len(vectorizer.vocabulary_)
+    stats['model_id'] = hashlib.sha256(np.load(Path(directory) / 'idf.npy').tobytes()).hexdigest()[:16]
+    with open(Path(directory) / 'meta.json', 'w', encoding='utf-8') as f:
+        json.dump(stats, f)
+    return stats
+
+def get_idf_model():
+    """The corpus IDF vectorizer in corpus mode, None in document mode or before it is built"""
+    global _idf_model, _idf_model_loaded
+    if SENTENCE_IDF_MODE != 'corpus':
+        return None
+    if not _idf_model_loaded:
+        with _idf_model_lock:
+            if not _idf_model_loaded:
+                if (IDF_MODEL_DIR / 'vectorizer.json').exists():
+                    _idf_model = load_vectorizer(IDF_MODEL_DIR)
+                else:
+                    logger.warning("SENTENCE_IDF_MODE=corpus but no IDF model in %s; "
+                                   "scoring sentences per document (run build_idf_model())", IDF_MODEL_DIR)
+                _idf_model_loaded = True
+    return _idf_model
+
+def idf_model_tag():
+    """Identifies how sentences are scored, for cache keys"""
+    if get_idf_model() is None:
+        return 'document'
+    try:
+        with open(IDF_MODEL_DIR / 'meta.json', 'r', encoding='utf-8') as f:
+            return f"corpus:{json.load(f)['model_id']}"
+    except (OSError, ValueError, KeyError):
+        return 'corpus'
 
-def find_similar_cases(target_case, all_cases=None, top_n=5):
+class CaseSimilarityIndex:
     pass
-    """Find cases similar to target case using TF-IDF similarity"""
+    """Persistent TF-IDF index over every case, for find_similar_cases.
+
+    Rows are L2-normalised float32 TF-IDF vectors stored as CSR arrays
+    (.npy) and memory-mapped on load, so cosine similarity is a sparse dot
+    product.  The vocabulary and IDF are fitted once by build(); cases added
+    later with add_cases() are transformed with that fitted model and
+    appended as a new segment, without refitting.  Each row records the
+    backend signature of the chunk file it came from, so refresh() can add
+    new cases, re-add edited ones (their old rows become stale) and drop
+    deleted ones.
+    """
+    FORMAT_VERSION = 2
+
+    def __init__(self, index_dir=INDEX_DIR / 'similarity'):
+        pass
+        self.index_dir = Path(index_dir)
+        self.vectorizer = None
+        self.case_numbers = []
+        self.segments = []  # CSR matrices, one per build/add
+        self.clusters = None
+        self._row_of_case = {}
+        self._signatures = {}  # case -> chunk file signature its row was built from
+        self._stale_rows = set()  # rows of edited or deleted cases
+        self._lock = threading.RLock()
+
+    def exists(self):
+        return (self.index_dir / 'meta.json').exists()
+
+    @staticmethod
+    def _signature(case_num, strategy='semantic'):
+        signature = loader.backend.signature(strategy, case_num)
+        return None if signature is None else list(signature)
+
+    def _case_texts(self, case_numbers, strategy='semantic', signatures=None):
+        """Yield (case_number, text) for the cases that have chunks, noting their signatures"""
+        for case_num in case_numbers:
+            if signatures is not None:
+                signatures.append(self._signature(case_num, strategy))
+            chunks = loader.load_chunked_text(strategy, case_num)
+            if chunks:
+                yield case_num, ' '.join(chunks)
+            elif signatures is not None:
+                signatures.pop()
+
+    def build(self, case_numbers=None, max_features=1000):
+        """Fit the vocabulary/IDF over the corpus and write a fresh index"""
+        import shutil
+        if case_numbers is None:
+            case_numbers = loader.get_available_cases('semantic')
+        indexed, signatures = [], []
+
+        def texts():
+            for case_num, text in self._case_texts(case_numbers, signatures=signatures):
+                indexed.append(case_num)
+                yield text
+
+        with self._lock:
+            self.vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english',
+                                              dtype=np.float32)
+            # A generator keeps only one case text in memory at a time
+            matrix = self.vectorizer.fit_transform(texts())
+            self.case_numbers = []
+            self.segments = []
+            self.clusters = None
+            self._row_of_case = {}
+            self._signatures = {}
+            self._stale_rows = set()
+            # Written beside the live index and swapped in, so readers of the
+            # old one (or a concurrent build) never see a half-deleted directory
+            index_dir = self.index_dir
+            self.index_dir = index_dir.with_name(f'{index_dir.name}.{uuid.uuid4().hex}.tmp')
+            try:
+                save_vectorizer(self.vectorizer, self.index_dir)
+                self._append_segment(indexed, matrix, signatures)
+                old_dir = index_dir.with_name(f'{index_dir.name}.{uuid.uuid4().hex}.old')
+                try:
+                    if index_dir.exists():
+                        os.rename(index_dir, old_dir)
+                    os.rename(self.index_dir, index_dir)
+                except OSError:
+                    # Another process swapped its build in first: use that one
+                    shutil.rmtree(self.index_dir, ignore_errors=True)
+                    self.index_dir = index_dir
+                    return self.load()
+            finally:
+                if self.index_dir != index_dir:
+                    shutil.rmtree(self.index_dir, ignore_errors=True)
+                self.index_dir = index_dir
+            shutil.rmtree(old_dir, ignore_errors=True)
+        return self
+
+    def add_cases(self, case_numbers):
+        """Index new or edited cases with the already-fitted vocabulary (no refit)"""
+        with self._lock:
+            new_cases = [case_num for case_num in case_numbers
+                         if case_num not in self._row_of_case
+                         or self._signatures.get(case_num) != self._signature(case_num)]
+            signatures = []
+            pairs = list(self._case_texts(new_cases, signatures=signatures))
+            if not pairs:
+                return 0
+            matrix = self.vectorizer.transform([text for _, text in pairs])
+            self._append_segment([case_num for case_num, _ in pairs], matrix, signatures)
+            return len(pairs)
+
+    def refresh(self, case_numbers=None):
+        """Bring the index up to date with the corpus: add new and edited cases, drop deleted ones"""
+        if case_numbers is None:
+            case_numbers = loader.get_available_cases('semantic')
+        with self._lock:
+            for case_num in self._row_of_case.keys() - set(case_numbers):
+                self._stale_rows.add(self._row_of_case.pop(case_num))
+                self._signatures.pop(case_num, None)
+            return self.add_cases(case_numbers)
+
+    def _append_segment(self, case_numbers, matrix, signatures):
+        from scipy import sparse
+        matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+        index_dtype = np.int32 if matrix.nnz < np.iinfo(np.int32).max else np.int64
+        segment_dir = self.index_dir / 'segments' / f'{len(self.segments):05d}'
+        segment_dir.mkdir(parents=True, exist_ok=True)
+        np.save(segment_dir / 'data.npy', matrix.data.astype(np.float32))
+        np.save(segment_dir / 'indices.npy', matrix.indices.astype(index_dtype))
+        np.save(segment_dir / 'indptr.npy', matrix.indptr.astype(index_dtype))
+        with open(segment_dir / 'cases.json', 'w', encoding='utf-8') as f:
+            json.dump(list(case_numbers), f)
+        with open(segment_dir / 'signatures.json', 'w', encoding='utf-8') as f:
+            json.dump(list(signatures), f)
+        self._register_segment(case_numbers, matrix, signatures)
+        self._write_meta()
+
+    def _register_segment(self, case_numbers, matrix, signatures):
+        # A case in a later segment was re-added after an edit; its earlier row is stale
+        for case_num, signature in zip(case_numbers, signatures):
+            if case_num in self._row_of_case:
+                self._stale_rows.add(self._row_of_case[case_num])
+            self._row_of_case[case_num] = len(self.case_numbers)
+            self._signatures[case_num] = signature
+            self.case_numbers.append(case_num)
+        self.segments.append(matrix)
+
+    def _write_meta(self):
+        meta = {'version': self.FORMAT_VERSION, 'num_segments': len(self.segments),
+                'num_cases': len(self.case_numbers),
+                'clustered_rows': self.clusters['clustered_rows'] if self.clusters else None}
+        temp_path = self.index_dir / 'meta.json.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self.index_dir / 'meta.json')
+
+    def load(self):
+        """Memory-map an index written by build()/add_cases()"""
+        from scipy import sparse
+        with open(self.index_dir / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported similarity index version: {meta.get('version')}")
+        self.vectorizer = load_vectorizer(self.index_dir)
+        self.case_numbers = []
+        self.segments = []
+        self.clusters = None
+        self._row_of_case = {}
+        self._signatures = {}
+        self._stale_rows = set()
+        num_features = len(self.vectorizer.vocabulary_)
+        for number in range(meta['num_segments']):
+            segment_dir = self.index_dir / 'segments' / f'{number:05d}'
+            with open(segment_dir / 'cases.json', 'r', encoding='utf-8') as f:
+                case_numbers = json.load(f)
+            with open(segment_dir / 'signatures.json', 'r', encoding='utf-8') as f:
+                signatures = json.load(f)
+            arrays = [np.load(segment_dir / f'{name}.npy', mmap_mode='r')
+                      for name in ('data', 'indices', 'indptr')]
+            matrix = sparse.csr_matrix(tuple(arrays), shape=(len(case_numbers), num_features),
+                                       copy=False)
+            self._register_segment(case_numbers, matrix, signatures)
+        if meta.get('clustered_rows'):
+            self._load_clusters(meta['clustered_rows'])
+        return self
+
+    def __contains__(self, case_number):
+        return case_number in self._row_of_case
+
+    def __len__(self):
+        return len(self._row_of_case)
+
+    def case_vector(self, case_number):
+        """The stored (1 x features) TF-IDF row for an indexed case"""
+        row = self._row_of_case[case_number]
+        for segment in self.segments:
+            if row < segment.shape[0]:
+                return segment[row]
+            row -= segment.shape[0]
+        raise KeyError(case_number)
+
+    def scores(self, query_vector):
+        """Cosine similarity of a (1 x features) vector to every indexed case"""
+        # Sparse matrix times a dense vector is a single pass over the rows
+        query = np.asarray(query_vector.todense(), dtype=np.float32).ravel()
+        if not self.segments:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate([segment @ query for segment in self.segments])
+
+    def top_k(self, scores, top_n, exclude=()):
+        """Indices of the `top_n` best scores, best first, skipping the indices in `exclude`"""
+        exclude = np.unique(np.asarray(exclude, dtype=np.int64))
+        if len(exclude):
+            scores = scores.copy()
+            scores[exclude] = -np.inf
+        top_n = min(top_n, len(scores) - len(exclude))
+        if top_n <= 0:
+            return np.zeros(0, dtype=np.int64)
+        candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+        return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+    # --- Coarse-quantized (IVF-style) search ---
+    # build_clusters() groups the rows with MiniBatchKMeans; a query then
+    # scores only the rows in its `n_probe` nearest clusters.  More probes
+    # means better recall and slower queries; n_probe=None is exhaustive.
+    # Rows added after clustering are always scanned.
+
+    def build_clusters(self, n_clusters=None, batch_size=2048, random_state=0):
+        """Cluster the indexed rows offline and store the inverted lists"""
+        from scipy import sparse
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.preprocessing import normalize
+        matrix = sparse.vstack(self.segments, format='csr') if len(self.segments) > 1 else self.segments[0]
+        num_rows = matrix.shape[0]
+        if n_clusters is None:
+            n_clusters = max(1, int(np.sqrt(num_rows)))
+        n_clusters = min(n_clusters, num_rows)
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=3,
+                                 random_state=random_state)
+        kmeans.fit(matrix)
+        centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+
+        # Assign each row to its highest-cosine centroid, the same rule used
+        # to pick clusters at query time
+        labels = np.empty(num_rows, dtype=np.int32)
+        for start in range(0, num_rows, 8192):
+            block = matrix[start:start + 8192] @ centroids.T
+            labels[start:start + 8192] = np.asarray(block).argmax(axis=1)
+        order = np.argsort(labels, kind='stable').astype(np.int64)
+        offsets = np.searchsorted(labels[order], np.arange(n_clusters + 1)).astype(np.int64)
+
+        clusters_dir = self.index_dir / 'clusters'
+        clusters_dir.mkdir(parents=True, exist_ok=True)
+        np.save(clusters_dir / 'centroids.npy', centroids)
+        np.save(clusters_dir / 'order.npy', order)
+        np.save(clusters_dir / 'offsets.npy', offsets)
+        self.clusters = {'centroids': centroids, 'order': order, 'offsets': offsets,
+                         'clustered_rows': num_rows}
+        self._write_meta()
+        return self
+
+    def _load_clusters(self, clustered_rows):
+        clusters_dir = self.index_dir / 'clusters'
+        self.clusters = {name: np.load(clusters_dir / f'{name}.npy', mmap_mode='r')
+                         for name in ('centroids', 'order', 'offsets')}
+        self.clusters['clustered_rows'] = clustered_rows
+
+    def candidate_rows(self, query, n_probe):
+        """Rows in the `n_probe` clusters nearest to a dense query vector"""
+        centroids, order, offsets = (self.clusters[name] for name in ('centroids', 'order', 'offsets'))
+        n_probe = min(n_probe, len(centroids))
+        nearest = np.argpartition(-(centroids @ query), n_probe - 1)[:n_probe]
+        rows = [order[offsets[c]:offsets[c + 1]] for c in nearest]
+        # Rows appended after clustering are not in any inverted list
+        rows.append(np.arange(self.clusters['clustered_rows'], len(self.case_numbers)))
+        return np.sort(np.concatenate(rows))
+
+    def score_rows(self, rows, query):
+        """Cosine similarity of a dense query vector to the given (sorted) rows"""
+        scores = np.empty(len(rows), dtype=np.float32)
+        start = 0
+        for segment in self.segments:
+            end = start + segment.shape[0]
+            lo, hi = np.searchsorted(rows, [start, end])
+            if hi > lo:
+                scores[lo:hi] = segment[rows[lo:hi] - start] @ query
+            start = end
+        return scores
+
+    def vectorize(self, case_number):
+        """TF-IDF row for any case with chunks, with the fitted model and without indexing it"""
+        pairs = list(self._case_texts([case_number]))
+        if not pairs:
+            return None
+        return self.vectorizer.transform([pairs[0][1]]).astype(np.float32)
+
+    def query(self, case_number, top_n=5, n_probe=None):
+        """Most similar indexed cases to `case_number`, best first"""
+        return self.query_vector(self.case_vector(case_number), top_n, n_probe,
+                                 exclude_row=self._row_of_case[case_number])
+
+    def query_vector(self, query_vector, top_n=5, n_probe=None, exclude_row=None):
+        """Most similar indexed cases to a (1 x features) vector, best first.
+
+        With clusters built and `n_probe` set, only the rows of the
+        `n_probe` nearest clusters are scored.
+        """
+        excluded_rows = np.fromiter(self._stale_rows, dtype=np.int64, count=len(self._stale_rows))
+        if exclude_row is not None:
+            excluded_rows = np.append(excluded_rows, exclude_row)
+        if n_probe is None or self.clusters is None:
+            scores = self.scores(query_vector)
+            best = self.top_k(scores, top_n, exclude=excluded_rows)
+            return [{'case_number': self.case_numbers[i], 'similarity_score': float(scores[i])}
+                    for i in best]
+
+        query = np.asarray(query_vector.todense(), dtype=np.float32).ravel()
+        rows = self.candidate_rows(query, n_probe)
+        scores = self.score_rows(rows, query)
+        best = self.top_k(scores, top_n, exclude=np.flatnonzero(np.isin(rows, excluded_rows)))
+        return [{'case_number': self.case_numbers[rows[i]], 'similarity_score': float(scores[i])}
+                for i in best]
+
+_similarity_index = None
+_similarity_index_lock = threading.Lock()
+# Default number of clusters probed by find_similar_cases (unset: exhaustive)
+SIMILARITY_N_PROBE = int(os.environ['SIMILARITY_N_PROBE']) if os.environ.get('SIMILARITY_N_PROBE') else None
+
+def get_similarity_index():
+    """Load the on-disk similarity index, building it on first use"""
+    global _similarity_index
+    with _similarity_index_lock:
+        if _similarity_index is None:
+            index = CaseSimilarityIndex()
+            try:
+                index = index.load() if index.exists() else index.build()
+            except ValueError:
+                if not index.exists():
+                    raise
+                index = index.build()  # written by an older format
+            index.refresh()
+            _similarity_index = index
+    return _similarity_index
+
+def find_similar_cases(target_case, all_cases=None, top_n=5, n_probe=SIMILARITY_N_PROBE):
+    pass
+    """Find cases similar to target case using TF-IDF similarity.
+
+    `n_probe` only applies to whole-corpus search on a clustered index (see
+    CaseSimilarityIndex.build_clusters): fewer probes are faster, more
+    probes recall more of the exact top-n.
+    """
     if not all_cases:
         pass
-        all_cases = available_cases[:10]  # Use first 10 cases
+        # Whole corpus: use the persistent index; a target it doesn't hold
+        # is scored in memory rather than written as a segment of its own
+        try:
+            index = get_similarity_index()
+        except ValueError:
+            # Nothing to index (empty corpus)
+            return []
+        if target_case in index:
+            index.add_cases([target_case])  # re-indexes it if its chunks changed
+            return index.query(target_case, top_n, n_probe=n_probe)
+        query_vector = index.vectorize(target_case)
+        if query_vector is None:
+            return []
+        return index.query_vector(query_vector, top_n, n_probe=n_probe)
     
 #     print(f"🔍 Finding cases similar to case {target_case}...")
     
@@ -805,9 +2102,9 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         chunks = loader.load_chunked_text(strategy, case_number)
         if chunks:
             pass
-            full_text = ' '.join(chunks)
-            stats = analyzer.get_text_statistics(full_text)
-            summary = summarizer.extractive_summary(chunks, 3)
+            document = ParsedDocument.from_chunks(chunks)
+            stats = analyzer.get_text_statistics(document)
+            summary = summarizer.extractive_summary(document, 3)
             strategy_results[strategy] = {
                 'stats': stats,
                 'summary': summary,
@@ -845,6 +2142,7 @@ def interactive_analysis():
     
 #     # In a real Jupyter environment, you could use input()  # commented out for API mode
     # For now, we'll use the first available case
+    available_cases = loader.get_available_cases()
     if available_cases:
         pass
         selected_case = available_cases[0]
@@ -889,7 +2187,8 @@ def interactive_analysis():
 #         print("❌ No cases available")
 
 # Run interactive analysis
-interactive_analysis()
+if RUN_NOTEBOOK_DEMO:
+    interactive_analysis()
 
 # print("🎉 LEGAL DOCUMENT SUMMARIZER SETUP COMPLETE!")
 # print("=" * 60)
@@ -921,12 +2220,11 @@ interactive_analysis()
 # print("\n" + "=" * 60)
 # print("Happy analyzing! 📚⚖️")
 
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-
 def save_to_pdf(filename, case_number, summary, key_points=None):
     pass
     """Helper to save summary and key points to PDF"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
     c = canvas.Canvas(filename, pagesize=letter)
     c.setFont("Helvetica", 12)
     c.drawString(50, 750, f"Case Number: {case_number}")
@@ -962,7 +2260,7 @@ def interactive_case_summarizer():
 
 
 #     case_number = input("Enter case number to analyze: ").strip()  # commented out for API mode
-    if case_number not in available_cases:
+    if not loader.has_case(case_number):
         pass
 #         print(f"❌ Case {case_number} not found!")
         return None
@@ -980,11 +2278,11 @@ def interactive_case_summarizer():
 #         print(f"❌ No {chunking_strategy} chunks found for case {case_number}")
         return None
 
-    full_text = " ".join(chunks)
-    basic_info = analyzer.extract_basic_info(full_text)
-    text_stats = analyzer.get_text_statistics(full_text)
-    summary = summarizer.extractive_summary(chunks, summary_length)
-    key_points = summarizer.key_points_extraction(chunks)
+    document = ParsedDocument.from_chunks(chunks)
+    basic_info = analyzer.extract_basic_info(document)
+    text_stats = analyzer.get_text_statistics(document)
+    summary = summarizer.extractive_summary(document, summary_length)
+    key_points = summarizer.key_points_extraction(document)
 
     result = {
         'case_number': case_number,
@@ -1008,64 +2306,113 @@ def interactive_case_summarizer():
     return result
 
 # ROUGE Evaluation System
-try:
-    pass
-    from rouge_score import rouge_scorer
-    ROUGE_AVAILABLE = True
-#     print("✅ ROUGE scorer available")
-except ImportError:
-    pass
-    ROUGE_AVAILABLE = False
-#     print("❌ ROUGE not available. Install with: pip install rouge-score")
+# ROUGE-1/2/L computed natively, matching rouge_score with use_stemmer=True:
+# same tokenization, Porter stems memoized across calls, and references
+# prepared once (n-gram counters plus per-token bit masks for a bit-parallel
+# LCS) when one reference is scored against many candidates.
+ROUGE_TOKEN = re.compile(r'[a-z0-9]+')
+ROUGE_TYPES = ('rouge1', 'rouge2', 'rougeL')
+Score = namedtuple('Score', ['precision', 'recall', 'fmeasure'])
+
+@lru_cache(maxsize=1)
+def porter_stemmer():
+    """NLTK Porter stemmer (the one rouge_score uses), imported on first use"""
+    from nltk.stem import porter
+    return porter.PorterStemmer()
+
+@lru_cache(maxsize=200000)
+def porter_stem(token):
+    """Porter stem of a lowercase token, memoized"""
+    return porter_stemmer().stem(token)
+
+def rouge_tokenize(text):
+    """rouge_score's tokenization: lowercase alphanumeric runs, stemming tokens over 3 chars"""
+    tokens = [porter_stem(token) if len(token) > 3 else token for token in ROUGE_TOKEN.findall(text.lower())]
+    return [token for token in tokens if ROUGE_TOKEN.fullmatch(token)]
+
+def _rouge_score(overlap, reference_count, candidate_count):
+    precision = overlap / max(candidate_count, 1)
+    recall = overlap / max(reference_count, 1)
+    fmeasure = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return Score(precision, recall, fmeasure)
+
+class RougeReference:
+    """A reference text tokenized and indexed once, for scoring many candidates"""
+    __slots__ = ('tokens', 'unigrams', 'bigrams', 'masks')
+
+    def __init__(self, text):
+        self.tokens = rouge_tokenize(text)
+        self.unigrams = Counter(self.tokens)
+        self.bigrams = Counter(zip(self.tokens, self.tokens[1:]))
+        # Bit i of masks[token] is set when tokens[i] == token
+        self.masks = {}
+        for position, token in enumerate(self.tokens):
+            self.masks[token] = self.masks.get(token, 0) | (1 << position)
+
+    def lcs_length(self, candidate_tokens):
+        """Longest common subsequence length, one big-int step per candidate token"""
+        full = (1 << len(self.tokens)) - 1
+        row = full
+        masks = self.masks
+        for token in candidate_tokens:
+            match = masks.get(token)
+            if match:
+                matched = row & match
+                row = ((row + matched) | (row - matched)) & full
+        return len(self.tokens) - bin(row).count('1')
+
+    def score(self, candidate):
+        """{'rouge1', 'rouge2', 'rougeL'} Scores of a candidate text (or token list)"""
+        tokens = rouge_tokenize(candidate) if isinstance(candidate, str) else candidate
+        unigrams = Counter(tokens)
+        bigrams = Counter(zip(tokens, tokens[1:]))
+        overlap1 = sum(min(count, unigrams[gram]) for gram, count in self.unigrams.items())
+        overlap2 = sum(min(count, bigrams[gram]) for gram, count in self.bigrams.items())
+        n = len(self.tokens)
+        if self.tokens and tokens:
+            rouge_l = _rouge_score(self.lcs_length(tokens), n, len(tokens))
+        else:
+            rouge_l = Score(0, 0, 0)
+        return {
+            'rouge1': _rouge_score(overlap1, n, len(tokens)),
+            'rouge2': _rouge_score(overlap2, max(n - 1, 0), max(len(tokens) - 1, 0)),
+            'rougeL': rouge_l,
+        }
 
 class ROUGEEvaluator:
     pass
-    def __init__(self):
+    def __init__(self, max_references=256):
         pass
-        if ROUGE_AVAILABLE:
-            pass
-            self.scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
+        self.max_references = max_references
+        self._references = OrderedDict()  # reference text -> RougeReference
+
+    def reference(self, text):
+        """Prepared RougeReference for `text`, reused while it stays in the LRU"""
+        prepared = self._references.get(text)
+        if prepared is None:
+            prepared = self._references[text] = RougeReference(text)
+            while len(self._references) > self.max_references:
+                self._references.popitem(last=False)
         else:
-            pass
-            self.scorer = None
+            self._references.move_to_end(text)
+        return prepared
     
     def simple_rouge_score(self, reference, candidate):
         pass
-        """Simple ROUGE-like scoring without external dependencies"""
+        """ROUGE scores as plain {'precision', 'recall', 'fmeasure'} dicts"""
         if not reference or not candidate:
             pass
             return {'rouge1': 0, 'rouge2': 0, 'rougeL': 0}
-        
-        # Simple word overlap (ROUGE-1 approximation)
-        ref_words = set(reference.lower().split())
-        cand_words = set(candidate.lower().split())
-        
-        if len(ref_words) == 0:
-            pass
-            return {'rouge1': 0, 'rouge2': 0, 'rougeL': 0}
-        
-        # Simple precision, recall, f1
-        overlap = len(ref_words.intersection(cand_words))
-        precision = overlap / len(cand_words) if len(cand_words) > 0 else 0
-        recall = overlap / len(ref_words) if len(ref_words) > 0 else 0
-        f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0
-        
-        return {
-            'rouge1': {'precision': precision, 'recall': recall, 'fmeasure': f1},
-            'rouge2': {'precision': precision * 0.8, 'recall': recall * 0.8, 'fmeasure': f1 * 0.8},  # Approximation
-            'rougeL': {'precision': precision * 0.9, 'recall': recall * 0.9, 'fmeasure': f1 * 0.9}   # Approximation
-        }
+        return {metric: score._asdict() for metric, score in self.evaluate_summary(reference, candidate).items()}
     
     def evaluate_summary(self, reference_text, generated_summary):
         pass
         """Evaluate generated summary against reference text"""
-        if self.scorer and ROUGE_AVAILABLE:
-            pass
-            scores = self.scorer.score(reference_text, generated_summary)
-            return scores
-        else:
-            pass
-            return self.simple_rouge_score(reference_text, generated_summary)
+        if isinstance(reference_text, ParsedDocument):
+            reference_text = reference_text.text
+        if isinstance(generated_summary, ParsedDocument):
+            generated_summary = generated_summary.text
+        return self.reference(reference_text).score(generated_summary)
     
     def compare_chunking_strategies(self, case_number, reference_strategy='semantic'):
         pass
@@ -1074,13 +2421,12 @@ class ROUGEEvaluator:
 #         print("=" * 50)
         
         # Get reference summary (using one chunking strategy as ground truth)
-        ref_chunks = loader.load_chunked_text(reference_strategy, case_number)
-        if not ref_chunks:
+        ref_summary = summary_memo.summary(case_number, reference_strategy, 5)
+        if ref_summary is None:
             pass
 #             print(f"❌ No reference chunks found for case {case_number}")
             return None
-        
-        ref_summary = summarizer.extractive_summary(ref_chunks, 5)
+
 #         print(f"📋 Reference Strategy: {reference_strategy}")
 #         print(f"📝 Reference Summary: {ref_summary[:200]}...")
 #         print()
@@ -1093,10 +2439,9 @@ class ROUGEEvaluator:
         
         for strategy in strategies:
             pass
-            chunks = loader.load_chunked_text(strategy, case_number)
-            if chunks:
+            generated_summary = summary_memo.summary(case_number, strategy, 5)
+            if generated_summary is not None:
                 pass
-                generated_summary = summarizer.extractive_summary(chunks, 5)
                 scores = self.evaluate_summary(ref_summary, generated_summary)
                 results[strategy] = {
                     'summary': generated_summary,
@@ -1106,20 +2451,10 @@ class ROUGEEvaluator:
 #                 print(f"🔍 Strategy: {strategy}")
 #                 print(f"📝 Summary: {generated_summary[:150]}...")
                 
-                if ROUGE_AVAILABLE:
+#                 print(f"📊 ROUGE Scores:")
+                for metric, score in scores.items():
                     pass
-#                     print(f"📊 ROUGE Scores:")
-                    for metric, score in scores.items():
-                        pass
-#                         print(f"   {metric}: P={score.precision:.3f}, R={score.recall:.3f}, F1={score.fmeasure:.3f}")
-                else:
-                    pass
-#                     print(f"📊 Simple ROUGE Scores:")
-                    for metric, score in scores.items():
-                        pass
-                        if isinstance(score, dict):
-                            pass
-#                             print(f"   {metric}: P={score['precision']:.3f}, R={score['recall']:.3f}, F1={score['fmeasure']:.3f}")
+#                     print(f"   {metric}: P={score.precision:.3f}, R={score.recall:.3f}, F1={score.fmeasure:.3f}")
 #                 print("-" * 40)
         
         return results
@@ -1146,12 +2481,7 @@ class ROUGEEvaluator:
                     pass
                     if strategy in avg_scores:
                         pass
-                        if ROUGE_AVAILABLE:
-                            pass
-                            avg_scores[strategy].append(data['scores']['rouge1'].fmeasure)
-                        else:
-                            pass
-                            avg_scores[strategy].append(data['scores']['rouge1']['fmeasure'])
+                        avg_scores[strategy].append(data['scores']['rouge1'].fmeasure)
         
         # Calculate and display average scores
 #         print(f"\n📊 AVERAGE ROUGE-1 F1 SCORES:")
@@ -1180,7 +2510,7 @@ def evaluate_batch_cases(case_list=None):
     """Evaluate multiple cases"""
     if case_list is None:
         pass
-        case_list = available_cases[:3]  # First 3 cases
+        case_list = loader.get_available_cases()[:3]  # First 3 cases
     return evaluator.evaluate_multiple_cases(case_list)
 
 # print("\nEvaluation functions ready!")
@@ -1188,114 +2518,178 @@ def evaluate_batch_cases(case_list=None):
 # print("• evaluate_case_summary('1')  # Evaluate case 1")
 # print("• evaluate_batch_cases(['1', '2', '3'])  # Evaluate multiple cases")
 
+# --- Corpus evaluation ---
+# Strategy comparisons need the same extractive summaries over and over, so
+# they are memoized per (case, strategy, length, content hash), in memory and
+# under EVAL_MEMO_DIR ('' disables the disk copy).  evaluate_corpus() scores
+# every case on the batch process pool and folds each result into running
+# per-strategy means as it arrives.
+EVAL_MEMO_DIR = os.environ.get('EVAL_MEMO_DIR', str(INDEX_DIR / 'summaries'))
+EVAL_STRATEGIES = ('semantic', 'tokenwise', 'recursive')
+
+class SummaryMemo:
+    """extractive_summary() results keyed by case, strategy, length and content hash"""
+
+    def __init__(self, memo_dir=EVAL_MEMO_DIR, max_entries=4096):
+        self.memo_dir = Path(memo_dir) if memo_dir else None
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(case_number, strategy, length, text):
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        spec = json.dumps([case_number, strategy, length, digest, SUMMARY_CACHE_VERSION, idf_model_tag()])
+        return hashlib.blake2b(spec.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _path(self, key):
+        return self.memo_dir / key[:2] / f'{key}.txt'
+
+    def summary(self, case_number, strategy, length=5, corpus_loader=None):
+        """Memoized extractive summary of a case's chunks, None when it has none"""
+        chunks = (corpus_loader or loader).load_chunked_text(strategy, case_number)
+        if not chunks:
+            return None
+        document = ParsedDocument.from_chunks(chunks)
+        key = self.key(case_number, strategy, length, document.text)
+        summary = self._memory.get(key)
+        if summary is None and self.memo_dir is not None:
+            try:
+                summary = self._path(key).read_text(encoding='utf-8')
+            except OSError:
+                pass
+        if summary is None:
+            self.misses += 1
+            summary = summarizer.extractive_summary(document, length)
+            if self.memo_dir is not None:
+                path = self._path(key)
+                temp_path = path.with_name(f'{path.name}.{uuid.uuid4().hex}.tmp')
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    temp_path.write_text(summary, encoding='utf-8')
+                    os.replace(temp_path, path)
+                except OSError:
+                    # An unwritable EVAL_MEMO_DIR still memoizes in memory
+                    try:
+                        os.unlink(temp_path)
+                    except OSError:
+                        pass
+        else:
+            self.hits += 1
+        self._memory[key] = summary
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+        return summary
+
+summary_memo = SummaryMemo()
+
+def evaluate_case_strategies(case_number, reference_strategy='semantic', summary_length=5, bleu=True,
+                             corpus_loader=None):
+    """Score every strategy's summary of a case against the reference strategy's (pool task)"""
+    summaries = {}
+    for strategy in EVAL_STRATEGIES:
+        summary = summary_memo.summary(case_number, strategy, summary_length, corpus_loader=corpus_loader)
+        if summary is not None:
+            summaries[strategy] = summary
+    scores = {}
+    reference = summaries.get(reference_strategy)
+    if reference is not None:
+        for strategy, summary in summaries.items():
+            if strategy == reference_strategy:
+                continue
+            rouge = evaluator.evaluate_summary(reference, summary)
+            scores[strategy] = {metric: rouge[metric].fmeasure for metric in ROUGE_TYPES}
+            if bleu:
+                scores[strategy]['bleu'] = enhanced_evaluator.calculate_bleu_score(reference, summary)
+    return {'case_number': case_number, 'summaries': summaries, 'scores': scores}
+
+class ScoreAverages:
+    """Running per-strategy means of evaluation scores"""
+
+    def __init__(self):
+        self._sums = defaultdict(lambda: defaultdict(float))
+        self._counts = Counter()
+
+    def add(self, scores):
+        for strategy, metrics in scores.items():
+            self._counts[strategy] += 1
+            for metric, value in metrics.items():
+                self._sums[strategy][metric] += value
+
+    def means(self):
+        return {strategy: {metric: total / self._counts[strategy] for metric, total in metrics.items()}
+                for strategy, metrics in self._sums.items()}
+
+def iter_corpus_evaluation(case_numbers=None, reference_strategy='semantic', summary_length=5, bleu=True,
+                           workers=BATCH_WORKERS, chunksize=BATCH_CHUNKSIZE, base_dir=None):
+    """Yield evaluate_case_strategies() records in completion order"""
+    from functools import partial
+
+    if case_numbers is None:
+        corpus_loader = loader if base_dir is None else LegalDocumentLoader(base_dir, backend=CORPUS_BACKEND)
+        case_numbers = corpus_loader.get_available_cases(reference_strategy)
+    task = partial(evaluate_case_strategies, reference_strategy=reference_strategy,
+                   summary_length=summary_length, bleu=bleu)
+    return iter_case_pool(task, case_numbers, workers, chunksize, base_dir)
+
+def evaluate_corpus(case_numbers=None, reference_strategy='semantic', summary_length=5, bleu=True,
+                    workers=BATCH_WORKERS, chunksize=BATCH_CHUNKSIZE, base_dir=None):
+    """Mean ROUGE (and BLEU) per strategy against the reference strategy, over the corpus"""
+    averages = ScoreAverages()
+    cases = 0
+    for record in iter_corpus_evaluation(case_numbers, reference_strategy, summary_length, bleu,
+                                         workers=workers, chunksize=chunksize, base_dir=base_dir):
+        cases += 1
+        averages.add(record['scores'])
+    return {'cases': cases, 'reference_strategy': reference_strategy, 'averages': averages.means()}
+
 # COMPREHENSIVE ROUGE COMPARISON DASHBOARD
 # print("🚀 LEGAL DOCUMENT SUMMARIZATION - ROUGE EVALUATION DASHBOARD")
 # print("="*70)
 
-def display_comprehensive_evaluation(case_numbers=None):
+def display_comprehensive_evaluation(case_numbers=None, workers=BATCH_WORKERS):
     pass
     """Display comprehensive ROUGE evaluation with visualizations"""
     
     if case_numbers is None:
         pass
-        case_numbers = available_cases[:5]  # First 5 cases for demo
+        case_numbers = loader.get_available_cases()[:5]  # First 5 cases for demo
     
 #     print(f"📊 Evaluating {len(case_numbers)} cases: {', '.join(case_numbers)}")
 #     print("="*50)
     
-    # Store all results for comparison
-    all_strategy_scores = {
-        'semantic': {'rouge1': [], 'rouge2': [], 'rougeL': []},
-        'tokenwise': {'rouge1': [], 'rouge2': [], 'rougeL': []},
-        'recursive': {'rouge1': [], 'rouge2': [], 'rougeL': []}
-    }
-    
+    # Semantic summaries are the reference; cases run on the pool and their
+    # scores are averaged as they finish
+    averages = ScoreAverages()
     detailed_results = {}
-    
-    # Evaluate each case
-    for i, case_num in enumerate(case_numbers):
+    for record in iter_corpus_evaluation(case_numbers, 'semantic', 5, bleu=False, workers=workers):
         pass
-#         print(f"\n📂 CASE {case_num} EVALUATION:")
-#         print("-"*40)
-        
-        # Get summaries from all strategies
-        strategies = ['semantic', 'tokenwise', 'recursive']
-        case_summaries = {}
-        
-        for strategy in strategies:
-            pass
-            chunks = loader.load_chunked_text(strategy, case_num)
-            if chunks:
-                pass
-                summary = summarizer.extractive_summary(chunks, 5)
-                case_summaries[strategy] = summary
-        
-        # Use semantic as reference (you can change this)
-        if 'semantic' in case_summaries:
+        if 'semantic' in record['summaries']:
             pass
-            reference_summary = case_summaries['semantic']
-            
-#             print(f"📋 Reference (Semantic): {reference_summary[:100]}...")
-#             print()
-            
-            # Compare other strategies against semantic
-            for strategy in ['tokenwise', 'recursive']:
-                pass
-                if strategy in case_summaries:
-                    pass
-                    generated_summary = case_summaries[strategy]
-                    scores = evaluator.evaluate_summary(reference_summary, generated_summary)
-                    
-#                     print(f"🔍 {strategy.upper()} vs Semantic:")
-#                     print(f"   Summary: {generated_summary[:80]}...")
-                    
-                    # Store scores for averaging
-                    if ROUGE_AVAILABLE:
-                        pass
-                        all_strategy_scores[strategy]['rouge1'].append(scores['rouge1'].fmeasure)
-                        all_strategy_scores[strategy]['rouge2'].append(scores['rouge2'].fmeasure)
-                        all_strategy_scores[strategy]['rougeL'].append(scores['rougeL'].fmeasure)
-                        
-#                         print(f"   📊 ROUGE-1: F1={scores['rouge1'].fmeasure:.3f}")
-#                         print(f"   📊 ROUGE-2: F1={scores['rouge2'].fmeasure:.3f}")
-#                         print(f"   📊 ROUGE-L: F1={scores['rougeL'].fmeasure:.3f}")
-                    else:
-                        pass
-                        all_strategy_scores[strategy]['rouge1'].append(scores['rouge1']['fmeasure'])
-                        all_strategy_scores[strategy]['rouge2'].append(scores['rouge2']['fmeasure'])
-                        all_strategy_scores[strategy]['rougeL'].append(scores['rougeL']['fmeasure'])
-                        
-#                         print(f"   📊 ROUGE-1: F1={scores['rouge1']['fmeasure']:.3f}")
-#                         print(f"   📊 ROUGE-2: F1={scores['rouge2']['fmeasure']:.3f}")
-#                         print(f"   📊 ROUGE-L: F1={scores['rougeL']['fmeasure']:.3f}")
-#                     print()
-                    
-            detailed_results[case_num] = case_summaries
+            detailed_results[record['case_number']] = record['summaries']
+            averages.add(record['scores'])
+    detailed_results = {case_num: detailed_results[case_num] for case_num in case_numbers
+                        if case_num in detailed_results}
     
     # Display overall comparison
 #     print("\n" + "="*70)
 #     print("📊 OVERALL CHUNKING STRATEGY COMPARISON")
 #     print("="*70)
     
-    strategy_averages = {}
-    for strategy in ['tokenwise', 'recursive']:
+    means_by_strategy = averages.means()
+    strategy_averages = {strategy: means_by_strategy[strategy] for strategy in ('tokenwise', 'recursive')
+                         if strategy in means_by_strategy}
+    for strategy, means in strategy_averages.items():
         pass
-        if all_strategy_scores[strategy]['rouge1']:  # If we have scores
+        if means:
             pass
-            avg_rouge1 = sum(all_strategy_scores[strategy]['rouge1']) / len(all_strategy_scores[strategy]['rouge1'])
-            avg_rouge2 = sum(all_strategy_scores[strategy]['rouge2']) / len(all_strategy_scores[strategy]['rouge2'])
-            avg_rougeL = sum(all_strategy_scores[strategy]['rougeL']) / len(all_strategy_scores[strategy]['rougeL'])
-            
-            strategy_averages[strategy] = {
-                'rouge1': avg_rouge1,
-                'rouge2': avg_rouge2,
-                'rougeL': avg_rougeL
-            }
+            avg_rouge1 = means['rouge1']
             
 #             print(f"\n🎯 {strategy.upper()} STRATEGY (vs Semantic baseline):")
 #             print(f"   Average ROUGE-1: {avg_rouge1:.3f}")
-#             print(f"   Average ROUGE-2: {avg_rouge2:.3f}")
-#             print(f"   Average ROUGE-L: {avg_rougeL:.3f}")
+#             print(f"   Average ROUGE-2: {means['rouge2']:.3f}")
+#             print(f"   Average ROUGE-L: {means['rougeL']:.3f}")
             
             # Simple performance assessment
             if avg_rouge1 > 0.3:
@@ -1359,37 +2753,43 @@ def create_rouge_comparison_chart(strategy_averages):
 
 # Run comprehensive evaluation
 # print("🎯 Running comprehensive ROUGE evaluation...")
-results, averages = display_comprehensive_evaluation(['1', '2', '3'])
+if RUN_NOTEBOOK_DEMO:
+    results, averages = display_comprehensive_evaluation(['1', '2', '3'])
 
-# Create visual comparison
-# print("\n")
-create_rouge_comparison_chart(averages)
+    # Create visual comparison
+#     print("\n")
+    create_rouge_comparison_chart(averages)
 
 # print("\n" + "="*70)
 # print("✅ ROUGE EVALUATION COMPLETE!")
 # print("="*70)
 
 # Install BLEU score package if not available
-try:
-    pass
-    from nltk.translate.bleu_score import sentence_bleu, SmoothingFunction
-    BLEU_AVAILABLE = True
-#     print("✅ BLEU scoring available")
-except ImportError:
-    pass
-    BLEU_AVAILABLE = False
-#     print("❌ BLEU scoring not available - install nltk")
+BLEU_AVAILABLE = importlib.util.find_spec('nltk') is not None
+# print("✅ BLEU scoring available" if BLEU_AVAILABLE else "❌ BLEU scoring not available - install nltk")
 
 # Enhanced Evaluation Class with BLEU Score
 class EnhancedSummaryEvaluator:
     pass
     def __init__(self):
         pass
-        self.smoothing_function = SmoothingFunction().method4 if BLEU_AVAILABLE else None
+        self._smoothing_function = None
+
+    @property
+    def smoothing_function(self):
+        """NLTK BLEU smoothing (method4), created on first access"""
+        if self._smoothing_function is None and BLEU_AVAILABLE:
+            from nltk.translate.bleu_score import SmoothingFunction
+            self._smoothing_function = SmoothingFunction().method4
+        return self._smoothing_function
         
     def calculate_bleu_score(self, reference, candidate):
         pass
         """Calculate BLEU score between reference and candidate"""
+        if isinstance(reference, ParsedDocument):
+            reference = reference.text
+        if isinstance(candidate, ParsedDocument):
+            candidate = candidate.text
         if not BLEU_AVAILABLE:
             pass
             return 0.0
@@ -1401,6 +2801,7 @@ class EnhancedSummaryEvaluator:
         # Calculate BLEU score
         try:
             pass
+            from nltk.translate.bleu_score import sentence_bleu
             bleu_score = sentence_bleu([reference_tokens], candidate_tokens, 
                                      smoothing_function=self.smoothing_function)
             return bleu_score
@@ -1408,6 +2809,76 @@ class EnhancedSummaryEvaluator:
             pass
             return 0.0
     
+    @staticmethod
+    def _occurrence_matrix(token_lists, n):
+        """Binary docs x (n-gram, k) matrix with a 1 for the k-th occurrence of each n-gram.
+
+        Clipped n-gram matches between two documents, sum of min(count_a,
+        count_b), are the shared (n-gram, k) columns, so one sparse product
+        gives them for every pair.
+        """
+        from scipy import sparse
+
+        columns, indices, indptr = {}, array('q'), array('q', [0])
+        for tokens in token_lists:
+            seen = Counter()
+            for gram in zip(*(tokens[i:] for i in range(n))):
+                seen[gram] += 1
+                indices.append(columns.setdefault((gram, seen[gram]), len(columns)))
+            indptr.append(len(indices))
+        indices = np.frombuffer(indices, dtype=np.int64) if len(indices) else np.zeros(0, dtype=np.int64)
+        return sparse.csr_matrix((np.ones(len(indices)), indices, np.frombuffer(indptr, dtype=np.int64)),
+                                 shape=(len(token_lists), max(len(columns), 1)))
+
+    def _clipped_matches(self, token_lists, n):
+        occurrences = self._occurrence_matrix(token_lists, n)
+        return (occurrences @ occurrences.T).toarray()
+
+    def pairwise_bleu(self, texts, max_order=4):
+        """BLEU of every text against every other: result[i, j] = calculate_bleu_score(texts[i], texts[j]).
+
+        Each text is tokenized once; the clipped n-gram matches for all pairs
+        come from one sparse product per order, and brevity penalty, method4
+        smoothing and the geometric mean are applied to whole matrices.
+        """
+        texts = [text.text if isinstance(text, ParsedDocument) else text for text in texts]
+        size = len(texts)
+        if not BLEU_AVAILABLE or not size:
+            return np.zeros((size, size))
+        token_lists = [word_tokenize(text.lower()) for text in texts]
+        lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.float64)
+        ref_len, hyp_len = lengths[:, None], lengths[None, :]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_hyp_len = np.broadcast_to(np.log(hyp_len), (size, size))
+            log_precision_sum = np.zeros((size, size))
+            smoothed = np.ones((size, size))  # method4's counter of smoothed orders
+            first_matches = None
+            for n in range(1, max_order + 1):
+                matches = self._clipped_matches(token_lists, n)
+                if n == 1:
+                    first_matches = matches
+                denominator = np.broadcast_to(np.maximum(1.0, hyp_len - n + 1), (size, size))
+                zero = (matches == 0) & (hyp_len > 1)
+                precision = np.where(zero, 1 / (2.0 ** smoothed * 5 / log_hyp_len) / denominator,
+                                     matches / denominator)
+                smoothed += zero
+                log_precision_sum += np.where(precision > 0, 0.25 * np.log(precision), 0.0)
+            brevity = np.where(hyp_len > ref_len, 1.0, np.exp(1 - ref_len / hyp_len))
+            scores = brevity * np.exp(log_precision_sum)
+        return np.where(first_matches > 0, scores, 0.0)
+
+    def pairwise_overlap(self, texts):
+        """Dice overlap of clipped unigram counts for every pair of texts"""
+        texts = [text.text if isinstance(text, ParsedDocument) else text for text in texts]
+        token_lists = [word_tokenize(text.lower()) for text in texts]
+        lengths = np.array([len(tokens) for tokens in token_lists], dtype=np.float64)
+        if not len(texts):
+            return np.zeros((0, 0))
+        total = lengths[:, None] + lengths[None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, 2 * self._clipped_matches(token_lists, 1) / total, 0.0)
+
     def comprehensive_evaluation(self, reference, candidate):
         pass
         """Comprehensive evaluation with both ROUGE and BLEU"""
@@ -1420,16 +2891,9 @@ class EnhancedSummaryEvaluator:
         bleu_score = self.calculate_bleu_score(reference, candidate)
         
         # Combine results
-        if ROUGE_AVAILABLE:
-            pass
-            results['rouge1'] = rouge_scores['rouge1'].fmeasure
-            results['rouge2'] = rouge_scores['rouge2'].fmeasure
-            results['rougeL'] = rouge_scores['rougeL'].fmeasure
-        else:
-            pass
-            results['rouge1'] = rouge_scores['rouge1']['fmeasure']
-            results['rouge2'] = rouge_scores['rouge2']['fmeasure']
-            results['rougeL'] = rouge_scores['rougeL']['fmeasure']
+        results['rouge1'] = rouge_scores['rouge1'].fmeasure
+        results['rouge2'] = rouge_scores['rouge2'].fmeasure
+        results['rougeL'] = rouge_scores['rougeL'].fmeasure
         
         results['bleu'] = bleu_score
         
@@ -1447,7 +2911,7 @@ def interactive_case_analyzer():
 #     print(f"Available cases: {', '.join(available_cases[:20])}...")
 
 #     case_number = input("🔹 Enter case number to analyze: ").strip()  # commented out for API mode
-    if case_number not in available_cases:
+    if not loader.has_case(case_number):
         pass
 #         print(f"❌ Case {case_number} not found!")
         return None
@@ -1487,9 +2951,13 @@ def interactive_case_analyzer():
 
     return result
 
-def quick_case_comparison(case_numbers, chunking_strategy='semantic'):
+def quick_case_comparison(case_numbers, chunking_strategy='semantic', return_matrix=False):
     pass
-    """Quick comparison of multiple cases with summary evaluation"""
+    """Quick comparison of multiple cases with summary evaluation.
+
+    With return_matrix=True also returns the pairwise BLEU matrix, rows and
+    columns in the order of the returned results.
+    """
     
     if not case_numbers:
         pass
@@ -1501,10 +2969,9 @@ def quick_case_comparison(case_numbers, chunking_strategy='semantic'):
     
     results = {}
     all_summaries = []
-    
     for case_num in case_numbers:
         pass
-        if case_num in available_cases:
+        if loader.has_case(case_num):
             pass
 #             print(f"📂 Processing Case {case_num}...")
             
@@ -1512,10 +2979,11 @@ def quick_case_comparison(case_numbers, chunking_strategy='semantic'):
             chunks = loader.load_chunked_text(chunking_strategy, case_num)
             if chunks:
                 pass
-                summary = summarizer.extractive_summary(chunks, 2)  # 2 sentences
+                document = ParsedDocument.from_chunks(chunks)
+                summary = summarizer.extractive_summary(document, 2)  # 2 sentences
                 results[case_num] = {
                     'summary': summary,
-                    'word_count': len(word_tokenize(' '.join(chunks))),
+                    'word_count': document.word_count,
                     'chunk_count': len(chunks)
                 }
                 all_summaries.append(summary)
@@ -1528,7 +2996,8 @@ def quick_case_comparison(case_numbers, chunking_strategy='semantic'):
             pass
 #             print(f"   ❌ Case {case_num} not found")
     
-    # Cross-comparison using BLEU scores
+    # Cross-comparison using BLEU scores, every pair at once
+    bleu_matrix = enhanced_evaluator.pairwise_bleu(all_summaries)
     if len(all_summaries) > 1:
         pass
 #         print("🔄 Cross-Comparison Analysis (BLEU Scores):")
@@ -1540,15 +3009,14 @@ def quick_case_comparison(case_numbers, chunking_strategy='semantic'):
                 pass
                 if i < j:  # Avoid duplicate comparisons
                     pass
-                    summary1 = results[case1]['summary']
-                    summary2 = results[case2]['summary']
-                    
-                    bleu_score = enhanced_evaluator.calculate_bleu_score(summary1, summary2)
+                    bleu_score = bleu_matrix[i, j]
                     
                     similarity_level = "High" if bleu_score > 0.3 else "Medium" if bleu_score > 0.1 else "Low"
                     
 #                     print(f"   Case {case1} vs Case {case2}: BLEU = {bleu_score:.3f} ({similarity_level} similarity)")
     
+    if return_matrix:
+        return results, bleu_matrix
     return results
 
 # print("Quick comparison tool ready! ⚡")
@@ -1564,45 +3032,46 @@ def quick_case_comparison(case_numbers, chunking_strategy='semantic'):
 # Or run with a specific case (change the number as needed)
 # result = interactive_case_analyzer()
 
-# For demonstration, let's analyze a specific case
-demo_case = "10"  # Change this to any available case number
-# print(f"🔍 Demo Analysis for Case {demo_case}:")
+if RUN_NOTEBOOK_DEMO:
+    # For demonstration, let's analyze a specific case
+    demo_case = "10"  # Change this to any available case number
+    # print(f"🔍 Demo Analysis for Case {demo_case}:")
 
-# Load and display case info
-metadata = loader.load_metadata(demo_case)
-if metadata:
-    pass
-#     print(f"📋 Case Info: {metadata[:150]}...")
+    # Load and display case info
+    metadata = loader.load_metadata(demo_case)
+    if metadata:
+        pass
+    #     print(f"📋 Case Info: {metadata[:150]}...")
 
-# Get summaries from different strategies
-strategies = ['semantic', 'tokenwise', 'recursive']
-demo_summaries = {}
+    # Get summaries from different strategies
+    strategies = ['semantic', 'tokenwise', 'recursive']
+    demo_summaries = {}
 
-for strategy in strategies:
-    pass
-    chunks = loader.load_chunked_text(strategy, demo_case)
-    if chunks:
+    for strategy in strategies:
         pass
-        summary = summarizer.extractive_summary(chunks, 2)
-        demo_summaries[strategy] = summary
-#         print(f"\n{strategy.capitalize()}: {summary[:100]}...")
+        chunks = loader.load_chunked_text(strategy, demo_case)
+        if chunks:
+            pass
+            summary = summarizer.extractive_summary(chunks, 2)
+            demo_summaries[strategy] = summary
+    #         print(f"\n{strategy.capitalize()}: {summary[:100]}...")
 
-# Quick evaluation
-if len(demo_summaries) >= 2:
-    pass
-#     print(f"\n📊 Quick ROUGE & BLEU Evaluation:")
-    
-    if 'semantic' in demo_summaries and 'tokenwise' in demo_summaries:
+    # Quick evaluation
+    if len(demo_summaries) >= 2:
         pass
-        scores = enhanced_evaluator.comprehensive_evaluation(
-            demo_summaries['semantic'], 
-            demo_summaries['tokenwise']
-        )
+    #     print(f"\n📊 Quick ROUGE & BLEU Evaluation:")
+    
+        if 'semantic' in demo_summaries and 'tokenwise' in demo_summaries:
+            pass
+            scores = enhanced_evaluator.comprehensive_evaluation(
+                demo_summaries['semantic'], 
+                demo_summaries['tokenwise']
+            )
         
-#         print(f"TokenWise vs Semantic:")
-#         print(f"  ROUGE-1: {scores['rouge1']:.3f}")
-#         print(f"  ROUGE-L: {scores['rougeL']:.3f}")
-#         print(f"  BLEU: {scores['bleu']:.3f}")
+    #         print(f"TokenWise vs Semantic:")
+    #         print(f"  ROUGE-1: {scores['rouge1']:.3f}")
+    #         print(f"  ROUGE-L: {scores['rougeL']:.3f}")
+    #         print(f"  BLEU: {scores['bleu']:.3f}")
 
 # print("\n✅ Demo complete! Use interactive_case_analyzer() for full analysis")
 
@@ -1614,96 +3083,250 @@ if len(demo_summaries) >= 2:
 import json
 import re
 from datetime import datetime
-import nltk
-from nltk.tokenize import sent_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
 import numpy as np
-import PyPDF2
 
 # --- Entity Extractor ---
-class LegalEntityExtractor:
+class LegalEntityScanner:
     pass
+    """Finds every legal entity pattern in one pass over the text.
+
+    A single case-insensitive keyword search (act, section, AIR, Justice,
+    the legal-term list, ...) locates candidate positions.  At each hit only
+    the patterns anchored on that keyword are tried, with `match()` at the
+    position where `re.findall` would have started, and a per-pattern end
+    offset reproduces findall's non-overlapping semantics, so the results
+    are the same as running each pattern over the whole text.  The scanner
+    holds no per-call state and can be shared between threads.
+    """
+    LEGAL_TERMS = ['appeal', 'petition', 'writ', 'mandamus', 'certiorari', 'prohibition',
+                   'habeas corpus', 'jurisdiction', 'constitutional', 'fundamental rights',
+                   'directive principles', 'due process', 'natural justice']
+
+    # (field, pattern, flags, keyword, where findall starts relative to the keyword)
+    PATTERNS = [
+        ('acts', r'(\w+\s+Act,?\s+\d{4})', re.IGNORECASE, 'act', 'word_before'),
+        ('acts', r'(Indian\s+\w+\s+Act)', re.IGNORECASE, 'indian', 'keyword'),
+        ('acts', r'(Code\s+of\s+\w+\s+Procedure)', re.IGNORECASE, 'code', 'keyword'),
+        ('sections', r'Section\s+\d+[A-Z]?', re.IGNORECASE, 'section', 'keyword'),
+        ('sections', r'Article\s+\d+[A-Z]?', re.IGNORECASE, 'article', 'keyword'),
+        ('sections', r'Rule\s+\d+[A-Z]?', re.IGNORECASE, 'rule', 'keyword'),
+        ('citations', r'AIR\s+\d{4}\s+SC\s+\d+', 0, 'air', 'keyword'),
+        ('citations', r'\d{4}\s+SCR\s*\([^\)]*\)\s*\d+', 0, 'scr', 'year_before'),
+        ('judges', r'Justice\s+[A-Z][a-zA-Z]+', 0, 'justice', 'keyword'),
+        ('judges', r'Hon.?ble\s+Mr.?\s+Justice\s+[A-Z][a-zA-Z]+', 0, 'hon', 'keyword'),
+        # TextAnalyzer.extract_legal_entities
+        ('analyzer_acts', r'([A-Z][a-z\s]+Act,?\s*\d{4})', 0, 'act', 'capital_before'),
+        ('analyzer_sections', r'Section\s+(\d+[A-Za-z]?(?:\(\d+\))?)', 0, 'section', 'keyword'),
+    ]
+    FIELDS = ('acts', 'sections', 'citations', 'judges', 'analyzer_acts', 'analyzer_sections')
+
     def __init__(self):
         pass
-        self.act_patterns = [
-            r'(\w+\s+Act,?\s+\d{4})',
-            r'(Indian\s+\w+\s+Act)',
-            r'(Code\s+of\s+\w+\s+Procedure)'
-        ]
-        self.section_patterns = [
-            r'Section\s+\d+[A-Z]?',
-            r'Article\s+\d+[A-Z]?',
-            r'Rule\s+\d+[A-Z]?'
-        ]
-        self.citation_patterns = [
-            r'AIR\s+\d{4}\s+SC\s+\d+',
-            r'\d{4}\s+SCR\s*\([^\)]*\)\s*\d+'
-        ]
-        self.judge_patterns = [
-            r'Justice\s+[A-Z][a-zA-Z]+',
-            r'Hon.?ble\s+Mr.?\s+Justice\s+[A-Z][a-zA-Z]+'
-        ]
+        self.patterns = [(field, re.compile(pattern, flags), start)
+                         for field, pattern, flags, _, start in self.PATTERNS]
+        keywords = {keyword for *_, keyword, _ in self.PATTERNS} | set(self.LEGAL_TERMS)
+        self.by_keyword = {keyword: [] for keyword in keywords}
+        for index, (*_, keyword, _) in enumerate(self.PATTERNS):
+            self.by_keyword[keyword].append(index)
+        self.terms = frozenset(self.LEGAL_TERMS)
+        alternation = '|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+        self.trigger = re.compile(alternation, re.IGNORECASE)
+        # Searching text.lower() case-sensitively finds the same hits several
+        # times faster, unless the text has one of the only characters that
+        # IGNORECASE folds onto an ASCII letter differently from str.lower()
+        self.lower_trigger = re.compile(alternation)
+        self.special_case = re.compile('[\u0130\u0131\u017f\u212a]')
+
+    @staticmethod
+    def _start(text, position, rule):
+        """Where findall's match would begin for a keyword at `position`, or -1"""
+        if rule == 'keyword':
+            return position
+        if rule == 'capital_before':
+            # [A-Z][a-z\s]+ immediately before the keyword
+            i = position - 1
+            while i >= 0 and (text[i].isspace() or 'a' <= text[i] <= 'z'):
+                i -= 1
+            return i if 0 <= i < position - 1 else -1
+        # Both remaining rules need whitespace right before the keyword
+        i = position - 1
+        while i >= 0 and text[i].isspace():
+            i -= 1
+        if i == position - 1:
+            return -1
+        if rule == 'year_before':
+            return i - 3
+        # word_before: the run of word characters ending at i
+        while i >= 0 and (text[i].isalnum() or text[i] == '_'):
+            i -= 1
+        return i + 1
+
+    def scan(self, text):
+        """Return {field: set of matches} plus the legal terms found, in list order"""
+        found = {field: set() for field in self.FIELDS}
+        terms = set()
+        last_end = [0] * len(self.patterns)
+        if text.isascii() or not self.special_case.search(text):
+            haystack, search = text.lower(), self.lower_trigger.search
+        else:
+            haystack, search = text, self.trigger.search
+        hit = search(haystack)
+        while hit is not None:
+            # casefold() maps what IGNORECASE matched (e.g. 'ſ', 'K') back to the keyword
+            keyword = hit.group().casefold()
+            position = hit.start()
+            if keyword in self.terms:
+                # TextAnalyzer compared terms against text.lower()
+                if hit.group().lower() == keyword:
+                    terms.add(keyword)
+            else:
+                for index in self.by_keyword.get(keyword, ()):
+                    field, pattern, rule = self.patterns[index]
+                    start = self._start(text, position, rule)
+                    if rule == 'word_before':
+                        # findall resumes mid-word after an overlapping match
+                        start = max(start, last_end[index])
+                        if start >= position:
+                            continue
+                    elif start < last_end[index]:
+                        continue
+                    match = pattern.match(text, start)
+                    if match:
+                        found[field].add(match.group(1) if pattern.groups else match.group())
+                        last_end[index] = match.end()
+            # Resume one character later so keywords overlapping this hit are still seen
+            hit = search(haystack, position + 1)
+        found['legal_terms'] = [term for term in self.LEGAL_TERMS if term in terms]
+        return found
+
+entity_scanner = LegalEntityScanner()
 
-    def extract(self, text):
+class LegalEntityExtractor:
+    pass
+    def __init__(self, scanner=None):
         pass
-        acts, sections, citations, judges = [], [], [], []
-
-        for pattern in self.act_patterns:
-            pass
-            acts.extend(re.findall(pattern, text, re.IGNORECASE))
-        for pattern in self.section_patterns:
-            pass
-            sections.extend(re.findall(pattern, text, re.IGNORECASE))
-        for pattern in self.citation_patterns:
-            pass
-            citations.extend(re.findall(pattern, text))
-        for pattern in self.judge_patterns:
-            pass
-            judges.extend(re.findall(pattern, text))
+        self.scanner = scanner or entity_scanner
+        self.act_patterns = [p for f, p, *_ in LegalEntityScanner.PATTERNS if f == 'acts']
+        self.section_patterns = [p for f, p, *_ in LegalEntityScanner.PATTERNS if f == 'sections']
+        self.citation_patterns = [p for f, p, *_ in LegalEntityScanner.PATTERNS if f == 'citations']
+        self.judge_patterns = [p for f, p, *_ in LegalEntityScanner.PATTERNS if f == 'judges']
 
+    def extract(self, text):
+        pass
+        found = self.scanner.scan(text)
         return {
-            "acts": list(set(acts)),
-            "sections": list(set(sections)),
-            "citations": list(set(citations)),
-            "judges": list(set(judges))
+            "acts": list(found['acts']),
+            "sections": list(found['sections']),
+            "citations": list(found['citations']),
+            "judges": list(found['judges'])
         }
 
+entity_extractor = LegalEntityExtractor()
+
 # --- Summarization ---
 def simple_summarize(text, num_sentences=5):
     pass
-    sentences = sent_tokenize(text)
+    with stage("sent_tokenize"):
+        sentences = sent_tokenize(text)
     if len(sentences) <= num_sentences:
         pass
         return " ".join(sentences)
-    vectorizer = TfidfVectorizer(stop_words="english")
-    tfidf_matrix = vectorizer.fit_transform(sentences)
-    scores = np.array(tfidf_matrix.sum(axis=1)).ravel()
+    with stage("tfidf"):
+        idf_model = get_idf_model()
+        if idf_model is not None:
+            tfidf_matrix = idf_model.transform(sentences)
+        else:
+            vectorizer = TfidfVectorizer(stop_words="english")
+            tfidf_matrix = vectorizer.fit_transform(sentences)
+        scores = np.array(tfidf_matrix.sum(axis=1)).ravel()
     top_indices = scores.argsort()[-num_sentences:][::-1]
     top_sentences = [sentences[i] for i in sorted(top_indices)]
     return " ".join(top_sentences)
 
+# --- PDF text extraction ---
+# Large judgments are split into page ranges that are extracted in parallel
+# on the worker pool; smaller ones are streamed page by page.
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "64"))
+PDF_PAGES_PER_TASK = int(os.environ.get("PDF_PAGES_PER_TASK", "32"))
+
+def get_pdf_executor():
+    """Process pool for page-parallel extraction, or None when unavailable"""
+    if worker_pool.kind == "process" and worker_pool.workers > 1:
+        return worker_pool.executor
+    return None
+
+def iter_pdf_pages(reader, start=0, stop=None):
+    """Yield the extracted text of each page of a PyPDF2 reader, one at a time"""
+    pages = reader.pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    for index in range(start, stop):
+        yield pages[index].extract_text() or ""
+
+def extract_page_range(data, start, stop):
+    """Extract pages [start, stop) of a PDF given as bytes (process pool task)"""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return list(iter_pdf_pages(reader, start, stop))
+
+def join_pdf_pages(page_texts, page_suffix=""):
+    """Join page texts, skipping empty pages and appending `page_suffix` to each"""
+    return "".join(page_text + page_suffix for page_text in page_texts if page_text)
+
+def pdf_extraction_stats(num_pages, started, parallel):
+    """Pages, seconds and pages/sec for an extraction that began at `started`"""
+    seconds = time.perf_counter() - started
+    return {
+        "pages": num_pages,
+        "seconds": round(seconds, 4),
+        "pages_per_sec": round(num_pages / seconds, 2) if seconds > 0 else None,
+        "parallel": parallel,
+    }
+
+def page_ranges(num_pages):
+    """Split `num_pages` into (start, stop) ranges of PDF_PAGES_PER_TASK pages"""
+    return [(start, min(start + PDF_PAGES_PER_TASK, num_pages))
+            for start in range(0, num_pages, PDF_PAGES_PER_TASK)]
+
+def extract_pdf_text(data, page_suffix="", executor=None, max_pages=None):
+    """Extract the text of a PDF given as bytes.
+
+    Empty pages are skipped and every other page is followed by
+    `page_suffix`.  Returns the text and extraction stats (pages, seconds,
+    pages/sec).  When the PDF has more than `max_pages` pages nothing is
+    extracted and the text is None, so the caller can fan the pages out
+    itself.
+    """
+    import PyPDF2
+    started = time.perf_counter()
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    num_pages = len(reader.pages)
+
+    if max_pages is not None and num_pages > max_pages:
+        return None, {"pages": num_pages}
+
+    if executor is not None and num_pages >= PDF_PARALLEL_MIN_PAGES:
+        futures = [executor.submit(extract_page_range, data, start, stop)
+                   for start, stop in page_ranges(num_pages)]
+        text = join_pdf_pages((page_text for future in futures for page_text in future.result()),
+                              page_suffix)
+        return text, pdf_extraction_stats(num_pages, started, True)
+
+    text = join_pdf_pages(iter_pdf_pages(reader), page_suffix)
+    return text, pdf_extraction_stats(num_pages, started, False)
+
 # --- Load case text ---
 def load_case_text(case_name: str):
     pass
-    txt_path = ORIGINAL_DIR / f"{case_name}.txt"
-    pdf_path = ORIGINAL_DIR / f"{case_name}.pdf"
-    if txt_path.exists():
+    path = original_judgment_path(case_name)
+    if path is not None and path.suffix == ".txt":
         pass
-        with open(txt_path, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             pass
             return f.read()
-    elif pdf_path.exists():
+    elif path is not None:
         pass
-        text = ""
-        with open(pdf_path, "rb") as f:
-            pass
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                pass
-                page_text = page.extract_text()
-                if page_text:
-                    pass
-                    text += page_text + "\n"
+        text, _ = extract_pdf_text(path.read_bytes(), page_suffix="\n",
+                                   executor=get_pdf_executor())
         return text
     else:
         pass
@@ -1711,16 +3334,65 @@ def load_case_text(case_name: str):
 #         return input("Case text: ")  # commented out for API mode
 
 # --- Structured Summarizer ---
-def structured_summarize(text):
-    pass
-    sentences = sent_tokenize(text)
-    overview = simple_summarize(" ".join(sentences[:len(sentences)//3]), 3)
-    arguments = simple_summarize(" ".join(sentences[len(sentences)//3:2*len(sentences)//3]), 3)
-    decision = simple_summarize(" ".join(sentences[2*len(sentences)//3:]), 2)
-    return {
-        "overview": overview,
-        "decision": " ".join(sent_tokenize(decision)[:3])
-    }
+STRUCTURED_FIELDS = ("overview", "arguments", "decision")
+
+def _section_scores(counts):
+    """simple_summarize()'s sentence scores for one section's rows of term counts"""
+    from sklearn.preprocessing import normalize
+    n = counts.shape[0]
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((n + 1) / (df + 1.0)) + 1.0
+    weighted = counts.copy()
+    weighted.data *= idf[weighted.indices]
+    weighted = normalize(weighted, norm="l2", copy=False)
+    return np.array(weighted.sum(axis=1)).ravel()
+
+def structured_summarize(text, overview_sentences=3, decision_sentences=2, arguments_sentences=3,
+                         fields=("overview", "decision")):
+    """Summaries of the opening, middle and closing third of a judgment.
+
+    The text is sentence-split once and the sentences of the requested
+    sections go through a single vectorization.  Each section then scores
+    its own rows with that section's IDF (what simple_summarize() on the
+    section would do) and keeps its top sentences in document order;
+    sections not in `fields` are never scored.
+    """
+    unknown = set(fields) - set(STRUCTURED_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown summary fields: {', '.join(sorted(unknown))}")
+    with stage("sent_tokenize"):
+        document = sentence_index.attach(as_document(text))
+        n = document.sentence_count
+    bounds = {"overview": (0, n // 3), "arguments": (n // 3, 2 * n // 3), "decision": (2 * n // 3, n)}
+    limits = {"overview": overview_sentences, "arguments": arguments_sentences,
+              "decision": decision_sentences}
+
+    picks = {field: range(*bounds[field]) for field in fields}
+    scored = [field for field in fields if len(picks[field]) > limits[field]]
+    if scored:
+        with stage("tfidf"):
+            sentences = [document.sentence(i) for field in scored for i in picks[field]]
+            idf_model = get_idf_model()
+            try:
+                if idf_model is not None:
+                    matrix = idf_model.transform(sentences)
+                else:
+                    matrix = TfidfVectorizer(stop_words="english", use_idf=False, norm=None).fit_transform(sentences)
+            except ValueError:
+                matrix = None  # only stop words anywhere
+            offset = 0
+            for field in scored:
+                lo, hi = bounds[field]
+                block = matrix[offset:offset + hi - lo] if matrix is not None else None
+                offset += hi - lo
+                if block is None or not block.nnz:
+                    picks[field] = range(lo, lo + limits[field])
+                    continue
+                scores = np.array(block.sum(axis=1)).ravel() if idf_model is not None else _section_scores(block)
+                picks[field] = [lo + i for i in sorted(scores.argsort()[-limits[field]:][::-1])]
+    if "decision" in picks:
+        picks["decision"] = picks["decision"][:3]
+    return {field: " ".join(document.sentence(i) for i in picks[field]) for field in fields}
 
 # --- Main Summarization Function ---
 # def summarize_case(case_name: str, output_format="json"):  # commented out to prevent auto-execution in API mode
@@ -1766,8 +3438,450 @@ if __name__ == "__main__":
 
 # === Original Notebook Code Ends ===
 
+# --- Stage timings and metrics ---
+# Each HTTP request gets a StageTimer (see StageTimingMiddleware); code on
+# the request path wraps its steps in `with stage("name"):`, which is a
+# no-op outside a request.  Pool tasks run under run_timed, so stages timed
+# in a worker process come back with the result and are added to the
+# request's timer.  Stage times feed the histograms behind /metrics and the
+# response's Server-Timing header.  A stage that wraps other timed stages
+# is named *_total (summarize_total is the pool call that contains
+# sent_tokenize, tfidf and entities), so the other stages add up to no more
+# than the request total.
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class StageTimer:
+    """Seconds spent in each named stage of one request (repeated stages add up)"""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, stages):
+        for name, seconds in stages.items():
+            self.add(name, seconds)
+
+    def server_timing(self, total):
+        """Server-Timing header value: every stage plus the request total, in ms"""
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+_stage_timer = contextvars.ContextVar("stage_timer", default=None)
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as stage `name` of the current request"""
+    timer = _stage_timer.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timer is not None:
+            timer.add(name, time.perf_counter() - started)
+
+def run_timed(fn, *args):
+    """Run fn(*args) under a fresh StageTimer and return (result, stages) (worker pool task)"""
+    timer = StageTimer()
+    token = _stage_timer.set(timer)
+    try:
+        return fn(*args), timer.stages
+    finally:
+        _stage_timer.reset(token)
+
+class PipelineMetrics:
+    """Stage/request latency histograms and pipeline counters, in Prometheus text format"""
+    HISTOGRAMS = {
+        "court_stage_seconds": ("stage", "Time spent in each summarization pipeline stage"),
+        "court_request_seconds": ("path", "HTTP request latency"),
+    }
+    COUNTERS = {
+        "court_documents_total": "Documents summarized",
+        "court_pages_total": "PDF pages extracted",
+        "court_bytes_total": "Bytes of uploaded documents",
+        "court_errors_total": "Requests that failed while summarizing",
+    }
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms = {}  # (metric, label value) -> [per-bucket counts..., +Inf count, sum]
+        self._counters = {}  # (metric, ((label, value), ...)) -> total
+
+    def observe(self, metric, label_value, seconds):
+        with self._lock:
+            entry = self._histograms.get((metric, label_value))
+            if entry is None:
+                entry = self._histograms[(metric, label_value)] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[bisect.bisect_left(self.buckets, seconds)] += 1
+            entry[-1] += seconds
+
+    def count(self, metric, amount=1, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @staticmethod
+    def _labels(pairs):
+        if not pairs:
+            return ""
+        parts = []
+        for name, value in pairs:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            parts.append(f'{name}="{value}"')
+        return "{" + ",".join(parts) + "}"
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            histograms = {key: list(entry) for key, entry in self._histograms.items()}
+            counters = dict(self._counters)
+        lines = []
+        for metric, (label, help_text) in self.HISTOGRAMS.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for (name, value), entry in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), entry[:-1]):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{metric}_bucket{self._labels(((label, value), ('le', le)))} {cumulative}")
+                lines.append(f"{metric}_sum{self._labels(((label, value),))} {entry[-1]!r}")
+                lines.append(f"{metric}_count{self._labels(((label, value),))} {cumulative}")
+        for metric, help_text in self.COUNTERS.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            series = sorted((labels, total) for (name, labels), total in counters.items() if name == metric)
+            for labels, total in series or [((), 0)]:
+                lines.append(f"{metric}{self._labels(labels)} {total}")
+        return "\n".join(lines) + "\n"
+
+pipeline_metrics = PipelineMetrics()
+
+# --- Worker pool ---
+# The summarization pipeline is CPU-bound, so the async endpoints hand it to
+# a pool instead of running it on the event loop.  At most
+# SUMMARIZER_MAX_INFLIGHT requests are admitted at once; anything beyond
+# that is rejected straight away with 503 rather than queued.
+SUMMARIZER_POOL = os.environ.get("SUMMARIZER_POOL", "process")  # "process" or "thread"
+SUMMARIZER_WORKERS = int(os.environ.get("SUMMARIZER_WORKERS", "0")) or (os.cpu_count() or 1)
+SUMMARIZER_MAX_INFLIGHT = int(os.environ.get("SUMMARIZER_MAX_INFLIGHT", "0")) or 2 * SUMMARIZER_WORKERS
+
+class WorkerPool:
+    """Bounded process/thread pool for the CPU-bound summarization pipeline"""
+    def __init__(self, kind="process", workers=1, max_inflight=2):
+        if kind not in ("process", "thread"):
+            raise ValueError("kind must be 'process' or 'thread'")
+        self.kind = kind
+        self.workers = workers
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """The underlying executor, started on first use"""
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+                executor_class = ProcessPoolExecutor if self.kind == "process" else ThreadPoolExecutor
+                self._executor = executor_class(max_workers=self.workers)
+            return self._executor
+
+    def try_acquire(self):
+        """Admit one request, or return False when the pool is saturated"""
+        with self._lock:
+            if self.inflight >= self.max_inflight:
+                self.rejected += 1
+                return False
+            self.inflight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the pool without blocking the event loop.
+
+        During a timed request the stages fn records come back with its
+        result and are added to the request's StageTimer.
+        """
+        loop = asyncio.get_running_loop()
+        timer = _stage_timer.get()
+        if timer is None:
+            return await loop.run_in_executor(self.executor, fn, *args)
+        result, stages = await loop.run_in_executor(self.executor, run_timed, fn, *args)
+        timer.merge(stages)
+        return result
+
+    def stats(self):
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "inflight": self.inflight,
+            "max_inflight": self.max_inflight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+worker_pool = WorkerPool(SUMMARIZER_POOL, SUMMARIZER_WORKERS, SUMMARIZER_MAX_INFLIGHT)
+
+def summarize_document(text, case_name, params=None):
+    """Run the summarization pipeline on extracted text (worker pool task)"""
+    # 👇 Use structured_summarize to build summary
+    structured_summary = structured_summarize(text, **(params or {}))
+
+    # 👇 Use your LegalEntityExtractor to get entities
+    with stage("entities"):
+        entities = entity_extractor.extract(text)
+
+    # 👇 Build JSON result
+    return {
+        "case_name": case_name,
+        "judges": entities["judges"],
+        "citations": entities["citations"],
+        "acts": entities["acts"],
+        "sections": entities["sections"],
+        "summary": structured_summary,
+        "timestamp": str(datetime.now())
+    }
+
+def summarize_batch_documents(texts, case_numbers=(), strategy='semantic', num_sentences=5):
+    """Extractive summaries for uploaded texts and corpus cases (worker pool task)"""
+    documents = [ParsedDocument(text) for text in texts]
+    documents += [loader.load_chunked_text(strategy, case_num) or [] for case_num in case_numbers]
+    summaries = summarizer.batch_extractive_summary(documents, num_sentences)
+    results = [{"index": i, "summary": summary} for i, summary in enumerate(summaries[:len(texts)])]
+    results += [{"case_number": case_num, "summary": summary}
+                for case_num, summary in zip(case_numbers, summaries[len(texts):])]
+    return results
+
+# --- Summary cache ---
+# Uploads are keyed by the SHA-256 of the PDF bytes.  Extracted text is
+# cached under that hash alone and summaries under hash + summarizer
+# parameters, so changing a parameter reuses the text and skips PDF parsing.
+SUMMARY_CACHE_DIR = Path(os.environ.get("SUMMARY_CACHE_DIR", BASE_DIR / ".summary_cache"))
+SUMMARY_CACHE_MEMORY_MB = float(os.environ.get("SUMMARY_CACHE_MEMORY_MB", "64"))
+SUMMARY_CACHE_DISK_MB = float(os.environ.get("SUMMARY_CACHE_DISK_MB", "512"))
+# Bump when the summarizer output changes so stale entries are not served
+SUMMARY_CACHE_VERSION = 2
+
+def content_hash(data):
+    """SHA-256 hex digest of raw bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+class SummaryCache:
+    """Two-level (in-memory LRU + on-disk) cache for PDF text and summaries"""
+    NAMESPACES = ("text", "summary")
+
+    def __init__(self, cache_dir, max_memory_bytes, max_disk_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  # (namespace, key) -> (value, size)
+        self._memory_bytes = 0
+        self._disk_index = None  # path -> size, oldest first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.counters = {f"{namespace}_{event}": 0
+                         for namespace in self.NAMESPACES
+                         for event in ("memory_hits", "disk_hits", "misses")}
+
+    @staticmethod
+    def summary_key(pdf_hash, params):
+        """Cache key for a summary of `pdf_hash` made with `params`"""
+        spec = json.dumps({"pdf": pdf_hash, "params": params, "version": SUMMARY_CACHE_VERSION,
+                           "idf": idf_model_tag()}, sort_keys=True)
+        return content_hash(spec.encode("utf-8"))
+
+    def _path(self, namespace, key):
+        suffix = ".txt" if namespace == "text" else ".json"
+        return self.cache_dir / namespace / key[:2] / f"{key}{suffix}"
+
+    def _load_disk_index(self):
+        if self._disk_index is None:
+            entries = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*/*/*"):
+                    stat = path.stat()
+                    entries.append((stat.st_mtime, path, stat.st_size))
+            entries.sort()
+            self._disk_index = OrderedDict((path, size) for _, path, size in entries)
+            self._disk_bytes = sum(self._disk_index.values())
+        return self._disk_index
+
+    def load_disk_index(self):
+        """Scan the on-disk cache now (at startup) instead of in the first request"""
+        with self._lock:
+            if self.max_disk_bytes > 0:
+                self._load_disk_index()
+
+    def _remember(self, namespace, key, value, size):
+        if size > self.max_memory_bytes:
+            return
+        entry_key = (namespace, key)
+        if entry_key in self._memory:
+            self._memory_bytes -= self._memory.pop(entry_key)[1]
+        self._memory[entry_key] = (value, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def get(self, namespace, key):
+        """Return the cached value or None (text is str, summaries are dicts)"""
+        with self._lock:
+            entry = self._memory.get((namespace, key))
+            if entry is not None:
+                self._memory.move_to_end((namespace, key))
+                self.counters[f"{namespace}_memory_hits"] += 1
+                return copy.deepcopy(entry[0]) if namespace == "summary" else entry[0]
+
+            path = self._path(namespace, key)
+            if self.max_disk_bytes > 0 and path in self._load_disk_index():
+                try:
+                    raw = path.read_text(encoding="utf-8")
+                    os.utime(path)
+                except OSError:
+                    self._disk_bytes -= self._disk_index.pop(path)
+                else:
+                    self._disk_index.move_to_end(path)
+                    value = raw if namespace == "text" else json.loads(raw)
+                    self._remember(namespace, key, value, len(raw))
+                    self.counters[f"{namespace}_disk_hits"] += 1
+                    return copy.deepcopy(value) if namespace == "summary" else value
+
+            self.counters[f"{namespace}_misses"] += 1
+            return None
+
+    def put(self, namespace, key, value):
+        raw = value if namespace == "text" else json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(namespace, key, copy.deepcopy(value) if namespace == "summary" else value,
+                           len(raw))
+            if self.max_disk_bytes <= 0:
+                return
+            index = self._load_disk_index()
+            path = self._path(namespace, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_text(raw, encoding="utf-8")
+            os.replace(temp_path, path)
+            if path in index:
+                self._disk_bytes -= index.pop(path)
+            index[path] = path.stat().st_size
+            self._disk_bytes += index[path]
+            # Size-based eviction, least recently used first
+            while self._disk_bytes > self.max_disk_bytes and len(index) > 1:
+                evicted_path, evicted_size = index.popitem(last=False)
+                self._disk_bytes -= evicted_size
+                try:
+                    evicted_path.unlink()
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats.update({
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk_index) if self._disk_index is not None else None,
+                "disk_bytes": self._disk_bytes if self._disk_index is not None else None,
+            })
+            return stats
+
+summary_cache = SummaryCache(SUMMARY_CACHE_DIR,
+                             max_memory_bytes=int(SUMMARY_CACHE_MEMORY_MB * 1024 * 1024),
+                             max_disk_bytes=int(SUMMARY_CACHE_DISK_MB * 1024 * 1024))
+
+async def extract_pdf_text_async(data, pool):
+    """Extract PDF text on the pool, fanning large documents out by page range"""
+    started = time.perf_counter()
+    max_serial_pages = PDF_PARALLEL_MIN_PAGES - 1 if pool.workers > 1 else None
+    text, extraction = await pool.run(extract_pdf_text, data, "", None, max_serial_pages)
+    if text is not None:
+        return text, extraction
+
+    num_pages = extraction["pages"]
+    page_batches = await asyncio.gather(*(pool.run(extract_page_range, data, start, stop)
+                                          for start, stop in page_ranges(num_pages)))
+    text = join_pdf_pages(page_text for batch in page_batches for page_text in batch)
+    return text, pdf_extraction_stats(num_pages, started, True)
+
+# --- JSON responses ---
+# Summaries are serialized in memory (orjson when installed) and returned
+# directly; nothing is written to disk unless the client passes ?save=true.
+SUMMARY_OUTPUT_DIR = Path(os.environ.get("SUMMARY_OUTPUT_DIR", BASE_DIR / "summaries"))
+API_GZIP_MIN_BYTES = int(os.environ.get("API_GZIP_MIN_BYTES", "1024"))  # 0 disables gzip
+
+try:
+    import orjson
+
+    def dumps_json(obj):
+        """Serialize to compact UTF-8 JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def dumps_json(obj):
+        """Serialize to compact UTF-8 JSON bytes"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+class FastJSONResponse(Response):
+    """JSON response rendered with dumps_json; accepts pre-serialized bytes"""
+    media_type = "application/json"
+
+    def render(self, content):
+        return content if isinstance(content, bytes) else dumps_json(content)
+
+def content_disposition(filename):
+    """Content-Disposition header value for downloading `filename`"""
+    quoted = quote(filename)
+    if quoted == filename:
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename*=utf-8''{quoted}"
+
+def save_summary_json(body, filename):
+    """Write serialized summary bytes under SUMMARY_OUTPUT_DIR with a unique name"""
+    SUMMARY_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", Path(filename).name) or "summary.json"
+    path = SUMMARY_OUTPUT_DIR / f"{uuid.uuid4().hex}_{stem}"
+    path.write_bytes(body)
+    return path
+
+def overloaded_response(pool):
+    """503 returned when the worker pool has no free slots"""
+    return FastJSONResponse(
+        status_code=503,
+        content={"error": f"Server busy: {pool.inflight} summarization jobs already in progress, "
+                          f"please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 app = FastAPI()
 
+@app.on_event("startup")
+def load_idf_model():
+    # Corpus mode: pay the sklearn import and model load before the first request
+    get_idf_model()
+
+@app.on_event("startup")
+def load_summary_cache_index():
+    summary_cache.load_disk_index()
+
+@app.on_event("shutdown")
+def shutdown_worker_pool():
+    worker_pool.shutdown()
+
 from fastapi.middleware.cors import CORSMiddleware
 
 app.add_middleware(
@@ -1776,8 +3890,53 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Content-Disposition", "X-Summary-Cache", "X-Summary-File", "X-PDF-Pages-Per-Sec",
+                    "Server-Timing"],
 )
 
+if API_GZIP_MIN_BYTES > 0:
+    from fastapi.middleware.gzip import GZipMiddleware
+    app.add_middleware(GZipMiddleware, minimum_size=API_GZIP_MIN_BYTES)
+
+class StageTimingMiddleware:
+    """Times every HTTP request: Server-Timing header plus /metrics histograms.
+
+    Added last so it is outermost and the total includes the other
+    middleware (gzip included).
+    """
+    def __init__(self, app):
+        self.app = app
+        self._paths = None
+
+    def path_label(self, path):
+        # Label by route so unknown URLs can't grow the series without bound
+        if self._paths is None:
+            self._paths = {route.path for route in app.routes}
+        return path if path in self._paths else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        timer = StageTimer()
+        token = _stage_timer.set(timer)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - timer.started
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timer.server_timing(total))
+                for name, seconds in timer.stages.items():
+                    pipeline_metrics.observe("court_stage_seconds", name, seconds)
+                pipeline_metrics.observe("court_request_seconds", self.path_label(scope["path"]), total)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _stage_timer.reset(token)
+
+app.add_middleware(StageTimingMiddleware)
+
 
 class TextInput(BaseModel):
     text: str
@@ -1791,54 +3950,350 @@ def summarize_text(input_data: TextInput):
         result = {"error": str(e)}
     return result
 
-@app.post("/summarize_pdf")
-async def summarize_pdf(file: UploadFile = File(...)):
-    import PyPDF2
-    pdf_reader = PyPDF2.PdfReader(file.file)
-    text = ""
-    for page in pdf_reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text += page_text
+class BatchSummaryInput(BaseModel):
+    documents: List[str] = []
+    case_numbers: List[str] = []
+    strategy: str = "semantic"
+    num_sentences: int = 5
+
+# One request holds a worker for the whole batch, so bound what it may ask for
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "256"))
+BATCH_MAX_MB = float(os.environ.get("BATCH_MAX_MB", "32"))
+
+@app.post("/summarize_batch")
+async def summarize_batch(input_data: BatchSummaryInput):
+    if input_data.num_sentences < 1:
+        return FastJSONResponse({"error": "num_sentences must be at least 1"}, status_code=422)
+    if input_data.strategy not in LegalDocumentLoader.STRATEGY_LOCATIONS:
+        return FastJSONResponse({"error": f"strategy must be one of "
+                                          f"{', '.join(LegalDocumentLoader.STRATEGY_LOCATIONS)}"}, status_code=422)
+    if len(input_data.documents) + len(input_data.case_numbers) > BATCH_MAX_ITEMS:
+        return FastJSONResponse({"error": f"at most {BATCH_MAX_ITEMS} documents and case_numbers "
+                                          f"per request"}, status_code=422)
+    document_bytes = sum(len(text.encode("utf-8")) for text in input_data.documents)
+    if document_bytes > BATCH_MAX_MB * 1024 * 1024:
+        return FastJSONResponse({"error": f"documents must total at most {BATCH_MAX_MB:g} MB"},
+                                status_code=422)
+    if not worker_pool.try_acquire():
+        return overloaded_response(worker_pool)
+    try:
+        with stage("summarize_total"):
+            summaries = await worker_pool.run(summarize_batch_documents, input_data.documents,
+                                              input_data.case_numbers, input_data.strategy,
+                                              input_data.num_sentences)
+        pipeline_metrics.count("court_documents_total", len(summaries))
+        pipeline_metrics.count("court_bytes_total", document_bytes)
+        return FastJSONResponse({"num_sentences": input_data.num_sentences, "summaries": summaries})
+    except Exception as e:
+        pipeline_metrics.count("court_errors_total", endpoint="summarize_batch")
+        return FastJSONResponse({"error": str(e)})
+    finally:
+        worker_pool.release()
 
+@app.post("/summarize_pdf")
+async def summarize_pdf(file: UploadFile = File(...), overview_sentences: int = 3,
+                        decision_sentences: int = 2, arguments_sentences: int = 3,
+                        fields: str = "overview,decision", download: bool = False, save: bool = False):
+    counts = {"overview_sentences": overview_sentences, "decision_sentences": decision_sentences,
+              "arguments_sentences": arguments_sentences}
+    for name, value in counts.items():
+        if value < 1:
+            return FastJSONResponse({"error": f"{name} must be at least 1"}, status_code=422)
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    if not selected or set(selected) - set(STRUCTURED_FIELDS):
+        return FastJSONResponse({"error": f"fields must be a comma-separated subset of "
+                                          f"{', '.join(STRUCTURED_FIELDS)}"}, status_code=422)
+    # Only the miss path needs a worker, so a cache hit never takes a pool slot
+    acquired = False
     try:
-        # 👇 Use structured_summarize to build summary
-        structured_summary = structured_summarize(text)
-
-        # 👇 Use your LegalEntityExtractor to get entities
-        extractor = LegalEntityExtractor()
-        entities = extractor.extract(text)
-
-        # 👇 Build JSON result
-        result = {
-            "case_name": file.filename,
-            "judges": entities["judges"],
-            "citations": entities["citations"],
-            "acts": entities["acts"],
-            "sections": entities["sections"],
-            "summary": structured_summary,
-            "timestamp": str(datetime.now())
-        }
+        with stage("read"):
+            data = await file.read()
+        pipeline_metrics.count("court_bytes_total", len(data))
+        params = dict(counts, fields=selected)
+        with stage("hash"):
+            pdf_hash = await asyncio.to_thread(content_hash, data)
+        summary_key = SummaryCache.summary_key(pdf_hash, params)
+        headers = {}
+
+        # Cache lookups and writes touch the disk, so they run off the event loop
+        with stage("cache"):
+            result = await asyncio.to_thread(summary_cache.get, "summary", summary_key)
+        if result is not None:
+            headers["X-Summary-Cache"] = "hit"
+            result["case_name"] = file.filename
+            result["timestamp"] = str(datetime.now())
+        else:
+            if not worker_pool.try_acquire():
+                return overloaded_response(worker_pool)
+            acquired = True
+            with stage("cache"):
+                text = await asyncio.to_thread(summary_cache.get, "text", pdf_hash)
+            if text is not None:
+                headers["X-Summary-Cache"] = "text-hit"
+                extraction = None
+            else:
+                headers["X-Summary-Cache"] = "miss"
+                with stage("pdf_parse"):
+                    text, extraction = await extract_pdf_text_async(data, worker_pool)
+                pipeline_metrics.count("court_pages_total", extraction["pages"])
+                with stage("cache"):
+                    await asyncio.to_thread(summary_cache.put, "text", pdf_hash, text)
+
+            with stage("summarize_total"):
+                result = await worker_pool.run(summarize_document, text, file.filename, params)
+            with stage("cache"):
+                await asyncio.to_thread(summary_cache.put, "summary", summary_key, result)
+            if extraction is not None:
+                result["extraction"] = extraction
+                headers["X-PDF-Pages-Per-Sec"] = str(extraction["pages_per_sec"])
+
+        pipeline_metrics.count("court_documents_total")
+        with stage("serialize"):
+            body = dumps_json(result)
+        summary_filename = f"{file.filename}_summary.json"
+        if save:
+            # ✅ Only persist when asked to, under a unique name
+            saved_path = await asyncio.to_thread(save_summary_json, body, summary_filename)
+            headers["X-Summary-File"] = saved_path.name  # not the server path
+        if download:
+            headers["Content-Disposition"] = content_disposition(summary_filename)
+
+        # ✅ Return the JSON straight from memory
+        return FastJSONResponse(body, headers=headers)
 
-        # ✅ Save JSON to a temporary file
-        temp_path = os.path.join(tempfile.gettempdir(), f"{file.filename}_summary.json")
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=4, ensure_ascii=False)
+    except Exception as e:
+        pipeline_metrics.count("court_errors_total", endpoint="summarize_pdf")
+        return FastJSONResponse({"error": str(e)})
+    finally:
+        if acquired:
+            worker_pool.release()
 
-        # ✅ Return it as downloadable file
-        return FileResponse(
-            path=temp_path,
-            filename=f"{file.filename}_summary.json",
-            media_type="application/json"
-        )
 
-    except Exception as e:
-        return {"error": str(e)}
+@app.get("/cache_stats")
+def cache_stats():
+    return summary_cache.stats()
+
+
+@app.get("/metrics")
+def metrics():
+    return Response(pipeline_metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.get("/health")
 def health_check():
-    return {"status": "API is running"}
+    return {"status": "API is running", "worker_pool": worker_pool.stats()}
+
+# --- Resumable corpus runs ---
+# `python app_final5.py analyze --output DIR` appends one analysis record per
+# case to DIR/results.jsonl and then logs the outcome to DIR/manifest.jsonl,
+# keyed by a hash of the case's inputs (computed in the worker) and of the run
+# parameters.  A re-run only dispatches cases that are new, changed, or failed
+# fewer than --max-attempts times, so a crash or a batch of new judgments
+# costs just the missing work.  Unchanged cases are recognised by their input
+# files' backend signatures; only cases whose signature moved are re-hashed.
+# Later lines win, in both files.
+RUN_FSYNC_EVERY = int(os.environ.get("RUN_FSYNC_EVERY", "100"))
+RUN_PROGRESS_SECONDS = float(os.environ.get("RUN_PROGRESS_SECONDS", "5"))
+
+def case_input_hash(case_number, chunking_strategy="semantic", corpus_loader=None):
+    """Digest of everything analyze_case() reads for a case"""
+    corpus_loader = corpus_loader or loader
+    digest = hashlib.blake2b(digest_size=16)
+    parts = [corpus_loader.load_metadata(case_number) or ""]
+    parts += corpus_loader.load_chunked_text(chunking_strategy, case_number) or []
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def case_input_signature(case_number, chunking_strategy="semantic", corpus_loader=None):
+    """Backend signatures (stat, for files) of the inputs case_input_hash() digests"""
+    backend = (corpus_loader or loader).backend
+    return [None if signature is None else list(signature)
+            for signature in (backend.signature("metadata", case_number),
+                              backend.signature(chunking_strategy, case_number))]
+
+def analyze_case_run_record(case_number, chunking_strategy="semantic", summary_length=3, corpus_loader=None):
+    """(analyze_case_record(), case_input_hash()) for run_corpus_analysis (batch worker task)"""
+    record = analyze_case_record(case_number, chunking_strategy, summary_length, corpus_loader=corpus_loader)
+    return record, case_input_hash(case_number, chunking_strategy, corpus_loader)
+
+def _append_jsonl(path):
+    """Open a JSONL file for appending, terminating a line torn by a crash"""
+    f = open(path, "ab")
+    if f.tell():
+        with open(path, "rb") as existing:
+            existing.seek(-1, os.SEEK_END)
+            if existing.read(1) != b"\n":
+                f.write(b"\n")
+    return f
+
+class RunManifest:
+    """Append-only log of per-case outcomes for a resumable corpus run"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn by a crash mid-write
+                    self.entries[entry["case"]] = entry
+        self._file = None
+        self._unsynced = 0
+
+    def previous(self, case_number, signature, params_hash, input_hash=None):
+        """The last entry for this case if it was made from the same inputs and parameters.
+
+        Inputs match when their signature is unchanged, or else (with
+        `input_hash`) when their content hash is.
+        """
+        entry = self.entries.get(case_number)
+        if not entry or entry["params"] != params_hash:
+            return None
+        if entry.get("signature") == signature or (input_hash is not None and entry["input"] == input_hash):
+            return entry
+        return None
+
+    def record(self, entry):
+        if self._file is None:
+            self._file = _append_jsonl(self.path)
+        self._file.write(dumps_json(entry) + b"\n")
+        self._file.flush()
+        self.entries[entry["case"]] = entry
+        self._unsynced += 1
+        if self._unsynced >= RUN_FSYNC_EVERY:
+            self.sync()
+
+    def sync(self):
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+def run_corpus_analysis(output_dir, case_numbers=None, chunking_strategy="semantic", summary_length=3,
+                        workers=BATCH_WORKERS, chunksize=BATCH_CHUNKSIZE, max_attempts=3,
+                        base_dir=None, progress=None):
+    """Resumable batch_analysis() into `output_dir`; returns run counters"""
+    from functools import partial
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    corpus_loader = loader if base_dir is None else LegalDocumentLoader(base_dir, backend=CORPUS_BACKEND)
+    if case_numbers is None:
+        case_numbers = corpus_loader.get_available_cases(chunking_strategy)
+    params_hash = content_hash(json.dumps(
+        {"strategy": chunking_strategy, "summary_length": summary_length,
+         "version": SUMMARY_CACHE_VERSION, "idf": idf_model_tag()}, sort_keys=True).encode("utf-8"))[:32]
+
+    manifest = RunManifest(output_dir / "manifest.jsonl")
+    counters = {"total": len(case_numbers), "skipped": 0, "done": 0, "retried": 0, "gave_up": 0}
+    pending = {}  # case -> (input signature, attempts so far)
+    for case_num in case_numbers:
+        # Signatures are taken before the worker reads the inputs, so an edit
+        # made mid-run shows up as a changed signature on the next run
+        signature = case_input_signature(case_num, chunking_strategy, corpus_loader)
+        entry = manifest.previous(case_num, signature, params_hash)
+        if entry is None and case_num in manifest.entries:
+            # Touched (or copied) but maybe not edited: only now read and hash it
+            entry = manifest.previous(case_num, signature, params_hash,
+                                      case_input_hash(case_num, chunking_strategy, corpus_loader))
+            if entry is not None:
+                entry = dict(entry, signature=signature)
+                manifest.record(entry)  # so the next run matches it without hashing
+        if entry and entry["status"] == "done":
+            counters["skipped"] += 1
+        elif entry and entry["attempts"] >= max_attempts:
+            counters["gave_up"] += 1
+        else:
+            pending[case_num] = (signature, entry["attempts"] if entry else 0)
+
+    to_run = len(pending)
+    started = last_report = time.perf_counter()
+    finished = 0
+    results = _append_jsonl(output_dir / "results.jsonl")
+    try:
+        while pending:
+            retry = {}
+            task = partial(analyze_case_run_record, chunking_strategy=chunking_strategy,
+                           summary_length=summary_length)
+            for record, input_hash in iter_case_pool(task, list(pending), workers, chunksize, base_dir):
+                case_num = record["case_number"]
+                signature, attempts = pending[case_num]
+                attempts += 1
+                entry = {"case": case_num, "input": input_hash, "signature": signature,
+                         "params": params_hash, "attempts": attempts}
+                if "error" in record:
+                    entry.update(status="failed", error=record["error"])
+                    if attempts < max_attempts:
+                        retry[case_num] = (signature, attempts)
+                    else:
+                        counters["gave_up"] += 1
+                        finished += 1
+                else:
+                    results.write(dumps_json(record) + b"\n")
+                    results.flush()
+                    entry["status"] = "done"
+                    counters["done"] += 1
+                    finished += 1
+                manifest.record(entry)
+
+                now = time.perf_counter()
+                if progress is not None and now - last_report >= RUN_PROGRESS_SECONDS:
+                    last_report = now
+                    rate = finished / (now - started)
+                    eta = (to_run - finished) / rate if rate else float("inf")
+                    print(f"[{counters['skipped'] + finished}/{counters['total']}] "
+                          f"{(counters['skipped'] + finished) / counters['total']:.1%} complete, "
+                          f"{rate:.1f} cases/s, ETA {eta:.0f}s, {counters['gave_up']} gave up",
+                          file=progress, flush=True)
+            counters["retried"] += len(retry)
+            pending = retry
+    finally:
+        os.fsync(results.fileno())
+        results.close()
+        manifest.close()
+    counters["seconds"] = time.perf_counter() - started
+    return counters
+
+def cli(argv=None):
+    """Command line: serve the API (default) or run a resumable corpus analysis"""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Court judgment summarizer")
+    commands = parser.add_subparsers(dest="command")
+    serve = commands.add_parser("serve", help="run the API server (default)")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=8000)
+    analyze = commands.add_parser("analyze", help="resumable analysis of every corpus case")
+    analyze.add_argument("--output", type=Path, required=True, help="directory for results and manifest")
+    analyze.add_argument("--corpus", type=Path, default=None, help="corpus directory (default: current)")
+    analyze.add_argument("--cases", nargs="+", default=None, help="case numbers (default: all)")
+    analyze.add_argument("--strategy", default="semantic", choices=("semantic", "tokenwise", "recursive"))
+    analyze.add_argument("--summary-length", type=int, default=3)
+    analyze.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    analyze.add_argument("--chunksize", type=int, default=BATCH_CHUNKSIZE)
+    analyze.add_argument("--max-attempts", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "analyze":
+        counters = run_corpus_analysis(args.output, args.cases, args.strategy, args.summary_length,
+                                       workers=args.workers, chunksize=args.chunksize,
+                                       max_attempts=args.max_attempts, base_dir=args.corpus,
+                                       progress=sys.stderr)
+        print(json.dumps(counters))
+        return 1 if counters["gave_up"] else 0
+    uvicorn.run(app, host=getattr(args, "host", "0.0.0.0"), port=getattr(args, "port", 8000))
+    return 0
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    raise SystemExit(cli())
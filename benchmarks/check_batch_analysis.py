@@ -0,0 +1,96 @@
+"""Equivalence, throughput and memory check for the parallel batch analysis.
+
+Runs ``batch_analysis`` over the --corpus cases (repeated --scale times)
+with one worker and with --workers, checks every JSONL record matches
+``analyze_case`` run in-process, and reports cases/s.  The parent's traced
+peak allocation is compared between one and --scale passes over the cases:
+records are streamed to disk, so it must not grow with the number of cases.
+Exits non-zero on a mismatch, a missing record or growing parent memory.
+
+    python benchmarks/check_batch_analysis.py [--corpus DIR] [--workers N] [--scale 4]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import app_final5  # noqa: E402
+
+
+def run(case_numbers, corpus_dir, workers, chunksize, filename):
+    gc.collect()  # start every run with no garbage left over from the last one
+    tracemalloc.start()
+    started = time.perf_counter()
+    report = app_final5.batch_analysis(case_numbers, filename=filename, workers=workers,
+                                       chunksize=chunksize, base_dir=corpus_dir)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return report, elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=app_final5.BATCH_CHUNKSIZE)
+    parser.add_argument('--scale', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    corpus_loader = app_final5.LegalDocumentLoader(args.corpus)
+    cases = corpus_loader.get_available_cases('semantic')
+    if not cases:
+        print(f"FAIL: no cases found under {args.corpus}")
+        return 1
+
+    failed = False
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_dir = Path(out_dir)
+        # Warm-up: module imports in the parent are not per-case memory
+        app_final5.batch_analysis(cases[:1], filename=out_dir / 'warm.jsonl', workers=1,
+                                  base_dir=args.corpus)
+        _, _, small_peak = run(cases, args.corpus, 1, args.chunksize, out_dir / 'small.jsonl')
+        _, serial_seconds, _ = run(cases * args.scale, args.corpus, 1, args.chunksize, out_dir / 'serial.jsonl')
+        report, parallel_seconds, large_peak = run(cases * args.scale, args.corpus, args.workers,
+                                                   args.chunksize, out_dir / 'parallel.jsonl')
+        total = len(cases) * args.scale
+        print(f"throughput: 1 worker {total / serial_seconds:.1f} cases/s, {args.workers} workers "
+              f"{total / parallel_seconds:.1f} cases/s ({serial_seconds / parallel_seconds:.1f}x, "
+              f"{os.cpu_count()} CPUs)")
+        print(f"parent peak allocation: {small_peak / 1e6:.2f} MB for {len(cases)} cases, "
+              f"{large_peak / 1e6:.2f} MB for {total}")
+
+        app_final5.loader = corpus_loader
+        expected = {}
+        for case_num in cases:
+            result = app_final5.analyze_case(case_num, summary_length=3, visualize=False)
+            record = {'case_number': case_num}
+            record.update((field, result[field]) for field in app_final5.ANALYSIS_FIELDS)
+            expected[case_num] = json.loads(app_final5.dumps_json(record))
+        with open(out_dir / 'parallel.jsonl', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+
+    mismatches = [r['case_number'] for r in records if r != expected[r['case_number']]]
+    print(f"equivalence: {len(records) - len(mismatches)}/{total} records match analyze_case")
+    if len(records) != total or report['cases_analyzed'] != total:
+        print(f"FAIL: expected {total} records, got {len(records)}")
+        failed = True
+    if mismatches:
+        print(f"FAIL: cases {sorted(set(mismatches))[:10]} differ")
+        failed = True
+    if large_peak > 2 * small_peak + 1e6:
+        print("FAIL: parent memory grows with the number of cases")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Equivalence and throughput check for batched extractive summarization.
+
+Summarizes the same documents with ``LegalSummarizer.extractive_summary``
+one at a time and with ``batch_extractive_summary`` in one call, checks the
+summaries are identical, and reports docs/sec for both.  Documents are the
+corpus chunk files under --corpus plus generated ones (duplicate sentences,
+stop-word-only sentences, vocabularies above max_features).  Exits non-zero
+on any mismatch or if the batch path is not faster.  The batch path mirrors
+scikit-learn internals, so run this after every scikit-learn upgrade: it
+checks the installed release even when it is not yet listed in
+BATCH_SUMMARY_SKLEARN_VERSIONS, and fails until it is.
+
+    python benchmarks/check_batch_summary.py [--corpus DIR] [--synthetic 300]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import app_final5  # noqa: E402
+
+WORDS = ('appeal petition order court held section act evidence witness accused trial judgment '
+         'respondent appellant high tribunal dismissed allowed contract property tax revenue '
+         'constitution article right fundamental writ notice hearing bail custody sentence').split()
+
+
+def corpus_documents(corpus_dir):
+    corpus_loader = app_final5.LegalDocumentLoader(corpus_dir)
+    documents = []
+    for kind in ('semantic', 'tokenwise', 'recursive'):
+        for case_num in corpus_loader.get_available_cases(kind):
+            chunks = corpus_loader.load_chunked_text(kind, case_num)
+            if chunks:
+                documents.append(app_final5.ParsedDocument.from_chunks(chunks))
+    return documents
+
+
+def synthetic_documents(count, seed):
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        # Numbered variants give vocabularies above max_features
+        vocabulary = [f'{rng.choice(WORDS)}{rng.randrange(rng.choice([5, 50, 2000]))}' for _ in range(400)]
+        sentences = []
+        for _ in range(rng.randint(1, 80)):
+            roll = rng.random()
+            if roll < 0.1 and sentences:
+                sentences.append(rng.choice(sentences))
+            elif roll < 0.15:
+                sentences.append('It is the and of to.')
+            else:
+                words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 25))]
+                sentences.append(' '.join(words).capitalize() + '.')
+        documents.append(app_final5.ParsedDocument(' '.join(sentences)))
+    return documents
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--synthetic', type=int, default=300)
+    parser.add_argument('--num-sentences', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import sklearn
+    verified = app_final5.batch_summary_verified()
+    print(f"scikit-learn: {sklearn.__version__} "
+          f"({'listed' if verified else 'not listed'} in BATCH_SUMMARY_SKLEARN_VERSIONS)")
+    if not verified:
+        # Check the batch path itself, not the per-document fallback
+        release = '.'.join(sklearn.__version__.split('.')[:2])
+        app_final5.BATCH_SUMMARY_SKLEARN_VERSIONS += (release,)
+
+    documents = corpus_documents(args.corpus) + synthetic_documents(args.synthetic, args.seed)
+    for document in documents:
+        app_final5.sentence_index.attach(document).sentence_spans  # keep punkt out of the timings
+    summarizer = app_final5.LegalSummarizer()
+
+    started = time.perf_counter()
+    expected = [summarizer.extractive_summary(document, args.num_sentences) for document in documents]
+    loop_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = summarizer.batch_extractive_summary(documents, args.num_sentences)
+    batch_seconds = time.perf_counter() - started
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, actual)) if a != b]
+    print(f"equivalence: {len(documents) - len(mismatches)}/{len(documents)} summaries match")
+    print(f"throughput: per-document {len(documents) / loop_seconds:.1f} docs/s, "
+          f"batch {len(documents) / batch_seconds:.1f} docs/s ({loop_seconds / batch_seconds:.1f}x)")
+    failed = False
+    if mismatches:
+        print(f"FAIL: documents {mismatches[:10]} differ")
+        failed = True
+    if batch_seconds >= loop_seconds:
+        print("FAIL: batch summarization is not faster than the per-document loop")
+        failed = True
+    if not verified:
+        print(f"FAIL: add '{release}' to BATCH_SUMMARY_SKLEARN_VERSIONS once the summaries match")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Equivalence and throughput check for the single-pass legal entity scanner.
+
+Compares ``LegalEntityScanner`` (and the linear case-citation pattern)
+against the original per-pattern ``re.findall`` loops on the corpus
+judgments, hand-written edge cases and randomly generated keyword soup,
+checks the anchored party/judge header scans against the original
+regexes on synthetic judgments (benchmarks/synthetic.py), edge cases and
+header fuzz, then reports MB/s for both and times header extraction on
+pathological all-caps text.  Exits non-zero on any mismatch or a blown
+time budget.
+
+    python benchmarks/check_entities.py [--corpus DIR] [--synthetic 500] [--fuzz 2000] [--seed 0]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import app_final5  # noqa: E402
+import synthetic  # noqa: E402
+
+# The patterns exactly as LegalEntityExtractor and TextAnalyzer ran them
+REFERENCE = {
+    'acts': [(r'(\w+\s+Act,?\s+\d{4})', re.IGNORECASE), (r'(Indian\s+\w+\s+Act)', re.IGNORECASE),
+             (r'(Code\s+of\s+\w+\s+Procedure)', re.IGNORECASE)],
+    'sections': [(r'Section\s+\d+[A-Z]?', re.IGNORECASE), (r'Article\s+\d+[A-Z]?', re.IGNORECASE),
+                 (r'Rule\s+\d+[A-Z]?', re.IGNORECASE)],
+    'citations': [(r'AIR\s+\d{4}\s+SC\s+\d+', 0), (r'\d{4}\s+SCR\s*\([^\)]*\)\s*\d+', 0)],
+    'judges': [(r'Justice\s+[A-Z][a-zA-Z]+', 0), (r'Hon.?ble\s+Mr.?\s+Justice\s+[A-Z][a-zA-Z]+', 0)],
+    'analyzer_acts': [(r'([A-Z][a-z\s]+Act,?\s*\d{4})', 0)],
+    'analyzer_sections': [(r'Section\s+(\d+[A-Za-z]?(?:\(\d+\))?)', 0)],
+}
+CASE_CITATION = r'([A-Z\s]+v\.?\s+[A-Z\s]+(?:\(\d{4}\)\s*\d+\s*[A-Z]+\s*\d+)?)'
+# extract_basic_info's party and judge patterns before the anchored scans
+PARTIES = r'([A-Z\s\.\,]+)\s*…?\s*APPELLANT\s+VERSUS\s+([A-Z\s\.\,]+)\s*…?\s*RESPONDENT'
+JUDGE = r'J U D G M E N T\s+([A-Z\s\.\,]+),?\s*J\.'
+# All-caps text that made the old party/citation patterns backtrack for seconds
+PATHOLOGICAL = 'THE COURT HELD THAT THE ORDER, AS PASSED, IS BAD IN LAW AND SET ASIDE. ' * 15000
+
+EDGE_CASES = [
+    '',
+    'Act Act 1950 and the Companies Act, 1956',
+    'Foo Act 1950Bar Act 1960',
+    'x act act 1950 contract 1999 the   Evidence\tAct\n1872',
+    'Indian Penal Act; indian  evidence act; Code of Criminal Procedure; code  of civil procedure',
+    'Section 302, section 34A, SECTION 5b, Subsection 7, Section 12(3), Article 21, Rule 4A',
+    'AIR 1973 SC 1461 and AIR1973 SC 1; 1950 SCR (1) 88 and 1950SCR(2)3, 12345 SCR (x) 9',
+    '1950 SCR ( unclosed paren and no digits',
+    "Justice Bhagwati, Hon'ble Mr. Justice Krishna, Honble Mr Justice Iyer, natural Justice Ray",
+    'airule sectionatural justice fairule the writ petition of habeas corpus, Due Process',
+    'ſection 5 and the Kerala act 1950; jurİsdiction, JURISDICTION',
+]
+
+HEADER_EDGE_CASES = [
+    'RAMAN KUMAR …APPELLANT VERSUS STATE OF KERALA …RESPONDENT\n\nJ U D G M E N T SHARMA, J.',
+    'RAMAN KUMAR APPELLANT VERSUS STATE OF KERALA RESPONDENT J U D G M E N T SHARMA J.',
+    'A. B. C, …APPELLANT  VERSUS\nX …RESPONDENT RESPONDENT, and RESPONDENT',
+    'APPELLANT VERSUS STATE …RESPONDENT',
+    'Mr. Kumar …APPELLANT VERSUS STATE …RESPONDENT',
+    'X …APPELLANT VERSUS Y …APPELLANT VERSUS Z …RESPONDENT',
+    'X …APPELLANT VERSUS y …RESPONDENT; P …APPELLANT VERSUS Q …RESPONDENT',
+    'J U D G M E N T S.K. IYER, J. AND R. NARIMAN, J.',
+    'J U D G M E N TSHARMA, J.',
+    'J U D G M E N T Sharma, J. J U D G M E N T VERMA, J.',
+    'J U D G M E N T ,J.',
+    'J U D G M E N T  J.J.',
+]
+
+HEADER_FRAGMENTS = ['APPELLANT', 'VERSUS', 'RESPONDENT', '…', ' …', 'J U D G M E N T', 'J.', ', J.', 'J',
+                    'STATE OF KERALA', 'KUMAR', 'A', 'x', '.', ',', ' ', '  ', '\n', 'v.', 'Mr', '1950']
+# A well-formed header, piece by piece; fuzzing drops or replaces pieces
+HEADER_TEMPLATE = ['RAMAN KUMAR', ' …', 'APPELLANT', ' ', 'VERSUS', ' ', 'STATE OF KERALA', ' …', 'RESPONDENT',
+                   '\n\n', 'J U D G M E N T', ' ', 'S.K. SHARMA', ',', ' ', 'J.']
+
+FRAGMENTS = ['Act', 'act', 'ACT', ' ', '  ', '\n', ',', '1950', '19', '5', 'A', 'b', 'Indian', 'Code',
+             'of', 'Procedure', 'Section', 'section', 'Article', 'Rule', 'AIR', 'SC', 'SCR', '(', ')',
+             'Justice', 'Hon', "'", 'ble', 'Mr', '.', 'Smith', 'natural justice', 'appeal', 'writ',
+             'petition', 'due process', 'air', 'rule', 'x', 'Evidence', 'the', '_', '(3)', 'v', 'v.',
+             'STATE', '(1955)',
+             # Characters IGNORECASE and str.lower() treat differently, plus other non-ASCII
+             '\u017f', '\u0130', '\u0131', '\u212a', '\u2014', '\u00e9', '\u0661']
+
+
+def reference_scan(text):
+    found = {field: set() for field in REFERENCE}
+    for field, patterns in REFERENCE.items():
+        for pattern, flags in patterns:
+            found[field].update(re.findall(pattern, text, flags))
+    text_lower = text.lower()
+    found['legal_terms'] = [term for term in app_final5.LegalEntityScanner.LEGAL_TERMS if term in text_lower]
+    found['case_citations'] = [c.strip() for c in re.findall(CASE_CITATION, text) if len(c.strip()) > 10][:10]
+    return found
+
+
+def reference_header(text):
+    header = text[:app_final5.BASIC_INFO_HEADER_CHARS]
+    parties = re.search(PARTIES, header)
+    judge = re.search(JUDGE, header)
+    return (parties and (parties.group(1).strip(), parties.group(2).strip()),
+            judge and judge.group(1).strip())
+
+
+def scanner_header(text):
+    header = text[:app_final5.BASIC_INFO_HEADER_CHARS]
+    return app_final5.TextAnalyzer._header_parties(header), app_final5.TextAnalyzer._header_judge(header)
+
+
+def scanner_scan(text):
+    found = app_final5.entity_scanner.scan(text)
+    found['case_citations'] = app_final5.analyzer.extract_legal_entities(text)['case_citations']
+    return found
+
+
+def corpus_texts(corpus_dir):
+    texts = []
+    for pattern in ('Original-Judgements/*.txt', 'Semantic/*.txt', 'TokenWise/*.txt', 'Recursive/*.txt'):
+        texts.extend(path.read_text(encoding='utf-8', errors='replace')
+                     for path in sorted(corpus_dir.glob(pattern)))
+    return texts
+
+
+def fuzz_texts(count, seed):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 60))) for _ in range(count)]
+
+
+def header_fuzz_texts(count, seed):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        pieces = []
+        for piece in HEADER_TEMPLATE:
+            roll = rng.random()
+            if roll < 0.1:
+                continue
+            if roll < 0.25:
+                piece = ''.join(rng.choice(HEADER_FRAGMENTS) for _ in range(rng.randint(1, 4)))
+            pieces.append(piece)
+        if rng.random() < 0.3:
+            pieces *= 2
+        texts.append(''.join(pieces))
+    return texts
+
+
+def throughput(scan, texts, repeat):
+    size = sum(len(text.encode('utf-8')) for text in texts) * repeat
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            scan(text)
+    return size / (time.perf_counter() - started) / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--synthetic', type=int, default=500, help='synthetic judgments for the header check')
+    parser.add_argument('--fuzz', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    corpus = corpus_texts(args.corpus)
+    cases = EDGE_CASES + corpus + fuzz_texts(args.fuzz, args.seed)
+    mismatches = 0
+    for text in cases:
+        expected, actual = reference_scan(text), scanner_scan(text)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH on {text[:80]!r}:")
+                for field in expected:
+                    if expected[field] != actual[field]:
+                        print(f"  {field}: expected {expected[field]!r}, got {actual[field]!r}")
+    print(f"equivalence: {len(cases) - mismatches}/{len(cases)} texts match "
+          f"({len(corpus)} corpus, {len(EDGE_CASES)} edge cases, {args.fuzz} fuzz)")
+
+    headers = (synthetic.documents(args.synthetic, args.seed, paragraphs=1) + HEADER_EDGE_CASES
+               + header_fuzz_texts(args.fuzz, args.seed))
+    header_mismatches = 0
+    for text in headers:
+        expected, actual = reference_header(text), scanner_header(text)
+        if expected != actual:
+            header_mismatches += 1
+            if header_mismatches <= 5:
+                print(f"MISMATCH on header {text[:80]!r}: expected {expected!r}, got {actual!r}")
+    print(f"header equivalence: {len(headers) - header_mismatches}/{len(headers)} headers match "
+          f"({args.synthetic} synthetic, {len(HEADER_EDGE_CASES)} edge cases, {args.fuzz} fuzz)")
+
+    if corpus:
+        before = throughput(reference_scan, corpus, args.repeat)
+        after = throughput(app_final5.entity_scanner.scan, corpus, args.repeat)
+        print(f"throughput: per-pattern findall {before:.1f} MB/s, single-pass scanner {after:.1f} MB/s "
+              f"({after / before:.1f}x)")
+
+    started = time.perf_counter()
+    app_final5.analyzer.extract_basic_info(PATHOLOGICAL)
+    app_final5.analyzer.extract_legal_entities(PATHOLOGICAL)
+    elapsed = time.perf_counter() - started
+    print(f"header/citation extraction on {len(PATHOLOGICAL) / 1e6:.1f} MB of all-caps text: {elapsed:.3f}s")
+
+    failed = False
+    if mismatches:
+        print(f"FAIL: {mismatches} texts differ from the per-pattern extraction")
+        failed = True
+    if header_mismatches:
+        print(f"FAIL: {header_mismatches} headers differ from the party/judge regexes")
+        failed = True
+    if elapsed > app_final5.EXTRACTION_TIME_BUDGET:
+        print(f"FAIL: extraction exceeded the {app_final5.EXTRACTION_TIME_BUDGET:.1f}s per-document budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
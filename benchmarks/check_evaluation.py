@@ -0,0 +1,100 @@
+"""Equivalence and throughput check for the corpus evaluation engine.
+
+Computes per-strategy mean ROUGE/BLEU against the semantic summaries the
+original way (every summary recomputed, one case at a time) and with
+``evaluate_corpus`` on a cold and then a warm summary memo, checks the means
+agree, and reports cases/s for each.  Exits non-zero on a mismatch or if the
+engine is not faster than the original loop.
+
+    python benchmarks/check_evaluation.py [--corpus DIR] [--workers N] [--scale 2]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import app_final5  # noqa: E402
+
+METRICS = ('rouge1', 'rouge2', 'rougeL', 'bleu')
+
+
+def reference_evaluation(corpus_loader, case_numbers):
+    totals = {}
+    for case_num in case_numbers:
+        summaries = {}
+        for strategy in app_final5.EVAL_STRATEGIES:
+            chunks = corpus_loader.load_chunked_text(strategy, case_num)
+            if chunks:
+                summaries[strategy] = app_final5.summarizer.extractive_summary(chunks, 5)
+        if 'semantic' not in summaries:
+            continue
+        for strategy, summary in summaries.items():
+            if strategy == 'semantic':
+                continue
+            # What comprehensive_evaluation computed per (case, strategy) pair
+            scores = app_final5.enhanced_evaluator.comprehensive_evaluation(
+                app_final5.summarizer.extractive_summary(
+                    corpus_loader.load_chunked_text('semantic', case_num), 5), summary)
+            sums, count = totals.setdefault(strategy, ({metric: 0.0 for metric in METRICS}, [0]))
+            for metric in METRICS:
+                sums[metric] += scores[metric]
+            count[0] += 1
+    return {strategy: {metric: sums[metric] / count[0] for metric in METRICS}
+            for strategy, (sums, count) in totals.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--scale', type=int, default=2, help='evaluate each case this many times')
+    args = parser.parse_args(argv)
+
+    corpus_loader = app_final5.LegalDocumentLoader(args.corpus)
+    cases = corpus_loader.get_available_cases('semantic') * args.scale
+    if not cases:
+        print(f"FAIL: no cases found under {args.corpus}")
+        return 1
+    app_final5.loader = corpus_loader
+    # Keep one-off imports out of the timings; memory only, so the default EVAL_MEMO_DIR is untouched
+    app_final5.SummaryMemo(None).summary(cases[0], 'semantic')
+
+    started = time.perf_counter()
+    expected = reference_evaluation(corpus_loader, cases)
+    reference_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as memo_dir:
+        os.environ['EVAL_MEMO_DIR'] = memo_dir  # for spawned workers, which build their own memo
+        app_final5.summary_memo = app_final5.SummaryMemo(memo_dir)
+        timings = []
+        for _ in ('cold', 'warm'):
+            started = time.perf_counter()
+            report = app_final5.evaluate_corpus(cases, workers=args.workers, base_dir=args.corpus)
+            timings.append(time.perf_counter() - started)
+            app_final5.summary_memo = app_final5.SummaryMemo(memo_dir)  # warm run: disk memo only
+
+    mismatches = [(strategy, metric) for strategy in expected for metric in METRICS
+                  if abs(expected[strategy][metric] - report['averages'][strategy][metric]) > 1e-9]
+    print(f"equivalence: {'means match' if not mismatches else f'{len(mismatches)} means differ'} "
+          f"over {report['cases']} cases")
+    print(f"throughput: original {len(cases) / reference_seconds:.1f} cases/s, engine cold memo "
+          f"{len(cases) / timings[0]:.1f} cases/s, warm memo {len(cases) / timings[1]:.1f} cases/s "
+          f"({args.workers} workers, {os.cpu_count()} CPUs)")
+
+    failed = False
+    if mismatches or report['cases'] != len(cases):
+        print(f"FAIL: evaluation differs from the original: {mismatches[:5]}")
+        failed = True
+    if timings[0] >= reference_seconds:
+        print("FAIL: the evaluation engine is not faster than the original loop")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
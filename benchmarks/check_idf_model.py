@@ -0,0 +1,91 @@
+"""Per-document TF-IDF fit versus the pre-fitted corpus IDF model.
+
+Builds the corpus IDF model over --corpus into a temporary directory, then
+summarizes every corpus case with ``extractive_summary`` and
+``simple_summarize`` in document mode (fit per call) and in corpus mode
+(transform only), reporting median latency, peak allocation and how many
+summaries pick the same sentences.  Exits non-zero if corpus mode is not
+faster.
+
+    python benchmarks/check_idf_model.py [--corpus DIR] [--repeat 3]
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import app_final5  # noqa: E402
+
+
+def measure(summarize, documents, repeat):
+    """Median per-call seconds, peak traced bytes and the summaries"""
+    timings = []
+    for _ in range(repeat):
+        for document in documents:
+            started = time.perf_counter()
+            summarize(document)
+            timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    summaries = [summarize(document) for document in documents]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak, summaries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--num-sentences', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    corpus_loader = app_final5.LegalDocumentLoader(args.corpus)
+    documents = list(app_final5._corpus_documents(corpus_loader))
+    if not documents:
+        print(f"FAIL: no judgments found under {args.corpus}")
+        return 1
+    for document in documents:
+        document.sentence_spans  # keep punkt out of the timings
+    texts = [document.text for document in documents]
+    summarizer = app_final5.LegalSummarizer()
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        started = time.perf_counter()
+        stats = app_final5.build_idf_model(model_dir, corpus_loader)
+        print(f"build: {stats['documents']} documents, {stats['sentences']} sentences, "
+              f"{stats['features']} features in {time.perf_counter() - started:.2f}s")
+
+        runs = {}
+        for mode in ('document', 'corpus'):
+            app_final5.SENTENCE_IDF_MODE, app_final5.IDF_MODEL_DIR = mode, Path(model_dir)
+            app_final5._idf_model, app_final5._idf_model_loaded = None, False
+            app_final5.get_idf_model()  # loaded at startup in corpus mode
+            runs[mode] = {
+                'extractive_summary': measure(
+                    lambda d: summarizer.extractive_summary(d, args.num_sentences), documents, args.repeat),
+                'simple_summarize': measure(
+                    lambda t: app_final5.simple_summarize(t, args.num_sentences), texts, args.repeat),
+            }
+
+    failed = False
+    for name in ('extractive_summary', 'simple_summarize'):
+        fit_seconds, fit_peak, fit_summaries = runs['document'][name]
+        model_seconds, model_peak, model_summaries = runs['corpus'][name]
+        same = sum(a == b for a, b in zip(fit_summaries, model_summaries))
+        print(f"{name}: per-document fit {fit_seconds * 1e3:.2f} ms, {fit_peak / 1e6:.1f} MB peak; "
+              f"corpus model {model_seconds * 1e3:.2f} ms, {model_peak / 1e6:.1f} MB peak "
+              f"({fit_seconds / model_seconds:.1f}x); same summary for {same}/{len(documents)}")
+        if model_seconds >= fit_seconds:
+            print(f"FAIL: {name} is not faster with the corpus model")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
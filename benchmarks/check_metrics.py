@@ -0,0 +1,156 @@
+"""Consistency and overhead check for stage timers, /metrics and Server-Timing.
+
+Posts --requests synthetic PDFs (benchmarks/synthetic.py) plus one corrupt
+upload to /summarize_pdf through FastAPI's TestClient with the summary cache
+disabled, then checks that:
+
+- every response carries a Server-Timing header;
+- a summarized PDF reports every pipeline stage, including the ones timed
+  in the worker process (sent_tokenize, tfidf, entities), and the stages
+  other than *_total add up to no more than the request total;
+- /metrics agrees with what was sent (documents, pages, bytes, errors,
+  per-stage and per-path histogram counts);
+- the histogram buckets are cumulative, and the output parses with
+  prometheus_client when that is installed.
+
+It also reports what `with stage(...)` costs.  Exits non-zero on any
+inconsistency.
+
+    python benchmarks/check_metrics.py [--requests 5]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ['SUMMARY_CACHE_DISK_MB'] = '0'
+os.environ['SUMMARY_CACHE_MEMORY_MB'] = '0'
+
+import app_final5  # noqa: E402
+import synthetic  # noqa: E402
+
+PIPELINE_STAGES = ('read', 'hash', 'cache', 'pdf_parse', 'summarize_total', 'sent_tokenize', 'tfidf',
+                   'entities', 'serialize')
+SAMPLE = re.compile(r'^(\w+)(?:\{(.*)\})? (\S+)$')
+
+
+def parse_server_timing(value):
+    return {name: float(duration) for name, duration in re.findall(r'(\w+);dur=([\d.]+)', value)}
+
+
+def parse_metrics(text):
+    """{(metric, labels string): value} for every sample line"""
+    samples = {}
+    for line in text.splitlines():
+        match = SAMPLE.match(line)
+        if match and not line.startswith('#'):
+            samples[(match.group(1), match.group(2) or '')] = float(match.group(3))
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from fastapi.testclient import TestClient
+
+    rng = synthetic.random.Random(args.seed)
+    pdfs = [synthetic.judgment_pdf(synthetic.judgment(rng, rng.randint(20, 60))) for _ in range(args.requests)]
+    pages = 0
+    failed = False
+    with TestClient(app_final5.app) as client:
+        for number, pdf in enumerate(pdfs):
+            response = client.post('/summarize_pdf', files={'file': (f'case{number}.pdf', pdf, 'application/pdf')})
+            result = response.json()
+            if 'error' in result:
+                print(f"FAIL: /summarize_pdf returned {result['error']}")
+                return 1
+            pages += result['extraction']['pages']
+            timing = parse_server_timing(response.headers.get('Server-Timing', ''))
+            missing = [name for name in PIPELINE_STAGES + ('total',) if name not in timing]
+            if missing:
+                print(f"FAIL: Server-Timing {response.headers.get('Server-Timing')!r} lacks {missing}")
+                failed = True
+            parts = sum(duration for name, duration in timing.items()
+                        if name != 'total' and not name.endswith('_total'))
+            if parts > timing.get('total', 0.0) + 0.1:
+                print(f"FAIL: Server-Timing stages add up to {parts:.2f} ms, more than the total")
+                failed = True
+        print(f"Server-Timing: {response.headers['Server-Timing']}")
+
+        corrupt = client.post('/summarize_pdf', files={'file': ('broken.pdf', b'not a pdf', 'application/pdf')})
+        if 'error' not in corrupt.json():
+            print("FAIL: a corrupt upload did not produce an error")
+            failed = True
+        health = client.get('/health')
+        if 'Server-Timing' not in health.headers:
+            print("FAIL: /health has no Server-Timing header")
+            failed = True
+        text = client.get('/metrics').text
+
+    samples = parse_metrics(text)
+    requests = args.requests + 1
+    expected = {
+        ('court_documents_total', ''): args.requests,
+        ('court_pages_total', ''): pages,
+        ('court_bytes_total', ''): sum(map(len, pdfs)) + len(b'not a pdf'),
+        ('court_errors_total', 'endpoint="summarize_pdf"'): 1,
+        ('court_request_seconds_count', 'path="/summarize_pdf"'): requests,
+        ('court_request_seconds_count', 'path="/health"'): 1,
+        ('court_stage_seconds_count', 'stage="read"'): requests,
+        ('court_stage_seconds_count', 'stage="pdf_parse"'): requests,
+        ('court_stage_seconds_count', 'stage="tfidf"'): args.requests,
+        ('court_stage_seconds_count', 'stage="entities"'): args.requests,
+    }
+    wrong = {key: (samples.get(key), value) for key, value in expected.items() if samples.get(key) != value}
+    print(f"consistency: {len(expected) - len(wrong)}/{len(expected)} metrics match what was sent "
+          f"({args.requests} PDFs, {pages} pages, 1 corrupt upload)")
+    for key, (actual, value) in wrong.items():
+        print(f"FAIL: {key[0]}{{{key[1]}}} is {actual}, expected {value}")
+        failed = True
+
+    for (metric, labels), count in samples.items():
+        if metric.endswith('_count'):
+            base = metric[:-len('_count')]
+            buckets = [value for (name, bucket_labels), value in samples.items()
+                       if name == f'{base}_bucket' and bucket_labels.startswith(labels + ',')]
+            if buckets != sorted(buckets) or buckets[-1] != count:
+                print(f"FAIL: {base}{{{labels}}} buckets are not cumulative up to the count")
+                failed = True
+    try:
+        from prometheus_client.parser import text_string_to_metric_families
+    except ImportError:
+        print("format: prometheus_client not installed, parser check skipped")
+    else:
+        families = {family.name for family in text_string_to_metric_families(text)}
+        print(f"format: prometheus_client parsed {len(families)} metric families")
+
+    calls = 200000
+    started = time.perf_counter()
+    for _ in range(calls):
+        with app_final5.stage('noop'):
+            pass
+    outside = (time.perf_counter() - started) / calls
+    timer = app_final5.StageTimer()
+    token = app_final5._stage_timer.set(timer)
+    started = time.perf_counter()
+    for _ in range(calls):
+        with app_final5.stage('noop'):
+            pass
+    inside = (time.perf_counter() - started) / calls
+    app_final5._stage_timer.reset(token)
+    print(f"overhead: with stage() costs {outside * 1e9:.0f} ns outside a request, "
+          f"{inside * 1e9:.0f} ns inside one")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
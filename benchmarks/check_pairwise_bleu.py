@@ -0,0 +1,84 @@
+"""Equivalence and latency check for the pairwise BLEU matrix.
+
+Builds a cohort of summaries from the corpus (every case, strategy and a
+few lengths) padded with generated ones to --cohort texts, computes the
+full matrix with ``EnhancedSummaryEvaluator.pairwise_bleu`` and with
+``calculate_bleu_score`` pair by pair (on the first --check texts), and
+reports both timings.  Scores must agree to --tolerance; exits non-zero
+otherwise or if the matrix is not faster.
+
+    python benchmarks/check_pairwise_bleu.py [--corpus DIR] [--cohort 200] [--check 60]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import app_final5  # noqa: E402
+
+WORDS = ('the court held that appeal is dismissed allowed a of section act order evidence '
+         'respondent appellant high , . ;').split()
+
+
+def cohort(corpus_dir, size, seed):
+    corpus_loader = app_final5.LegalDocumentLoader(corpus_dir)
+    texts = []
+    for case_num in corpus_loader.get_available_cases('semantic'):
+        for strategy in app_final5.EVAL_STRATEGIES:
+            chunks = corpus_loader.load_chunked_text(strategy, case_num)
+            if chunks:
+                texts.extend(app_final5.summarizer.extractive_summary(chunks, length) for length in (1, 2, 5))
+    rng = random.Random(seed)
+    # Short and empty texts exercise smoothing and the brevity penalty
+    edge = ['', 'a', 'the the', 'court held']
+    while len(texts) + len(edge) < size:
+        texts.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 60))))
+    return (edge + texts)[:size]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--cohort', type=int, default=200)
+    parser.add_argument('--check', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tolerance', type=float, default=1e-12)
+    args = parser.parse_args(argv)
+
+    evaluator = app_final5.enhanced_evaluator
+    texts = cohort(args.corpus, args.cohort, args.seed)
+    evaluator.pairwise_bleu(texts[:2])  # keep one-off imports out of the timings
+
+    started = time.perf_counter()
+    matrix = evaluator.pairwise_bleu(texts)
+    matrix_seconds = time.perf_counter() - started
+
+    checked = texts[:args.check]
+    started = time.perf_counter()
+    expected = np.array([[evaluator.calculate_bleu_score(reference, candidate) for candidate in checked]
+                         for reference in checked])
+    loop_seconds = (time.perf_counter() - started) * (len(texts) / len(checked)) ** 2
+
+    error = float(np.abs(matrix[:len(checked), :len(checked)] - expected).max())
+    print(f"equivalence: max |matrix - calculate_bleu_score| = {error:.2e} over {len(checked) ** 2} pairs")
+    print(f"latency for {len(texts)}x{len(texts)}: pairwise matrix {matrix_seconds:.3f}s, "
+          f"pair-by-pair ~{loop_seconds:.1f}s (extrapolated, {loop_seconds / matrix_seconds:.0f}x)")
+
+    failed = False
+    if error > args.tolerance:
+        print(f"FAIL: matrix differs from calculate_bleu_score by more than {args.tolerance}")
+        failed = True
+    if matrix_seconds >= loop_seconds:
+        print("FAIL: the pairwise matrix is not faster than pair-by-pair BLEU")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
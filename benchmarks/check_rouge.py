@@ -0,0 +1,99 @@
+"""Equivalence and throughput check for the native ROUGE engine.
+
+Scores corpus summaries (every strategy's summary against every other's),
+whole judgments and randomly generated texts with ``ROUGEEvaluator`` and
+with ``rouge_score.RougeScorer(use_stemmer=True)``, requires identical
+precision/recall/F1 for ROUGE-1, ROUGE-2 and ROUGE-L, and reports pairs/s
+for both when one reference is scored against many candidates.  Exits
+non-zero on any mismatch or if the native engine is not faster.
+
+    python benchmarks/check_rouge.py [--corpus DIR] [--fuzz 2000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import app_final5  # noqa: E402
+
+FRAGMENTS = ['appeal', 'appeals', 'appealed', 'court', 'courts', 'held', 'holding', 'the', 'a', 'of',
+             'section', '302', '1950s', 'respondent', 'respondents', 'running', 'ran', 'generously',
+             'judgment', 'judgments', ',', '.', ' ', '  ', '\n', '-', "'s", 'x', 'ABC', 'Évidence',
+             'naïve', 'İstanbul', 'straße', 'ſection', '42nd', 'co-operative', '(1)']
+
+
+def corpus_pairs(corpus_dir):
+    corpus_loader = app_final5.LegalDocumentLoader(corpus_dir)
+    pairs = []
+    for case_num in corpus_loader.get_available_cases('semantic'):
+        summaries = []
+        for strategy in app_final5.EVAL_STRATEGIES:
+            chunks = corpus_loader.load_chunked_text(strategy, case_num)
+            if chunks:
+                summaries.append(app_final5.summarizer.extractive_summary(chunks, 5))
+                summaries.append(' '.join(chunks))
+        pairs.extend((a, b) for a in summaries for b in summaries)
+    return pairs
+
+
+def fuzz_pairs(count, seed):
+    rng = random.Random(seed)
+
+    def text():
+        return ' '.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+    return [(text(), text()) for _ in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--fuzz', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from rouge_score import rouge_scorer
+    reference_scorer = rouge_scorer.RougeScorer(list(app_final5.ROUGE_TYPES), use_stemmer=True)
+    evaluator = app_final5.ROUGEEvaluator()
+
+    corpus = corpus_pairs(args.corpus)
+    pairs = corpus + fuzz_pairs(args.fuzz, args.seed) + [('', ''), ('', 'a b'), ('a b', ''), ('...', 'a')]
+    mismatches = 0
+    for reference, candidate in pairs:
+        expected = reference_scorer.score(reference, candidate)
+        actual = evaluator.evaluate_summary(reference, candidate)
+        if any(tuple(expected[metric]) != tuple(actual[metric]) for metric in app_final5.ROUGE_TYPES):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH {reference[:60]!r} vs {candidate[:60]!r}: {expected} != {actual}")
+    print(f"equivalence: {len(pairs) - mismatches}/{len(pairs)} pairs match rouge_score "
+          f"({len(corpus)} corpus, {args.fuzz} fuzz)")
+
+    timing_pairs = corpus or pairs
+    started = time.perf_counter()
+    for reference, candidate in timing_pairs:
+        reference_scorer.score(reference, candidate)
+    before = time.perf_counter() - started
+    evaluator = app_final5.ROUGEEvaluator()
+    started = time.perf_counter()
+    for reference, candidate in timing_pairs:
+        evaluator.evaluate_summary(reference, candidate)
+    after = time.perf_counter() - started
+    print(f"throughput: rouge_score {len(timing_pairs) / before:.1f} pairs/s, native "
+          f"{len(timing_pairs) / after:.1f} pairs/s ({before / after:.1f}x)")
+
+    failed = False
+    if mismatches:
+        print(f"FAIL: {mismatches} pairs differ from rouge_score")
+        failed = True
+    if after >= before:
+        print("FAIL: the native ROUGE engine is not faster than rouge_score")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
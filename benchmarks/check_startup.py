@@ -0,0 +1,78 @@
+"""Startup-time budget check for the FastAPI server.
+
+Measures import-to-first-request: the wall time from ``import app_final5``
+in a fresh interpreter until ``GET /health`` has been answered in-process.
+Exits non-zero when the median over several cold runs exceeds the budget.
+
+    python benchmarks/check_startup.py [--budget 1.5] [--runs 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_SECONDS = float(os.environ.get('STARTUP_BUDGET_SECONDS', '1.5'))
+
+# Runs in a fresh interpreter so that nothing is already imported.
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import app_final5
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client_ready = time.perf_counter()
+response = TestClient(app_final5.app).get('/health')
+answered = time.perf_counter()
+heavy = sorted(m for m in ('matplotlib', 'seaborn', 'sklearn', 'nltk', 'transformers',
+                           'sentence_transformers', 'reportlab', 'PyPDF2') if m in sys.modules)
+print(json.dumps({
+    'status': response.status_code,
+    'import_seconds': imported - started,
+    # TestClient (httpx) is test-only machinery, keep it out of the budget
+    'total_seconds': (imported - started) + (answered - client_ready),
+    'heavy_modules': heavy,
+}))
+'''
+
+
+def measure_once():
+    """Run one cold start in a subprocess and return its measurements"""
+    env = dict(os.environ)
+    env.pop('COURT_SUMMARIZER_DEMO', None)
+    completed = subprocess.run([sys.executable, '-c', PROBE], cwd=REPO_DIR, env=env,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help='maximum median import-to-first-request time in seconds')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(args.runs)]
+    median_total = statistics.median(r['total_seconds'] for r in runs)
+    median_import = statistics.median(r['import_seconds'] for r in runs)
+    heavy = sorted(set().union(*(r['heavy_modules'] for r in runs)))
+
+    print(f"import: {median_import:.3f}s  import-to-first-request: {median_total:.3f}s "
+          f"(budget {args.budget:.3f}s, {args.runs} runs)")
+    failures = []
+    if any(r['status'] != 200 for r in runs):
+        failures.append('/health did not return 200')
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    if median_total > args.budget:
+        failures.append(f"startup took {median_total:.3f}s, budget is {args.budget:.3f}s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""Equivalence and latency check for the single-pass structured summarizer.
+
+Runs ``structured_summarize`` against the original implementation (three
+``simple_summarize`` calls on re-joined thirds, then a fourth split of the
+decision) over the corpus judgments and generated texts, and times both,
+plus a single-field request.  Sections whose top sentences tie in score can
+break the tie differently in the last bit, so up to --tolerance of texts may
+differ.  Exits non-zero above that or if the new path is not faster.
+
+    python benchmarks/check_structured_summary.py [--corpus DIR] [--synthetic 300]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+import app_final5  # noqa: E402
+
+WORDS = ('appeal petition order court held section act evidence witness accused trial judgment '
+         'respondent appellant high tribunal dismissed allowed contract property tax revenue').split()
+
+
+def reference_simple_summarize(text, num_sentences):
+    sentences = app_final5.sent_tokenize(text)
+    if len(sentences) <= num_sentences:
+        return " ".join(sentences)
+    tfidf_matrix = app_final5.TfidfVectorizer(stop_words="english").fit_transform(sentences)
+    scores = np.array(tfidf_matrix.sum(axis=1)).ravel()
+    top_indices = scores.argsort()[-num_sentences:][::-1]
+    return " ".join(sentences[i] for i in sorted(top_indices))
+
+
+def reference_structured_summarize(text, overview_sentences=3, decision_sentences=2):
+    sentences = app_final5.sent_tokenize(text)
+    third = len(sentences) // 3
+    overview = reference_simple_summarize(" ".join(sentences[:third]), overview_sentences)
+    reference_simple_summarize(" ".join(sentences[third:2 * len(sentences) // 3]), 3)
+    decision = reference_simple_summarize(" ".join(sentences[2 * len(sentences) // 3:]), decision_sentences)
+    return {"overview": overview, "decision": " ".join(app_final5.sent_tokenize(decision)[:3])}
+
+
+def synthetic_texts(count, seed):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(0, 90)):
+            if rng.random() < 0.1 and sentences:
+                sentences.append(rng.choice(sentences))
+            else:
+                words = [f'{rng.choice(WORDS)}{rng.randrange(40)}' for _ in range(rng.randint(1, 20))]
+                sentences.append(' '.join(words).capitalize() + '.')
+        texts.append(' '.join(sentences))
+    return texts
+
+
+def timed(summarize, texts, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            summarize(text)
+    return (time.perf_counter() - started) / (repeat * len(texts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=app_final5.BASE_DIR)
+    parser.add_argument('--synthetic', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    corpus = [path.read_text(encoding='utf-8', errors='replace')
+              for path in sorted(args.corpus.glob('Original-Judgements/*.txt'))]
+    texts = corpus + synthetic_texts(args.synthetic, args.seed)
+    mismatches = 0
+    for text in texts:
+        try:
+            expected = reference_structured_summarize(text)
+        except ValueError:
+            continue  # the original fails on stop-word-only sections
+        if app_final5.structured_summarize(text) != expected:
+            mismatches += 1
+    print(f"equivalence: {len(texts) - mismatches}/{len(texts)} texts match the original")
+
+    timing_texts = corpus or texts
+    before = timed(reference_structured_summarize, timing_texts, args.repeat)
+    after = timed(app_final5.structured_summarize, timing_texts, args.repeat)
+    single = timed(lambda text: app_final5.structured_summarize(text, fields=('decision',)),
+                   timing_texts, args.repeat)
+    print(f"latency: original {before * 1e3:.2f} ms, single pass {after * 1e3:.2f} ms "
+          f"({before / after:.1f}x), decision only {single * 1e3:.2f} ms")
+
+    failed = False
+    if mismatches > args.tolerance * len(texts):
+        print(f"FAIL: {mismatches} texts differ, more than {args.tolerance:.0%}")
+        failed = True
+    if after >= before:
+        print("FAIL: structured_summarize is not faster than the original")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
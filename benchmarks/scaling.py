@@ -0,0 +1,190 @@
+"""Latency and memory against corpus size for loading, similarity and summaries.
+
+For each --sizes entry a synthetic corpus is written (benchmarks/synthetic.py,
+reused from --work-dir when one with the same parameters exists) and each
+task is measured in a fresh interpreter, so peak RSS belongs to that task
+alone:
+
+    load        every case's semantic chunks through LegalDocumentLoader
+    similarity  CaseSimilarityIndex.build() over the corpus, then --queries
+                exhaustive queries (build seconds, median seconds per query)
+    summarize   summarize_batch_documents over every case, --batch at a time
+
+Results are printed, written as JSON next to --plot, and plotted (latency
+and peak RSS growth against size, log-log).  100k cases take several GB of
+disk and a long time; ask for them explicitly.
+
+    python benchmarks/scaling.py [--sizes 1k,10k] [--tasks load,similarity,summarize] [--plot scaling.png]
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import synthetic  # noqa: E402
+
+TASKS = ('load', 'similarity', 'summarize')
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3  # bytes on macOS, KiB elsewhere
+
+
+def measure_load(app_final5, corpus_dir, args):
+    corpus_loader = app_final5.LegalDocumentLoader(corpus_dir)
+    started = time.perf_counter()
+    cases = corpus_loader.get_available_cases('semantic')
+    chars = sum(len(chunk) for case_num in cases for chunk in corpus_loader.load_chunked_text('semantic', case_num))
+    seconds = time.perf_counter() - started
+    return {'load': {'seconds': seconds, 'cases': len(cases), 'chars': chars}}
+
+
+def measure_similarity(app_final5, corpus_dir, args):
+    app_final5.loader = app_final5.LegalDocumentLoader(corpus_dir)
+    with tempfile.TemporaryDirectory() as index_dir:
+        started = time.perf_counter()
+        index = app_final5.CaseSimilarityIndex(index_dir).build()
+        build_seconds = time.perf_counter() - started
+        rng = random.Random(args.seed)
+        queries = rng.sample(index.case_numbers, min(args.queries, len(index.case_numbers)))
+        timings = []
+        for case_num in queries:
+            started = time.perf_counter()
+            index.query(case_num, top_n=5)
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {'similarity build': {'seconds': build_seconds, 'cases': len(index.case_numbers)},
+            'similarity query': {'seconds': timings[len(timings) // 2], 'queries': len(timings)}}
+
+
+def measure_summarize(app_final5, corpus_dir, args):
+    app_final5.loader = app_final5.LegalDocumentLoader(corpus_dir)
+    cases = app_final5.loader.get_available_cases('semantic')
+    started = time.perf_counter()
+    for start in range(0, len(cases), args.batch):
+        app_final5.summarize_batch_documents([], cases[start:start + args.batch])
+    seconds = time.perf_counter() - started
+    return {'summarize': {'seconds': seconds, 'cases': len(cases)}}
+
+
+def run_measurement(task, corpus_dir, args):
+    """Measure one task in this process and print {series: result} as JSON"""
+    import app_final5
+
+    # One-off imports are startup cost, not per-corpus cost
+    app_final5.punkt_tokenizer()
+    app_final5.word_tokenize('')
+    app_final5.TfidfVectorizer()
+    from sklearn.preprocessing import normalize  # noqa: F401
+    imported_mb = peak_rss_mb()
+    results = globals()[f'measure_{task}'](app_final5, corpus_dir, args)
+    growth = max(peak_rss_mb() - imported_mb, 0.0)
+    for result in results.values():
+        result['peak_rss_mb'] = growth  # above the interpreter with its imports loaded
+    print(json.dumps(results))
+    return 0
+
+
+def ensure_corpus(work_dir, cases, args, paragraphs):
+    """A complete synthetic corpus of `cases` cases, written if missing or stale"""
+    corpus_dir = work_dir / f'{cases}-seed{args.seed}'
+    manifest = synthetic.corpus_manifest(corpus_dir)
+    wanted = {'cases': cases, 'seed': args.seed, 'paragraphs': list(paragraphs) if isinstance(paragraphs, tuple)
+              else paragraphs, 'pdf_every': args.pdf_every}
+    if manifest and all(manifest.get(key) == value for key, value in wanted.items()):
+        return corpus_dir
+    shutil.rmtree(corpus_dir, ignore_errors=True)
+    started = time.perf_counter()
+    synthetic.write_corpus(corpus_dir, cases, args.seed, paragraphs, args.pdf_every, args.workers)
+    print(f"generated {cases} cases in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return corpus_dir
+
+
+def plot(rows, path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, (latency, memory) = plt.subplots(1, 2, figsize=(12, 4.5))
+    for series in dict.fromkeys(row['series'] for row in rows):
+        points = sorted((row['cases'], row['seconds']) for row in rows if row['series'] == series)
+        latency.plot(*zip(*points), marker='o', label=series)
+    # Peak RSS is per measuring process, i.e. per task
+    for task in dict.fromkeys(row['task'] for row in rows):
+        points = sorted({(row['cases'], max(row['peak_rss_mb'], 0.1)) for row in rows if row['task'] == task})
+        memory.plot(*zip(*points), marker='o', label=task)
+    for axis, label in ((latency, 'seconds'), (memory, 'peak RSS growth (MB)')):
+        axis.set_xscale('log')
+        axis.set_yscale('log')
+        axis.set_xlabel('cases in corpus')
+        axis.set_ylabel(label)
+        axis.grid(True, which='both', alpha=0.3)
+        axis.legend()
+    latency.set_title('Latency (similarity query: median per query)')
+    memory.set_title('Memory')
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1k,10k', help='comma-separated case counts, e.g. 1k,10k,100k')
+    parser.add_argument('--tasks', default=','.join(TASKS))
+    parser.add_argument('--work-dir', type=Path, default=Path(tempfile.gettempdir()) / 'court-scaling')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--paragraphs', default='10-60', help='per case: N or LOW-HIGH')
+    parser.add_argument('--pdf-every', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='corpus generation processes')
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--batch', type=int, default=256, help='cases per summarize_batch_documents call')
+    parser.add_argument('--plot', type=Path, default=Path('scaling.png'))
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        return run_measurement(args.measure, args.corpus, args)
+    tasks = [task.strip() for task in args.tasks.split(',') if task.strip()]
+    unknown = set(tasks) - set(TASKS)
+    if unknown:
+        print(f"FAIL: unknown tasks {sorted(unknown)}; choose from {', '.join(TASKS)}")
+        return 1
+    paragraphs = synthetic.parse_paragraphs(args.paragraphs)
+    sizes = sorted(synthetic.parse_size(size) for size in args.sizes.split(','))
+
+    rows = []
+    print(f"{'cases':>8} {'series':18} {'seconds':>10} {'peak RSS +MB':>13}")
+    for cases in sizes:
+        corpus_dir = ensure_corpus(args.work_dir, cases, args, paragraphs)
+        for task in tasks:
+            result = subprocess.run([sys.executable, __file__, '--measure', task, '--corpus', str(corpus_dir),
+                                     '--seed', str(args.seed), '--queries', str(args.queries),
+                                     '--batch', str(args.batch)], capture_output=True, text=True)
+            if result.returncode:
+                print(f"FAIL: {task} on {cases} cases:\n{result.stderr[-2000:]}")
+                return 1
+            for series, measured in json.loads(result.stdout.splitlines()[-1]).items():
+                rows.append({'task': task, 'series': series, 'cases': cases, **measured})
+                print(f"{cases:8d} {series:18} {measured['seconds']:10.4f} {measured['peak_rss_mb']:13.1f}")
+
+    args.plot.with_suffix('.json').write_text(json.dumps(rows, indent=1), encoding='utf-8')
+    plot(rows, args.plot)
+    print(f"plot written to {args.plot}, results to {args.plot.with_suffix('.json')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
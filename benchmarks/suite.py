@@ -0,0 +1,337 @@
+"""Benchmark suite for the loader, analyzer, summarizer, evaluator and API.
+
+Every benchmark runs on fixed synthetic inputs (benchmarks/synthetic.py,
+seeded), so results are comparable between commits.  Each one is sampled
+--samples times across --processes fresh interpreters; a sample times
+enough calls to last --min-time seconds and records the mean seconds per
+call.  Samples are compared with the
+stored baselines (benchmarks/baselines.json) using a one-sided
+Mann-Whitney U test: a benchmark regresses when its samples are
+significantly slower (p < --alpha) *and* the median is more than
+--threshold slower, so neither noise nor a tiny-but-consistent shift fails
+the run.  Exits non-zero on any regression.  Baselines are machine
+specific; record them with --update on the machine that runs the suite.
+
+    python benchmarks/suite.py [-k PATTERN] [--samples 20] [--update] [--list]
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+WORK_DIR = tempfile.TemporaryDirectory(prefix='court-bench-')
+# Measure the code, not whatever caches and indexes the checkout holds
+for name, value in {'SUMMARIZER_POOL': 'thread', 'SUMMARIZER_WORKERS': '1',
+                    'SENTENCE_INDEX_DIR': os.path.join(WORK_DIR.name, 'sentences'),
+                    'IDF_MODEL_DIR': os.path.join(WORK_DIR.name, 'idf'),
+                    'CATALOG_DIR': os.path.join(WORK_DIR.name, 'catalog'),
+                    'SUMMARY_CACHE_DISK_MB': '0', 'SUMMARY_CACHE_MEMORY_MB': '0',
+                    'EVAL_MEMO_DIR': ''}.items():
+    os.environ.setdefault(name, value)
+
+import app_final5  # noqa: E402
+import synthetic  # noqa: E402
+
+BASELINES = Path(__file__).resolve().parent / 'baselines.json'
+SEED = 2024
+CORPUS_CASES = 40
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register `setup(fixtures) -> callable` as benchmark `name`"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Fixtures:
+    """Synthetic inputs shared by the benchmarks, built on first use"""
+
+    def __init__(self, work_dir):
+        self.work_dir = Path(work_dir)
+        self.cleanup = contextlib.ExitStack()
+        self._corpus = None
+        self._documents = None
+        self._pdf = None
+
+    @property
+    def corpus(self):
+        if self._corpus is None:
+            self._corpus = synthetic.write_corpus(self.work_dir / 'corpus', CORPUS_CASES, seed=SEED)
+        return self._corpus
+
+    @property
+    def documents(self):
+        if self._documents is None:
+            self._documents = synthetic.documents(16, seed=SEED)
+        return self._documents
+
+    @property
+    def pdf(self):
+        if self._pdf is None:
+            self._pdf = synthetic.judgment_pdf(synthetic.documents(1, seed=SEED, paragraphs=40)[0])
+        return self._pdf
+
+    def rotation(self, texts=None):
+        """Callable returning a different text on every call.
+
+        A call counter is appended so caches keyed by the text itself
+        (textstat, the ROUGE reference cache) never turn the benchmark into
+        a cache lookup.
+        """
+        texts = texts or self.documents
+        calls = iter(range(1 << 62))
+
+        def next_text():
+            call = next(calls)
+            return f'{texts[call % len(texts)]} Reference {call}.'
+        return next_text
+
+
+@benchmark('loader.load_chunked_text.cold')
+def bench_load_cold(fixtures):
+    cases = [str(case) for case in range(1, CORPUS_CASES + 1)]
+
+    def run():
+        corpus_loader = app_final5.LegalDocumentLoader(fixtures.corpus, cache_max_entries=0)
+        for case_num in cases:
+            corpus_loader.load_chunked_text('semantic', case_num)
+    return run
+
+
+@benchmark('loader.load_chunked_text.cached')
+def bench_load_cached(fixtures):
+    corpus_loader = app_final5.LegalDocumentLoader(fixtures.corpus)
+    cases = [str(case) for case in range(1, CORPUS_CASES + 1)]
+
+    def run():
+        for case_num in cases:
+            corpus_loader.load_chunked_text('semantic', case_num)
+    return run
+
+
+@benchmark('analyzer.get_text_statistics')
+def bench_text_statistics(fixtures):
+    next_text = fixtures.rotation()
+    return lambda: app_final5.analyzer.get_text_statistics(next_text())
+
+
+@benchmark('analyzer.extract_basic_info')
+def bench_basic_info(fixtures):
+    next_text = fixtures.rotation()
+    return lambda: app_final5.analyzer.extract_basic_info(next_text())
+
+
+@benchmark('summarizer.extractive_summary')
+def bench_extractive_summary(fixtures):
+    rng = synthetic.random.Random(SEED)
+    documents = [synthetic.chunks(text, 'semantic', rng) for text in fixtures.documents]
+    calls = iter(range(1 << 62))
+    return lambda: app_final5.summarizer.extractive_summary(documents[next(calls) % len(documents)], 5)
+
+
+@benchmark('summarizer.structured_summarize')
+def bench_structured_summarize(fixtures):
+    next_text = fixtures.rotation()
+    return lambda: app_final5.structured_summarize(next_text(), fields=app_final5.STRUCTURED_FIELDS)
+
+
+@benchmark('entities.extract')
+def bench_entities(fixtures):
+    next_text = fixtures.rotation()
+    return lambda: app_final5.entity_extractor.extract(next_text())
+
+
+@benchmark('evaluator.rouge')
+def bench_rouge(fixtures):
+    next_reference = fixtures.rotation()
+    rng = synthetic.random.Random(SEED)
+    candidates = [' '.join(synthetic.sentence(rng) for _ in range(5)) for _ in range(16)]
+    evaluator = app_final5.ROUGEEvaluator()
+    calls = iter(range(1 << 62))
+    return lambda: evaluator.evaluate_summary(next_reference(), candidates[next(calls) % len(candidates)])
+
+
+@benchmark('api.summarize_pdf')
+def bench_summarize_pdf(fixtures):
+    from fastapi.testclient import TestClient
+
+    # Entering the client runs the startup hooks; it is closed when the suite ends
+    client = fixtures.cleanup.enter_context(TestClient(app_final5.app))
+    files = {'file': ('bench.pdf', fixtures.pdf, 'application/pdf')}
+
+    def run():
+        response = client.post('/summarize_pdf', files=files)
+        if response.status_code != 200 or 'error' in response.json():
+            raise RuntimeError(f'/summarize_pdf failed: {response.text[:200]}')
+    return run
+
+
+def measure(run, samples, number=None, min_time=0.05):
+    """Seconds per call for each of `samples` samples of `number` calls"""
+    run()  # warm-up: imports, lazy models, first-touch allocation
+    if number is None:
+        number = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(number):
+                run()
+            if time.perf_counter() - started >= min_time:
+                break
+            number *= 2
+    timings = []
+    for _ in range(samples):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                run()
+            timings.append((time.perf_counter() - started) / number)
+        finally:
+            gc.enable()
+    return number, timings
+
+
+def compare(baseline, current, alpha, threshold):
+    """(status, median ratio, p-value) of `current` samples against `baseline`"""
+    from scipy.stats import mannwhitneyu
+
+    ratio = statistics.median(current) / statistics.median(baseline)
+    slower = mannwhitneyu(current, baseline, alternative='greater').pvalue
+    faster = mannwhitneyu(current, baseline, alternative='less').pvalue
+    if slower < alpha and ratio > 1 + threshold:
+        return 'REGRESSION', ratio, slower
+    if faster < alpha and ratio < 1 / (1 + threshold):
+        return 'faster', ratio, faster
+    return 'ok', ratio, min(slower, faster)
+
+
+def cell(value, spec):
+    """Format a table cell, blank when there is nothing to compare"""
+    return format(value, spec) if value is not None else ' ' * len(format(0.0, spec))
+
+
+def machine():
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(), 'cpus': os.cpu_count()}
+
+
+def load_baselines(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'machine': None, 'benchmarks': {}}
+
+
+def save_baselines(path, baselines):
+    temp_path = Path(f'{path}.tmp')
+    temp_path.write_text(json.dumps(baselines, indent=1, sort_keys=True) + '\n', encoding='utf-8')
+    os.replace(temp_path, path)
+
+
+def run_worker(name, samples, number, min_time):
+    """Measure one benchmark in this process and print the samples as JSON"""
+    fixtures = Fixtures(WORK_DIR.name)
+    with fixtures.cleanup:
+        number, timings = measure(BENCHMARKS[name](fixtures), samples, number or None, min_time)
+    print(json.dumps({'number': number, 'samples': timings}))
+    return 0
+
+
+def sample(name, args, number):
+    """Samples of `name` spread over --processes fresh interpreters.
+
+    Import order, allocator state and the like shift a whole process's
+    timings together, so samples from one process understate the noise;
+    several processes put that variance into both sides of the comparison.
+    """
+    timings = []
+    for worker in range(args.processes):
+        samples = args.samples // args.processes + (worker < args.samples % args.processes)
+        result = subprocess.run([sys.executable, __file__, '--worker', name, '--samples', str(samples),
+                                 '--number', str(number or 0), '--min-time', str(args.min_time)],
+                                capture_output=True, text=True)
+        if result.returncode:
+            raise RuntimeError(f'{name} failed:\n{result.stderr[-2000:]}')
+        measured = json.loads(result.stdout.splitlines()[-1])
+        number = measured['number']  # later processes reuse the first one's calibration
+        timings.extend(measured['samples'])
+    return number, timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--processes', type=int, default=4, help='worker processes the samples are spread over')
+    parser.add_argument('--min-time', type=float, default=0.05, help='seconds per sample when calibrating')
+    parser.add_argument('--alpha', type=float, default=0.01)
+    parser.add_argument('--threshold', type=float, default=0.20, help='smallest median slowdown that fails')
+    parser.add_argument('--baselines', type=Path, default=BASELINES)
+    parser.add_argument('--update', action='store_true', help='record this run as the new baselines')
+    parser.add_argument('--list', action='store_true')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--number', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        return run_worker(args.worker, args.samples, args.number, args.min_time)
+    names = [name for name in BENCHMARKS if args.pattern in name]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    if not names:
+        print(f"FAIL: no benchmark matches {args.pattern!r}")
+        return 1
+    args.processes = max(1, min(args.processes, args.samples))
+
+    baselines = load_baselines(args.baselines)
+    if baselines['machine'] and baselines['machine'] != machine() and not args.update:
+        print(f"warning: baselines were recorded on {baselines['machine']}, this is {machine()}")
+
+    regressions = []
+    print(f"{'benchmark':34} {'baseline':>11} {'current':>11} {'ratio':>7} {'p':>8}  status")
+    for name in names:
+        stored = baselines['benchmarks'].get(name)
+        # Reuse the baseline's calls per sample so both sides time the same unit
+        number, timings = sample(name, args, stored['number'] if stored and not args.update else None)
+        current = statistics.median(timings)
+        if args.update or stored is None:
+            status, ratio, p_value = ('recorded' if args.update else 'new'), None, None
+        else:
+            status, ratio, p_value = compare(stored['samples'], timings, args.alpha, args.threshold)
+            if status == 'REGRESSION':
+                regressions.append(name)
+        print(f"{name:34} {cell(stored and stored['median'] * 1e3, '9.3f')}ms {current * 1e3:9.3f}ms "
+              f"{cell(ratio, '6.2f')}x {cell(p_value, '8.1e')}  {status}")
+        if args.update:
+            baselines['benchmarks'][name] = {'number': number, 'median': current, 'samples': timings}
+
+    if args.update:
+        baselines['machine'] = machine()
+        save_baselines(args.baselines, baselines)
+        print(f"baselines written to {args.baselines}")
+    for name in regressions:
+        print(f"FAIL: {name} is significantly slower than its baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
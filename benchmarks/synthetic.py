@@ -0,0 +1,252 @@
+"""Deterministic synthetic judgments for benchmarks.
+
+Judgments follow the shape of the real corpus: an APPELLANT/VERSUS header,
+a J U D G M E N T line with the judge, then paragraphs citing Acts,
+Sections, Articles and AIR/SCR reports.  Everything is driven by a seeded
+``random.Random`` so the same seed always gives byte-identical text.
+
+As a script it writes a whole corpus in the app_final5 layout:
+
+    python benchmarks/synthetic.py OUT_DIR --cases 10k [--seed 0] [--pdf-every 20] [--workers N]
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+STATES = ('KERALA', 'TAMIL NADU', 'MAHARASHTRA', 'UTTAR PRADESH', 'PUNJAB', 'BIHAR', 'GUJARAT')
+SURNAMES = ('KUMAR', 'SHARMA', 'IYER', 'REDDY', 'SINGH', 'MENON', 'DAS', 'PATEL', 'NAIR', 'KHAN')
+GIVEN = ('RAMAN', 'SITA', 'ARJUN', 'LATA', 'MOHAN', 'ANITA', 'VIKRAM', 'MEERA', 'SURESH', 'KAVYA')
+JUDGES = ('Sharma', 'Verma', 'Bhagwati', 'Krishna', 'Iyer', 'Chandrachud', 'Nariman', 'Lokur')
+ACTS = ('Indian Penal Code Act, 1860', 'Evidence Act, 1872', 'Code of Criminal Procedure',
+        'Contract Act, 1872', 'Income Tax Act, 1961', 'Arbitration and Conciliation Act, 1996',
+        'Transfer of Property Act, 1882', 'Prevention of Corruption Act, 1988')
+SUBJECTS = ('The appellant', 'The respondent', 'The High Court', 'The trial court', 'Learned counsel',
+            'The prosecution', 'The State', 'The tribunal', 'This Court')
+VERBS = ('contended that', 'held that', 'observed that', 'submitted that', 'found that',
+         'rightly concluded that', 'failed to consider that', 'noted that')
+CLAUSES = ('the evidence on record does not support the conviction',
+           'the notice was not served within the statutory period',
+           'the principles of natural justice were violated',
+           'the burden of proof lies on the prosecution',
+           'the witness statements are consistent and reliable',
+           'the contract was void for want of consideration',
+           'the assessment order suffers from a jurisdictional error',
+           'the delay in filing the appeal has been sufficiently explained',
+           'the writ petition is maintainable under Article 226',
+           'the accused is entitled to the benefit of doubt',
+           'the property was transferred without valid title',
+           'the sentence imposed is disproportionate to the offence')
+CLOSINGS = ('The appeal is accordingly allowed.', 'The appeal is dismissed.',
+            'The matter is remitted to the High Court for fresh consideration.',
+            'The conviction and sentence are set aside.', 'There shall be no order as to costs.')
+
+
+def party(rng):
+    if rng.random() < 0.4:
+        return f'STATE OF {rng.choice(STATES)}'
+    return f'{rng.choice(GIVEN)} {rng.choice(SURNAMES)}'
+
+
+def citation(rng):
+    roll = rng.random()
+    if roll < 0.35:
+        return f'AIR {rng.randint(1950, 2023)} SC {rng.randint(1, 3000)}'
+    if roll < 0.6:
+        return f'{rng.randint(1950, 2023)} SCR ({rng.randint(1, 9)}) {rng.randint(1, 999)}'
+    if roll < 0.8:
+        return f'Section {rng.randint(1, 500)}{rng.choice(("", "", "A", "B"))} of the {rng.choice(ACTS)}'
+    return f'Article {rng.choice((14, 19, 21, 32, 136, 142, 226, 227))}'
+
+
+def sentence(rng):
+    text = f'{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(CLAUSES)}'
+    if rng.random() < 0.5:
+        text += f', relying on {citation(rng)}'
+    return text + '.'
+
+
+def judgment(rng, paragraphs=12):
+    """One synthetic judgment of roughly 90 words per paragraph"""
+    appellant, respondent = party(rng), party(rng)
+    judge = rng.choice(JUDGES)
+    lines = [f'{appellant} …APPELLANT VERSUS {respondent} …RESPONDENT',
+             f'J U D G M E N T {judge.upper()}, J.',
+             f"Hon'ble Mr. Justice {judge} delivered the judgment of the Court on "
+             f"{rng.randint(1, 28)}.{rng.randint(1, 12)}.{rng.randint(1950, 2023)}."]
+    for number in range(1, paragraphs + 1):
+        lines.append(f'{number}. ' + ' '.join(sentence(rng) for _ in range(rng.randint(3, 7))))
+    lines.append(rng.choice(CLOSINGS))
+    return '\n\n'.join(lines)
+
+
+def chunks(text, strategy, rng):
+    """Split a judgment the way each chunker roughly does: paragraphs, fixed words, nested"""
+    paragraphs = text.split('\n\n')
+    if strategy == 'semantic':
+        groups, size = [], rng.randint(2, 4)
+        for start in range(0, len(paragraphs), size):
+            groups.append('\n\n'.join(paragraphs[start:start + size]))
+        return groups
+    words = text.split(' ')
+    size = 120 if strategy == 'tokenwise' else 200
+    return [' '.join(words[start:start + size]) for start in range(0, len(words), size)]
+
+
+def metadata(rng, case_num, text):
+    first_line = text.split('\n', 1)[0]
+    return (f'Case {case_num} metadata\nParties: {first_line}\n'
+            f'Court: Supreme Court of India\nYear: {rng.randint(1950, 2023)}\n')
+
+
+def judgment_pdf(text, lines_per_page=45):
+    """Render a judgment as a multi-page PDF with reportlab and return the bytes"""
+    import textwrap
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    lines = [line for paragraph in text.split('\n\n')
+             for line in textwrap.wrap(paragraph, 95) + ['']]
+    for start in range(0, len(lines), lines_per_page):
+        y = height - 50
+        for line in lines[start:start + lines_per_page]:
+            pdf.drawString(40, y, line)
+            y -= 16
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def documents(count, seed=0, paragraphs=12):
+    """`count` synthetic judgments, identical for the same seed"""
+    rng = random.Random(seed)
+    return [judgment(rng, paragraphs) for _ in range(count)]
+
+
+def case_paragraphs(rng, paragraphs):
+    """Paragraph count for one case: fixed, or drawn from a (low, high) range"""
+    return paragraphs if isinstance(paragraphs, int) else rng.randint(*paragraphs)
+
+
+def write_case(base_dir, case_num, seed=0, paragraphs=12, pdf=False):
+    """Write one case in the corpus layout (metadata, three chunkings, original).
+
+    Each case has its own generator seeded from (seed, case_num), so a case
+    is the same whichever worker writes it and however many cases there are.
+    The original judgment is {N}.txt, or a multi-page {N}.pdf when `pdf`
+    is true (see app_final5.original_judgment_path).  Returns the number of bytes written.
+    """
+    from app_final5 import CORPUS_LAYOUT
+
+    base_dir = Path(base_dir)
+    rng = random.Random(f'{seed}:{case_num}')
+    text = judgment(rng, case_paragraphs(rng, paragraphs))
+    files = {'metadata': metadata(rng, case_num, text)}
+    for strategy in ('semantic', 'tokenwise', 'recursive'):
+        files[strategy] = '\n---\n'.join(chunks(text, strategy, rng))
+    written = 0
+    for kind, content in files.items():
+        dirname, prefix = CORPUS_LAYOUT[kind]
+        written += (base_dir / dirname / f'{prefix}{case_num}.txt').write_bytes(content.encode('utf-8'))
+    if pdf:
+        written += (base_dir / 'Original-Judgements' / f'{case_num}.pdf').write_bytes(judgment_pdf(text))
+    else:
+        written += (base_dir / 'Original-Judgements' / f'{case_num}.txt').write_bytes(text.encode('utf-8'))
+    return written
+
+
+def _write_cases(task):
+    base_dir, case_numbers, seed, paragraphs, pdf_every = task
+    return sum(write_case(base_dir, case_num, seed, paragraphs, bool(pdf_every) and case_num % pdf_every == 0)
+               for case_num in case_numbers)
+
+
+def write_corpus(base_dir, cases, seed=0, paragraphs=12, pdf_every=0, workers=1, progress=None):
+    """Write cases 1..`cases` under `base_dir`; the same seed gives the same files.
+
+    `paragraphs` is a fixed count or a (low, high) range per case.  Every
+    `pdf_every`-th case gets a PDF original instead of text (0: none).
+    A `synthetic.json` manifest is written last, so an interrupted run is
+    detectable (see corpus_manifest).
+    """
+    from app_final5 import CORPUS_LAYOUT
+
+    base_dir = Path(base_dir)
+    for dirname in [dirname for dirname, _ in CORPUS_LAYOUT.values()] + ['Original-Judgements']:
+        (base_dir / dirname).mkdir(parents=True, exist_ok=True)
+    batch = 250
+    tasks = [(base_dir, range(start, min(start + batch, cases + 1)), seed, paragraphs, pdf_every)
+             for start in range(1, cases + 1, batch)]
+    written = 0
+    if workers > 1:
+        import multiprocessing
+        with multiprocessing.Pool(workers) as pool:
+            for done, task_bytes in enumerate(pool.imap_unordered(_write_cases, tasks), 1):
+                written += task_bytes
+                if progress:
+                    progress(min(done * batch, cases), cases)
+    else:
+        for done, task in enumerate(tasks, 1):
+            written += _write_cases(task)
+            if progress:
+                progress(min(done * batch, cases), cases)
+    manifest = {'cases': cases, 'seed': seed, 'paragraphs': paragraphs, 'pdf_every': pdf_every,
+                'bytes': written}
+    (base_dir / 'synthetic.json').write_text(json.dumps(manifest), encoding='utf-8')
+    return base_dir
+
+
+def corpus_manifest(base_dir):
+    """The manifest of a completely written corpus, or None"""
+    try:
+        return json.loads((Path(base_dir) / 'synthetic.json').read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def parse_size(value):
+    """'1k' -> 1000, '100k' -> 100000, '2500' -> 2500"""
+    value = value.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def parse_paragraphs(value):
+    """'12' -> 12, '10-60' -> (10, 60)"""
+    low, _, high = value.partition('-')
+    return (int(low), int(high)) if high else int(low)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic corpus in the app_final5 layout.')
+    parser.add_argument('output', type=Path)
+    parser.add_argument('--cases', type=parse_size, default=1000, help='e.g. 1k, 10k, 100k')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--paragraphs', default='10-60', help='per case: N or LOW-HIGH')
+    parser.add_argument('--pdf-every', type=int, default=20, help='every Nth original is a PDF (0: none)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    paragraphs = parse_paragraphs(args.paragraphs)
+    started = time.perf_counter()
+
+    def progress(done, total):
+        print(f'\r{done}/{total} cases', end='', file=sys.stderr, flush=True)
+
+    write_corpus(args.output, args.cases, args.seed, paragraphs, args.pdf_every, args.workers, progress)
+    manifest = corpus_manifest(args.output)
+    print(f"\nwrote {manifest['cases']} cases ({manifest['bytes'] / 1e6:.1f} MB) to {args.output} "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    sys.exit(main())